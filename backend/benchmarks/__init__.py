@@ -0,0 +1,40 @@
+"""Standalone benchmarks for the workshop portal.
+
+Each module is run directly from the backend directory, e.g.::
+
+    python -m benchmarks.bench_workshop_stats --sizes 10000 100000
+
+The benchmarks run against a throwaway test database created from the
+configured DATABASES setting (SQLite unless DB_ENGINE says otherwise).
+"""
+import os
+import sys
+import time
+from contextlib import contextmanager
+
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def setup_django(test_db=True):
+    """Configure Django and, unless ``test_db`` is False, create a fresh
+    test database."""
+    if BASE_DIR not in sys.path:
+        sys.path.insert(0, BASE_DIR)
+    os.environ.setdefault("DJANGO_SETTINGS_MODULE", "workshop_portal.settings")
+    import django
+    django.setup()
+
+    from django.db import connection
+    if not test_db:
+        return connection
+    from django.test.utils import setup_test_environment
+    setup_test_environment()
+    connection.creation.create_test_db(verbosity=0, autoclobber=True)
+    return connection
+
+
+@contextmanager
+def timer(results, label):
+    start = time.perf_counter()
+    yield
+    results[label] = time.perf_counter() - start
@@ -0,0 +1,91 @@
+"""Per-email CPU cost of building a message body, before and after loading
+the logging config at startup and rendering bodies from cached templates.
+
+    python -m benchmarks.bench_email_render --emails 2000
+"""
+import argparse
+import logging
+import logging.config
+import os
+import tempfile
+from textwrap import dedent
+
+import yaml
+
+from benchmarks import setup_django, timer
+
+LOGGING_CONFIG = {
+    "version": 1,
+    "disable_existing_loggers": False,
+    "handlers": {
+        "emaillogfile": {
+            "class": "logging.handlers.RotatingFileHandler",
+            "filename": None,
+            "maxBytes": 10000000,
+            "backupCount": 9,
+        }
+    },
+    "root": {"level": "INFO", "handlers": ["emaillogfile"]},
+}
+
+
+def legacy_body(config_path, context):
+    """What send_email did for every message before the change"""
+    with open(config_path, "r") as configfile:
+        logging.config.dictConfig(yaml.safe_load(configfile))
+    return dedent("""\
+                Coordinator name:{0}
+                Coordinator email: {1}
+                Contact number:{2}
+                Institute:{3}
+                Workshop date:{4}
+                Workshop title:{5}
+
+                You may accept or reject this booking
+                {6}/workshop/dashboard""".format(
+        context["user_name"], context["coordinator_email"],
+        context["phone_number"], context["institute"],
+        context["workshop_date"], context["workshop_title"],
+        context["production_url"]
+    ))
+
+
+def run(emails):
+    setup_django(test_db=False)
+    from workshop_app.send_mails import render_email
+
+    context = {
+        "user_name": "Ada Lovelace", "coordinator_email": "ada@example.com",
+        "phone_number": "1122993388", "institute": "IIT Bombay",
+        "workshop_date": "2030-01-05", "workshop_title": "Python",
+        "production_url": "https://workshops.example.com",
+    }
+    results = {}
+    with tempfile.TemporaryDirectory() as folder:
+        LOGGING_CONFIG["handlers"]["emaillogfile"]["filename"] = \
+            os.path.join(folder, "email.log")
+        config_path = os.path.join(folder, "emailconfig.yaml")
+        with open(config_path, "w") as f:
+            yaml.safe_dump(LOGGING_CONFIG, f)
+
+        with timer(results, "legacy"):
+            for _ in range(emails):
+                legacy_body(config_path, context)
+        logging.getLogger().handlers.clear()
+        with timer(results, "template"):
+            for _ in range(emails):
+                render_email("booking_instructor", context)
+
+    print(f"{'emails':>8} {'legacy (us/email)':>18} "
+          f"{'template (us/email)':>20} {'speedup':>8}")
+    legacy = results["legacy"] / emails * 1e6
+    template = results["template"] / emails * 1e6
+    print(f"{emails:>8} {legacy:>18.1f} {template:>20.1f} "
+          f"{legacy / template:>7.1f}x")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--emails", type=int, default=2000)
+    args = parser.parse_args()
+    run(args.emails)
@@ -0,0 +1,95 @@
+"""Concurrent registrations against a slow local SMTP server.
+
+Every request to /api/register/ only queues the activation email, so its
+latency should not include the SMTP delay; the outbox is drained afterwards.
+On SQLite the tail latency is dominated by writers waiting for the lock.
+
+    python -m benchmarks.bench_registration --users 1000 --concurrency 50
+"""
+import argparse
+import os
+import statistics
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from benchmarks import setup_django, timer
+
+
+def run(users, concurrency, smtp_delay):
+    setup_django(test_db=False)
+    from aiosmtpd.controller import Controller
+    from django.conf import settings
+    from django.db import connection, connections
+    from django.test import Client
+    from django.test.utils import override_settings
+
+    from workshop_app.outbox import drain
+    from workshop_app.tests.smtp_stub import RecordingHandler, free_port
+
+    # Threads need a database file they can all see
+    with tempfile.TemporaryDirectory() as folder:
+        if connection.vendor == "sqlite":
+            connection.settings_dict["TEST"]["NAME"] = os.path.join(
+                folder, "bench.sqlite3")
+            # Writers queue for the lock instead of failing under load
+            connection.settings_dict["OPTIONS"].update(
+                timeout=60, transaction_mode="IMMEDIATE")
+        connection.creation.create_test_db(verbosity=0, autoclobber=True)
+
+        handler = RecordingHandler(delay=smtp_delay)
+        smtp = Controller(handler, hostname="127.0.0.1", port=free_port())
+        smtp.start()
+        latencies = []
+
+        def register(i):
+            start = time.perf_counter()
+            response = Client().post("/api/register/", {
+                "username": f"user{i}", "email": f"user{i}@example.com",
+                "first_name": "Load", "last_name": "Test",
+                "password": "pass@123", "password2": "pass@123",
+                "profile_data": {"institute": "IIT",
+                                 "phone_number": "1122993388"}
+            }, content_type="application/json")
+            latencies.append(time.perf_counter() - start)
+            connections.close_all()
+            return response.status_code
+
+        results = {}
+        with override_settings(
+            DEBUG=False, ALLOWED_HOSTS=["*"],
+            PASSWORD_HASHERS=["django.contrib.auth.hashers.MD5PasswordHasher"],
+            EMAIL_BACKEND="django.core.mail.backends.smtp.EmailBackend",
+            EMAIL_HOST="127.0.0.1", EMAIL_PORT=smtp.port,
+            EMAIL_HOST_USER="", EMAIL_HOST_PASSWORD="", EMAIL_USE_TLS=False
+        ):
+            with timer(results, "register"):
+                with ThreadPoolExecutor(concurrency) as executor:
+                    codes = list(executor.map(register, range(users)))
+            with timer(results, "deliver"):
+                sent, failed = drain()
+        smtp.stop()
+        connection.creation.destroy_test_db(settings.DATABASES["default"]["NAME"],
+                                            verbosity=0)
+
+    latencies.sort()
+    print(f"{users} registrations, {concurrency} concurrent, "
+          f"SMTP delay {smtp_delay * 1000:.0f}ms")
+    print(f"  201 responses:    {codes.count(201)}")
+    print(f"  wall time:        {results['register']:.2f}s "
+          f"({users / results['register']:.0f} registrations/s)")
+    print(f"  latency p50/p95:  "
+          f"{statistics.median(latencies) * 1000:.1f}ms / "
+          f"{latencies[int(len(latencies) * 0.95) - 1] * 1000:.1f}ms")
+    print(f"  emails delivered: {sent} sent, {failed} failed, "
+          f"{results['deliver']:.2f}s by the worker")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--users", type=int, default=1000)
+    parser.add_argument("--concurrency", type=int, default=50)
+    parser.add_argument("--smtp-delay", type=float, default=0.05,
+                        help="Seconds the stub server takes per message")
+    args = parser.parse_args()
+    run(args.users, args.concurrency, args.smtp_delay)
@@ -0,0 +1,65 @@
+"""Requests per second for the root redirect, before and after memoising
+the resolved home page URL.
+
+    python -m benchmarks.bench_root_redirect --requests 5000
+
+The view is called directly, without middleware. Runs on the configured
+database; set DB_ENGINE=postgresql (plus DB_NAME,
+DB_USER, ...) to compare against PostgreSQL.
+"""
+import argparse
+
+from benchmarks import setup_django, timer
+
+
+def legacy_index(request):
+    """What workshop_portal.views.index did before the change"""
+    from django.conf import settings
+    from django.shortcuts import redirect
+    from django.urls import reverse
+
+    from cms.models import Page
+
+    page = Page.objects.filter(title=settings.HOME_PAGE_TITLE)
+    if page.exists():
+        redirect_url = reverse("cms:home", args=[page.first().permalink])
+    else:
+        redirect_url = reverse("workshop_app:index")
+    return redirect(redirect_url)
+
+
+def run(requests, pages):
+    connection = setup_django()
+    from django.conf import settings
+    from django.test import RequestFactory
+
+    from cms.models import Page
+    from workshop_portal.views import index
+
+    Page.objects.bulk_create(
+        Page(permalink=f"page-{i}", title=f"Page {i}", content="")
+        for i in range(pages)
+    )
+    Page.objects.create(permalink="home", title=settings.HOME_PAGE_TITLE,
+                        content="")
+    request = RequestFactory().get("/")
+
+    print(f"{requests} requests to / on {connection.vendor}, "
+          f"{pages + 1} pages")
+    results = {}
+    for label, view in (("before", legacy_index), ("after", index)):
+        assert view(request)["Location"] == "/page/home"
+        with timer(results, label):
+            for _ in range(requests):
+                view(request)
+        print(f"  {label:7} {requests / results[label]:10.0f} requests/s")
+    print(f"  speedup {results['before'] / results['after']:10.1f}x")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--requests", type=int, default=5000)
+    parser.add_argument("--pages", type=int, default=1000,
+                        help="Other CMS pages in the table")
+    args = parser.parse_args()
+    run(args.requests, args.pages)
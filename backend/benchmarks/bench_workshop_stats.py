@@ -0,0 +1,112 @@
+"""Compare the SQL GROUP BY stats engine with the old pandas value_counts.
+
+    python -m benchmarks.bench_workshop_stats --sizes 10000 100000 1000000
+"""
+import argparse
+import random
+from datetime import date, timedelta
+
+from benchmarks import setup_django, timer
+
+
+def pandas_by_state(workshops):
+    """The pre-aggregation implementation, kept here for comparison"""
+    import pandas as pd
+    from workshop_app.models import states
+
+    w = workshops.values_list("coordinator__profile__state", flat=True)
+    states_map = dict(states)
+    df = pd.DataFrame(list(w))
+    data_states, data_counts = [], []
+    if not df.empty:
+        for state, count in df.value_counts().to_dict().items():
+            data_states.append(states_map[state[0]])
+            data_counts.append(count)
+    return data_states, data_counts
+
+
+def pandas_by_type(workshops):
+    import pandas as pd
+
+    w = workshops.values_list("workshop_type__name", flat=True)
+    df = pd.DataFrame(list(w))
+    data_wstypes, data_counts = [], []
+    if not df.empty:
+        for ws, count in df.value_counts().to_dict().items():
+            data_wstypes.append(ws[0])
+            data_counts.append(count)
+    return data_wstypes, data_counts
+
+
+def populate(size, coordinators=200, types=10):
+    from django.contrib.auth.models import User
+    from workshop_app.models import Profile, Workshop, WorkshopType, states
+
+    Workshop.objects.all().delete()
+    if not WorkshopType.objects.exists():
+        WorkshopType.objects.bulk_create(
+            WorkshopType(name=f"Type {i}", description="", duration=1,
+                         terms_and_conditions="")
+            for i in range(types)
+        )
+        users = User.objects.bulk_create(
+            User(username=f"coordinator{i}") for i in range(coordinators)
+        )
+        state_codes = [code for code, _ in states if code]
+        Profile.objects.bulk_create(
+            Profile(user=u, institute="", department="", phone_number="",
+                    state=random.choice(state_codes))
+            for u in users
+        )
+    user_ids = list(User.objects.values_list("id", flat=True))
+    type_ids = list(WorkshopType.objects.values_list("id", flat=True))
+    start = date(2015, 1, 1)
+    days = 3650
+    # Distinct (coordinator, type, date) triples, as unique_workshop_proposal
+    # allows one proposal of a type per coordinator and day
+    proposals = random.sample(range(len(user_ids) * len(type_ids) * days),
+                              size)
+    Workshop.objects.bulk_create(
+        (Workshop(coordinator_id=user_ids[n // (len(type_ids) * days)],
+                  workshop_type_id=type_ids[n // days % len(type_ids)],
+                  date=start + timedelta(days=n % days),
+                  status=random.choice((0, 1, 1, 2)), tnc_accepted=True)
+         for n in proposals),
+        batch_size=5000
+    )
+
+
+def run(sizes, repeat):
+    setup_django()
+    from workshop_app.models import Workshop
+
+    print(f"{'workshops':>10} {'pandas (s)':>12} {'sql (s)':>10} "
+          f"{'sql 1-query (s)':>16} {'speedup':>8}")
+    for size in sizes:
+        populate(size)
+        workshops = Workshop.objects.filter(status=1).order_by("date")
+        results = {}
+        for _ in range(repeat):
+            with timer(results, "pandas"):
+                expected = (pandas_by_state(workshops),
+                            pandas_by_type(workshops))
+            with timer(results, "sql"):
+                Workshop.objects.get_workshops_by_state(workshops)
+                Workshop.objects.get_workshops_by_type(workshops)
+            with timer(results, "combined"):
+                got = Workshop.objects.get_workshops_by_state_and_type(
+                    workshops)
+        assert sorted(zip(*got[0])) == sorted(zip(*expected[0]))
+        assert sorted(zip(*got[1])) == sorted(zip(*expected[1]))
+        print(f"{size:>10} {results['pandas']:>12.4f} {results['sql']:>10.4f} "
+              f"{results['combined']:>16.4f} "
+              f"{results['pandas'] / results['combined']:>7.1f}x")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--sizes", type=int, nargs="+",
+                        default=[10000, 100000, 1000000])
+    parser.add_argument("--repeat", type=int, default=1)
+    args = parser.parse_args()
+    run(args.sizes, args.repeat)
@@ -0,0 +1,148 @@
+"""Content-hashed storage for CMS static file uploads.
+
+An upload named ``css/site.css`` is written as
+``static/cms/css/site.<hash>.css`` next to ``.gz`` and, when the optional
+``brotli`` package is installed, ``.br`` copies. ``static/cms/manifest.json``
+maps ``cms/css/site.css`` to the hashed name, and ``rewrite_urls`` uses it
+to point the URLs in ``Page.imports`` at the hashed files. A hashed file
+never changes, so it can be cached forever (see ``cms.views.static_file``).
+"""
+import gzip
+import hashlib
+import json
+import os
+import re
+import threading
+
+from django.conf import settings
+from django.core.files.base import ContentFile
+from django.core.files.storage import FileSystemStorage
+from django.utils.deconstruct import deconstructible
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+UPLOAD_DIR = 'static/cms/'
+MANIFEST_NAME = UPLOAD_DIR + 'manifest.json'
+HASH_LENGTH = 12
+HASHED_NAME_RE = re.compile(r'\.[0-9a-f]{%d}\.[^./]+$' % HASH_LENGTH)
+
+# Precompressed copies, by content coding, in order of preference
+ENCODINGS = (('br', '.br'), ('gzip', '.gz'))
+
+_manifest = (None, {})
+_manifest_lock = threading.Lock()
+
+
+def is_hashed(name):
+    return HASHED_NAME_RE.search(name) is not None
+
+
+def manifest_key(name):
+    """``cms/...``, the manifest's form of the storage name ``static/cms/...``"""
+    return name[len('static/'):]
+
+
+def compress(data):
+    """``{suffix: compressed data}`` for the codings that make it smaller"""
+    variants = {'.gz': gzip.compress(data, mtime=0)}
+    if brotli is not None:
+        variants['.br'] = brotli.compress(data)
+    return {suffix: body for suffix, body in variants.items()
+            if len(body) < len(data)}
+
+
+@deconstructible
+class HashedStaticStorage(FileSystemStorage):
+    """Saves files under content-hashed names and records them in the
+    manifest. Files live under the CMS_STATIC_FOLDER setting."""
+
+    def __init__(self, **kwargs):
+        # Hashed names only ever get the same content written to them again
+        super().__init__(allow_overwrite=True, **kwargs)
+
+    @property
+    def base_location(self):
+        return settings.CMS_STATIC_FOLDER
+
+    @property
+    def location(self):
+        return os.path.abspath(self.base_location)
+
+    def get_available_name(self, name, max_length=None):
+        # The logical name is never written, so it cannot clash
+        return name
+
+    def _save(self, name, content):
+        content.seek(0)
+        data = content.read()
+        root, ext = os.path.splitext(name)
+        digest = hashlib.md5(data).hexdigest()[:HASH_LENGTH]
+        hashed = f'{root}.{digest}{ext}'
+        # An identical upload is already there
+        if not os.path.exists(self.path(hashed)):
+            super()._save(hashed, ContentFile(data))
+            for suffix, body in compress(data).items():
+                super()._save(hashed + suffix, ContentFile(body))
+        self.update_manifest(manifest_key(name), manifest_key(hashed))
+        return hashed
+
+    def delete(self, name):
+        for suffix in ('', '.gz', '.br'):
+            super().delete(name + suffix)
+        hashed = manifest_key(name)
+        manifest = read_manifest(self)
+        for logical in [k for k, v in manifest.items() if v == hashed]:
+            self.update_manifest(logical, None)
+
+    def update_manifest(self, logical, hashed):
+        """Point the manifest key ``logical`` at ``hashed``, or drop it if
+        ``hashed`` is None"""
+        global _manifest
+        with _manifest_lock:
+            manifest = dict(read_manifest(self))
+            if hashed is None:
+                manifest.pop(logical, None)
+            else:
+                manifest[logical] = hashed
+            path = self.path(MANIFEST_NAME)
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            with open(path + '.tmp', 'w') as f:
+                json.dump(manifest, f, indent=1, sort_keys=True)
+            os.replace(path + '.tmp', path)
+            _manifest = (None, {})
+
+
+def get_storage():
+    from .models import StaticFile
+    return StaticFile._meta.get_field('file').storage
+
+
+def read_manifest(storage=None):
+    """``{'cms/name': 'cms/hashed name'}``, re-read when the file changes"""
+    global _manifest
+    path = (storage or get_storage()).path(MANIFEST_NAME)
+    try:
+        signature = (path, os.stat(path).st_mtime_ns)
+    except FileNotFoundError:
+        return {}
+    cached = _manifest
+    if cached[0] != signature:
+        with open(path) as f:
+            cached = _manifest = (signature, json.load(f))
+    return cached[1]
+
+
+def rewrite_urls(html):
+    """Point STATIC_URL references to uploaded files at their hashed names"""
+    manifest = read_manifest()
+    if not html or not manifest:
+        return html
+    pattern = re.compile(
+        r'(%s)(cms/[^"\'\s()?#]+)' % re.escape(settings.STATIC_URL)
+    )
+    return pattern.sub(
+        lambda m: m.group(1) + manifest.get(m.group(2), m.group(2)), html
+    )
@@ -0,0 +1,62 @@
+"""Cached navigation tree and rendered CMS pages.
+
+Entries are keyed on a generation token; saving or deleting a Nav, SubNav,
+Page or StaticFile replaces it (see cms.signals), which drops the nav tree
+and every rendered page at once since each page embeds the navigation and
+links to the hashed static files.
+"""
+import uuid
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db.models import Prefetch
+from django.forms import model_to_dict
+
+from .models import Nav, SubNav
+
+GENERATION_KEY = 'cms:generation'
+
+
+def get_generation():
+    generation = cache.get(GENERATION_KEY)
+    if generation is None:
+        generation = uuid.uuid4().hex
+        # Keep a generation another process stored in the meantime
+        if not cache.add(GENERATION_KEY, generation, None):
+            generation = cache.get(GENERATION_KEY, generation)
+    return generation
+
+
+def invalidate():
+    cache.set(GENERATION_KEY, uuid.uuid4().hex, None)
+
+
+def page_key(permalink, generation=None):
+    return f'cms:page:{generation or get_generation()}:{permalink}'
+
+
+def build_nav_tree():
+    """Active navs with their active subnavs, in two queries"""
+    navs = list(Nav.objects.filter(active=True).order_by('-position')
+                .prefetch_related(Prefetch(
+                    'subnav_set',
+                    queryset=SubNav.objects.filter(active=True)
+                    .order_by('position'),
+                    to_attr='active_subnavs'
+                )))
+    tree = [
+        dict(model_to_dict(nav),
+             subnavs=[model_to_dict(subnav) for subnav in nav.active_subnavs])
+        for nav in navs
+    ]
+    # The highest positioned nav goes last, the rest stay in order
+    return tree[1:] + tree[:1]
+
+
+def get_nav_tree(generation=None):
+    key = f'cms:navs:{generation or get_generation()}'
+    tree = cache.get(key)
+    if tree is None:
+        tree = build_nav_tree()
+        cache.set(key, tree, settings.CMS_CACHE_TIMEOUT)
+    return tree
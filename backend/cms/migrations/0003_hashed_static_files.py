@@ -0,0 +1,20 @@
+# Generated by Django 5.2.6 on 2026-10-18 14:10
+
+import cms.assets
+import cms.models
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('cms', '0002_alter_nav_id_alter_page_id_alter_staticfile_id_and_more'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='staticfile',
+            name='file',
+            field=models.FileField(help_text='Please upload static file (image, css, js, etc). This file will be accessible at static/cms/filename, and under a content-hashed name that page imports are rewritten to', storage=cms.assets.HashedStaticStorage(base_url='/'), upload_to=cms.models.get_filename),
+        ),
+    ]
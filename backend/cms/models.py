@@ -1,9 +1,8 @@
-import os
-
 from django.core.exceptions import ValidationError
-from django.core.files.storage import FileSystemStorage
 from django.db import models
 
+from cms.assets import UPLOAD_DIR, HashedStaticStorage
+
 
 # Create your models here.
 
@@ -44,21 +43,24 @@ class Page(models.Model):
 
 
 def get_filename(instance, _):
-    return 'static/cms/' + str(instance.filename)
+    return UPLOAD_DIR + str(instance.filename)
 
 
 def validate_filename(value):
-    if os.path.exists('workshop_app/static/' + value):
-        raise ValidationError('Static file with that name already exists! Please choose a unique name. You may use '
-                              'foldername/filename to upload to a folder')
+    # Names only need to be unique in the table: files are stored under
+    # content-hashed names, so they never overwrite each other
+    parts = value.replace('\\', '/').split('/')
+    if value.startswith('/') or '..' in parts or '' in parts:
+        raise ValidationError('Please use a relative name like filename or foldername/filename')
 
 
 class StaticFile(models.Model):
     filename = models.CharField(max_length=70, unique=True, validators=[validate_filename])
-    file = models.FileField(upload_to=get_filename, storage=FileSystemStorage(location='workshop_app', base_url='/'),
+    file = models.FileField(upload_to=get_filename, storage=HashedStaticStorage(base_url='/'),
                             blank=False,
                             help_text='Please upload static file (image, css, js, etc). This file will be accessible '
-                                      'at static/cms/filename')
+                                      'at static/cms/filename, and under a content-hashed name that '
+                                      'page imports are rewritten to')
 
     def __str__(self):
         return self.filename
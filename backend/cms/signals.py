@@ -0,0 +1,18 @@
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from . import cache as cms_cache
+from .models import Nav, Page, StaticFile, SubNav
+
+
+@receiver(post_save, sender=Nav)
+@receiver(post_delete, sender=Nav)
+@receiver(post_save, sender=SubNav)
+@receiver(post_delete, sender=SubNav)
+@receiver(post_save, sender=Page)
+@receiver(post_delete, sender=Page)
+@receiver(post_save, sender=StaticFile)
+@receiver(post_delete, sender=StaticFile)
+def invalidate_cms_cache(sender, raw=False, **kwargs):
+    if not raw:
+        cms_cache.invalidate()
@@ -1,3 +1,208 @@
-from django.test import TestCase
+import gzip
+import hashlib
+import os
+import shutil
+import tempfile
 
-# Create your tests here.
+from django.core.cache import cache
+from django.core.exceptions import ValidationError
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.test import TestCase, override_settings
+
+from cms import assets
+from cms.models import Nav, Page, StaticFile, SubNav, validate_filename
+
+
+class TestPageCache(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.addCleanup(cache.clear)
+        self.page = Page.objects.create(
+            permalink="home", title="Welcome", content="<p>Hello</p>"
+        )
+        Page.objects.create(permalink="about", title="About",
+                            content="<p>About us</p>")
+        self.events = Nav.objects.create(name="Events", link="/w",
+                                            position=1)
+        self.more = Nav.objects.create(name="More", link="/m", position=2)
+        self.contact = Nav.objects.create(name="Contact", link="/c",
+                                          position=3)
+        SubNav.objects.create(nav=self.more, name="Team", link="/team",
+                              position=2)
+        SubNav.objects.create(nav=self.more, name="Blog", link="/blog",
+                              position=1)
+        SubNav.objects.create(nav=self.more, name="Old", link="/old",
+                              position=3, active=False)
+
+    def get(self, url="/page/"):
+        response = self.client.get(url)
+        self.assertEqual(response.status_code, 200)
+        return response.content.decode()
+
+    def test_nav_tree(self):
+        html = self.get()
+        # Same order as before: the highest position last, others descending
+        positions = [html.index(name) for name in
+                     ("More", "Events", "Contact")]
+        self.assertEqual(positions, sorted(positions))
+        self.assertLess(html.index("Blog"), html.index("Team"))
+        self.assertNotIn("/old", html)
+        self.assertIn("<p>Hello</p>", html)
+
+    def test_cached_pages_need_no_queries(self):
+        with self.assertNumQueries(3):
+            first = self.get()
+        with self.assertNumQueries(0):
+            self.assertEqual(self.get(), first)
+        # Other pages reuse the nav tree
+        with self.assertNumQueries(1):
+            self.assertIn("About us", self.get("/page/about"))
+
+    def test_changes_invalidate_pages(self):
+        self.get()
+        self.page.content = "<p>Updated</p>"
+        self.page.save()
+        self.assertIn("<p>Updated</p>", self.get())
+
+        SubNav.objects.create(nav=self.events, name="Python",
+                              link="/python", position=1)
+        self.assertIn("/python", self.get())
+
+        self.contact.delete()
+        self.assertNotIn("Contact", self.get())
+
+        self.page.active = False
+        self.page.save()
+        self.assertEqual(self.client.get("/page/").status_code, 404)
+
+
+@override_settings(HOME_PAGE_TITLE="Home")
+class TestHomeRedirect(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.addCleanup(cache.clear)
+
+    def test_redirect_is_resolved_once(self):
+        Page.objects.create(permalink="welcome", title="Home", content="")
+        with self.assertNumQueries(1):
+            self.assertRedirects(self.client.get("/"), "/page/welcome",
+                                 fetch_redirect_response=False)
+        with self.assertNumQueries(0):
+            self.assertRedirects(self.client.get("/"), "/page/welcome",
+                                 fetch_redirect_response=False)
+
+    def test_page_changes_update_the_redirect(self):
+        self.assertRedirects(self.client.get("/"), "/workshop/",
+                             fetch_redirect_response=False)
+        page = Page.objects.create(permalink="welcome", title="Home",
+                                   content="")
+        self.assertRedirects(self.client.get("/"), "/page/welcome",
+                             fetch_redirect_response=False)
+        page.delete()
+        self.assertRedirects(self.client.get("/"), "/workshop/",
+                             fetch_redirect_response=False)
+
+
+class TestStaticFiles(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.addCleanup(cache.clear)
+        self.folder = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.folder)
+        folder = override_settings(CMS_STATIC_FOLDER=self.folder)
+        folder.enable()
+        self.addCleanup(folder.disable)
+        self.css = b"body { color: red; }\n" * 50
+
+    def upload(self, filename, content):
+        return StaticFile.objects.create(
+            filename=filename, file=SimpleUploadedFile("upload", content)
+        )
+
+    def test_uploads_get_hashed_names_and_compressed_copies(self):
+        static = self.upload("css/site.css", self.css)
+        digest = hashlib.md5(self.css).hexdigest()[:12]
+        self.assertEqual(static.file.name, f"static/cms/css/site.{digest}.css")
+        self.assertEqual(static.file.url, f"/static/cms/css/site.{digest}.css")
+        with static.file.open() as f:
+            self.assertEqual(f.read(), self.css)
+        with gzip.open(static.file.path + ".gz") as f:
+            self.assertEqual(f.read(), self.css)
+        self.assertEqual(assets.read_manifest(),
+                         {"cms/css/site.css": f"cms/css/site.{digest}.css"})
+
+    def test_page_imports_point_at_hashed_files(self):
+        static = self.upload("css/site.css", self.css)
+        Page.objects.create(
+            permalink="home", title="Home", content="",
+            imports='<link rel="stylesheet" href="/static/cms/css/site.css">'
+                    '<script src="/static/cms/missing.js"></script>'
+        )
+        html = self.client.get("/page/").content.decode()
+        self.assertIn(f'href="/{static.file.name}"', html)
+        self.assertIn('src="/static/cms/missing.js"', html)
+
+        static.file = SimpleUploadedFile("upload", b"body { color: blue; }")
+        static.save()
+        self.assertIn(f'href="/{static.file.name}"',
+                      self.client.get("/page/").content.decode())
+
+    def test_deleted_files_leave_the_manifest(self):
+        static = self.upload("css/site.css", self.css)
+        self.upload("css/print.css", b"body { color: black; }")
+        name = static.file.name
+        static.file.delete(save=False)
+        self.assertEqual(list(assets.read_manifest()), ["cms/css/print.css"])
+        Page.objects.create(
+            permalink="home", title="Home", content="",
+            imports='<link rel="stylesheet" href="/static/cms/css/site.css">'
+        )
+        html = self.client.get("/page/").content.decode()
+        self.assertIn('href="/static/cms/css/site.css"', html)
+        self.assertNotIn(name, html)
+
+    def test_hashed_files_are_immutable(self):
+        static = self.upload("css/site.css", self.css)
+        response = self.client.get("/" + static.file.name)
+        self.assertEqual(response["Cache-Control"],
+                         "public, max-age=31536000, immutable")
+        self.assertEqual(response["Content-Type"], "text/css")
+        self.assertEqual(b"".join(response.streaming_content), self.css)
+
+        response = self.client.get("/static/cms/css/site.css")
+        self.assertEqual(response["Cache-Control"], "no-cache")
+        self.assertEqual(self.client.get("/static/cms/other.css").status_code,
+                         404)
+
+    def test_files_uploaded_before_hashing(self):
+        folder = os.path.join(self.folder, "static", "cms", "css")
+        os.makedirs(folder)
+        with open(os.path.join(folder, "old.css"), "wb") as f:
+            f.write(self.css)
+        response = self.client.get("/static/cms/css/old.css")
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response["Cache-Control"], "no-cache")
+        self.assertEqual(b"".join(response.streaming_content), self.css)
+
+        self.upload("css/site.css", self.css)
+        self.assertEqual(
+            self.client.get("/static/cms/manifest.json").status_code, 404
+        )
+
+    def test_precompressed_copies_are_negotiated(self):
+        static = self.upload("css/site.css", self.css)
+        url = "/" + static.file.name
+        response = self.client.get(url, HTTP_ACCEPT_ENCODING="gzip, deflate")
+        self.assertEqual(response["Content-Encoding"], "gzip")
+        self.assertIn("Accept-Encoding", response["Vary"])
+        self.assertEqual(
+            gzip.decompress(b"".join(response.streaming_content)), self.css
+        )
+        response = self.client.get(url, HTTP_ACCEPT_ENCODING="gzip;q=0")
+        self.assertFalse(response.has_header("Content-Encoding"))
+
+    def test_filenames_must_be_relative(self):
+        validate_filename("img/logo.png")
+        for name in ("/etc/passwd", "../settings.py", "img//logo.png"):
+            with self.assertRaises(ValidationError):
+                validate_filename(name)
@@ -1,29 +1,87 @@
 # Create your views here.
-from django.forms import model_to_dict
-from django.http import Http404
-from django.shortcuts import render
+import mimetypes
+import os
 
-from cms.models import Page, Nav, SubNav
+from django.conf import settings
+from django.core.cache import cache
+from django.http import FileResponse, Http404, HttpResponse
+from django.template.loader import render_to_string
+from django.utils.cache import patch_vary_headers
+
+from cms import assets, cache as cms_cache
+from cms.models import Page
+
+IMMUTABLE = 'public, max-age=31536000, immutable'
 
 
 def home(request, permalink=''):
     if permalink == '':
         permalink = 'home'
-    page = Page.objects.filter(permalink=permalink, active=True)
-    if page.exists():
-        page = page.first()
-    else:
-        raise Http404("The requested page does not exists")
-    nav_objs = Nav.objects.filter(active=True).order_by('-position')
-
-    navs = []
-
-    for nav in nav_objs:
-        nav_obj = model_to_dict(nav)
-        nav_obj['subnavs'] = nav.subnav_set.filter(
-            active=True).order_by('position')
-        navs.insert(-1, nav_obj)
-
-    return render(
-        request, 'cms_base.html', {'page': page, 'navs': navs}
+    generation = cms_cache.get_generation()
+    key = cms_cache.page_key(permalink, generation)
+    html = cache.get(key)
+    if html is None:
+        page = Page.objects.filter(permalink=permalink, active=True).first()
+        if page is None:
+            raise Http404("The requested page does not exists")
+        # Rendered without the request: the page is the same for everyone
+        html = render_to_string('cms_base.html', {
+            'page': page, 'imports': assets.rewrite_urls(page.imports),
+            'navs': cms_cache.get_nav_tree(generation)
+        })
+        cache.set(key, html, settings.CMS_CACHE_TIMEOUT)
+    return HttpResponse(html)
+
+
+def accepted_encodings(header):
+    """Content codings an Accept-Encoding header allows"""
+    codings = set()
+    for item in header.split(','):
+        coding, _, params = item.partition(';')
+        quality = params.strip().partition('q=')[2]
+        try:
+            if quality and float(quality) == 0:
+                continue
+        except ValueError:
+            continue
+        codings.add(coding.strip().lower())
+    return codings
+
+
+def static_file(request, path):
+    """Serve an uploaded static file, precompressed if the client accepts it
+
+    Content-hashed names never change and are cached forever; the plain
+    name resolves to the current hashed file, or to a file uploaded before
+    hashing, and is revalidated.
+    """
+    storage = assets.get_storage()
+    name = 'cms/' + path
+    hashed = assets.is_hashed(name)
+    if not hashed:
+        if 'static/' + name == assets.MANIFEST_NAME:
+            raise Http404("The requested file does not exist")
+        # Files uploaded before names were hashed are not in the manifest
+        # and are still served from their plain name
+        name = assets.read_manifest(storage).get(name, name)
+    full_path = storage.path('static/' + name)
+    if not os.path.isfile(full_path):
+        raise Http404("The requested file does not exist")
+
+    accepted = accepted_encodings(request.headers.get('Accept-Encoding', ''))
+    encoding = None
+    for coding, suffix in assets.ENCODINGS:
+        if coding in accepted and os.path.isfile(full_path + suffix):
+            full_path += suffix
+            encoding = coding
+            break
+    response = FileResponse(
+        open(full_path, 'rb'),
+        content_type=mimetypes.guess_type(name)[0] or
+        'application/octet-stream'
     )
+    if encoding:
+        response['Content-Encoding'] = encoding
+    patch_vary_headers(response, ['Accept-Encoding'])
+    response['Cache-Control'] = IMMUTABLE if hashed else 'no-cache'
+    return response
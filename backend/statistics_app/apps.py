@@ -3,3 +3,6 @@ from django.apps import AppConfig
 
 class StatisticsAppConfig(AppConfig):
     name = 'statistics_app'
+
+    def ready(self):
+        from . import signals  # noqa: F401
@@ -0,0 +1,104 @@
+"""Response cache for the public workshop statistics API.
+
+Entries are keyed on the normalised filter parameters plus a generation
+token. Saving or deleting anything the statistics depend on replaces the
+generation (see statistics_app.signals), which orphans every cached entry
+at once and moves the Last-Modified time forward.
+"""
+import hashlib
+import time
+import uuid
+from datetime import date
+
+from django.conf import settings
+from django.core.cache import caches
+from django.utils import timezone
+from django.utils.http import parse_http_date_safe
+
+GENERATION_KEY = 'public-stats:generation'
+SORT_CHOICES = ('date', '-date')
+DEFAULT_RANGE_DAYS = 15
+
+
+def get_cache():
+    return caches[settings.STATS_CACHE_ALIAS]
+
+
+def new_generation():
+    """A fresh ``(token, last_modified)``"""
+    return uuid.uuid4().hex, int(time.time())
+
+
+def get_generation():
+    """``(token, last_modified)`` of the current cache generation"""
+    cache = get_cache()
+    generation = cache.get(GENERATION_KEY)
+    if generation is None:
+        generation = new_generation()
+        # Keep a generation another process stored in the meantime
+        if not cache.add(GENERATION_KEY, generation, None):
+            generation = cache.get(GENERATION_KEY, generation)
+    return generation
+
+
+def invalidate():
+    get_cache().set(GENERATION_KEY, new_generation(), None)
+
+
+def _parse_date(value):
+    try:
+        return date.fromisoformat(value.strip()).isoformat()
+    except (AttributeError, ValueError):
+        return None
+
+
+def normalise_params(query_params):
+    """Filters of a public stats request in a canonical form"""
+    from_date = _parse_date(query_params.get('from_date'))
+    to_date = _parse_date(query_params.get('to_date'))
+    if not (from_date and to_date):
+        today = timezone.localdate()
+        from_date = today.isoformat()
+        to_date = (today + timezone.timedelta(
+            days=DEFAULT_RANGE_DAYS)).isoformat()
+    sort = query_params.get('sort', 'date')
+    return {
+        'from_date': from_date,
+        'to_date': to_date,
+        'state': (query_params.get('state') or '').strip(),
+        'workshop_type': (query_params.get('workshop_type') or '').strip(),
+        'sort': sort if sort in SORT_CHOICES else 'date',
+        # These change the shape of the serialised workshops
+        'expand': (query_params.get('expand') or '').lower(),
+        'fields': ','.join(sorted(
+            query_params.get('fields', '').replace(' ', '').split(','))),
+        'omit': ','.join(sorted(
+            query_params.get('omit', '').replace(' ', '').split(','))),
+    }
+
+
+def make_key(params, token):
+    raw = '&'.join(f'{k}={v}' for k, v in sorted(params.items()))
+    digest = hashlib.md5(f'{token}?{raw}'.encode('utf-8')).hexdigest()
+    return f'public-stats:{digest}'
+
+
+def make_etag(key):
+    return f'"{key.rsplit(":", 1)[-1]}"'
+
+
+def not_modified(request, etag, last_modified):
+    """True if the client's conditional headers match the cached entry"""
+    if_none_match = request.headers.get('If-None-Match')
+    if if_none_match is not None:
+        return etag in {tag.strip() for tag in if_none_match.split(',')} \
+            or if_none_match.strip() == '*'
+    # Last-Modified only has whole seconds: data from the current second
+    # may still change within it, which only the ETag would tell apart
+    if last_modified >= int(time.time()):
+        return False
+    if_modified_since = parse_http_date_safe(
+        request.headers.get('If-Modified-Since') or ''
+    )
+    return if_modified_since is not None and \
+        last_modified <= if_modified_since
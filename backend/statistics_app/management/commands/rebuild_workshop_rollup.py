@@ -0,0 +1,13 @@
+from django.core.management.base import BaseCommand
+
+from statistics_app.models import WorkshopRollup
+
+
+class Command(BaseCommand):
+    help = "Recompute the daily workshop rollup table from scratch"
+
+    def handle(self, *args, **options):
+        rows = WorkshopRollup.objects.rebuild()
+        self.stdout.write(self.style.SUCCESS(
+            f"Rebuilt workshop rollup with {rows} row(s)"
+        ))
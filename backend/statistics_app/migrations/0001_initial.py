@@ -0,0 +1,50 @@
+# Generated by Django 5.2.6 on 2026-10-18 13:31
+
+import django.db.models.deletion
+from django.db import migrations, models
+from django.db.models import Count
+
+
+def populate_rollup(apps, schema_editor):
+    Workshop = apps.get_model('workshop_app', 'Workshop')
+    WorkshopRollup = apps.get_model('statistics_app', 'WorkshopRollup')
+    rows = (
+        Workshop.objects.order_by()
+        .values_list('date', 'coordinator__profile__state',
+                     'workshop_type_id', 'status')
+        .annotate(count=Count('id'))
+    )
+    WorkshopRollup.objects.bulk_create(
+        (WorkshopRollup(date=day, state=state or '', workshop_type_id=ws_type,
+                        status=status, count=count)
+         for day, state, ws_type, status, count in rows.iterator()),
+        batch_size=1000
+    )
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+        ('workshop_app', '0018_alter_attachmentfile_id_alter_banner_id_and_more'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='WorkshopRollup',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('date', models.DateField()),
+                ('state', models.CharField(blank=True, choices=[('', '---------'), ('IN-AP', 'Andhra Pradesh'), ('IN-AR', 'Arunachal Pradesh'), ('IN-AS', 'Assam'), ('IN-BR', 'Bihar'), ('IN-CT', 'Chhattisgarh'), ('IN-GA', 'Goa'), ('IN-GJ', 'Gujarat'), ('IN-HR', 'Haryana'), ('IN-HP', 'Himachal Pradesh'), ('IN-JK', 'Jammu and Kashmir'), ('IN-JH', 'Jharkhand'), ('IN-KA', 'Karnataka'), ('IN-KL', 'Kerala'), ('IN-MP', 'Madhya Pradesh'), ('IN-MH', 'Maharashtra'), ('IN-MN', 'Manipur'), ('IN-ML', 'Meghalaya'), ('IN-MZ', 'Mizoram'), ('IN-NL', 'Nagaland'), ('IN-OR', 'Odisha'), ('IN-PB', 'Punjab'), ('IN-RJ', 'Rajasthan'), ('IN-SK', 'Sikkim'), ('IN-TN', 'Tamil Nadu'), ('IN-TG', 'Telangana'), ('IN-TR', 'Tripura'), ('IN-UT', 'Uttarakhand'), ('IN-UP', 'Uttar Pradesh'), ('IN-WB', 'West Bengal'), ('IN-AN', 'Andaman and Nicobar Islands'), ('IN-CH', 'Chandigarh'), ('IN-DN', 'Dadra and Nagar Haveli'), ('IN-DD', 'Daman and Diu'), ('IN-DL', 'Delhi'), ('IN-LD', 'Lakshadweep'), ('IN-PY', 'Puducherry')], max_length=255)),
+                ('status', models.IntegerField(choices=[(0, 'Pending'), (1, 'Accepted'), (2, 'Deleted')])),
+                ('count', models.PositiveIntegerField(default=0)),
+                ('workshop_type', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, to='workshop_app.workshoptype')),
+            ],
+            options={
+                'indexes': [models.Index(fields=['status', 'date'], name='statistics__status_aa2b51_idx')],
+                'constraints': [models.UniqueConstraint(fields=('date', 'state', 'workshop_type', 'status'), name='unique_workshop_rollup_key')],
+            },
+        ),
+        migrations.RunPython(populate_rollup, migrations.RunPython.noop),
+    ]
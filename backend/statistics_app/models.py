@@ -1,3 +1,104 @@
-from django.db import models
+from collections import Counter
 
-# Create your models here.
+from django.db import IntegrityError, models, transaction
+from django.db.models import Count, F, Sum
+
+from workshop_app.models import Workshop, WorkshopType, states
+
+
+class WorkshopRollupManager(models.Manager):
+
+    def rollup_key(self, date, state, workshop_type_id, status):
+        return {"date": date, "state": state or "",
+                "workshop_type_id": workshop_type_id, "status": status}
+
+    def bump(self, key, delta):
+        """Add ``delta`` to the count stored for ``key``"""
+        rows = self.filter(**key)
+        if delta < 0:
+            # Never go negative if the rollup has drifted; rebuild fixes it
+            rows = rows.filter(count__gte=-delta)
+        updated = rows.update(count=F("count") + delta)
+        if updated or delta <= 0:
+            return
+        try:
+            with transaction.atomic():
+                self.create(count=delta, **key)
+        except IntegrityError:
+            # Another request created the row first
+            self.filter(**key).update(count=F("count") + delta)
+
+    @transaction.atomic
+    def rebuild(self):
+        """Recompute every rollup row from the Workshop table"""
+        self.all().delete()
+        rows = (
+            Workshop.objects.order_by()
+            .values_list("date", "coordinator__profile__state",
+                         "workshop_type_id", "status")
+            .annotate(count=Count("id"))
+        )
+        return len(self.bulk_create(
+            (self.model(count=count,
+                        **self.rollup_key(day, state, ws_type, status))
+             for day, state, ws_type, status, count in rows.iterator()),
+            batch_size=1000
+        ))
+
+    def get_workshops_by_state_and_type(self, from_date, to_date, state=None,
+                                        workshop_type=None, status=1):
+        """Same contract as WorkshopManager.get_workshops_by_state_and_type,
+        answered from the rollup table for a date range.
+        """
+        rows = self.filter(date__range=(from_date, to_date), status=status)
+        if state:
+            rows = rows.filter(state=state)
+        if workshop_type:
+            rows = rows.filter(workshop_type_id=workshop_type)
+        rows = (
+            rows.order_by().values_list("state", "workshop_type__name")
+            .annotate(total=Sum("count"))
+        )
+        by_state, by_type = Counter(), Counter()
+        for state_code, ws_name, total in rows:
+            if not total:
+                continue
+            if state_code:
+                by_state[state_code] += total
+            by_type[ws_name] += total
+
+        states_map = dict(states)
+        state_groups = sorted(by_state.items(), key=lambda g: (-g[1], g[0]))
+        type_groups = sorted(by_type.items(), key=lambda g: (-g[1], g[0]))
+        return (
+            ([states_map.get(s, s) for s, _ in state_groups],
+             [c for _, c in state_groups]),
+            ([t for t, _ in type_groups], [c for _, c in type_groups]),
+        )
+
+
+class WorkshopRollup(models.Model):
+    """
+    Number of workshops per day, coordinator state, workshop type and status.
+    Kept up to date by the Workshop signals in statistics_app.signals.
+    """
+    date = models.DateField()
+    state = models.CharField(max_length=255, choices=states, blank=True)
+    workshop_type = models.ForeignKey(WorkshopType, on_delete=models.CASCADE)
+    status = models.IntegerField(choices=Workshop.STATUS_CHOICES)
+    count = models.PositiveIntegerField(default=0)
+
+    objects = WorkshopRollupManager()
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(
+                fields=["date", "state", "workshop_type", "status"],
+                name="unique_workshop_rollup_key"
+            )
+        ]
+        indexes = [models.Index(fields=["status", "date"])]
+
+    def __str__(self):
+        return (f"{self.count} {self.get_status_display()} workshop(s) "
+                f"on {self.date}")
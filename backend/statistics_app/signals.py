@@ -0,0 +1,104 @@
+from django.db.models.signals import (
+    post_delete, post_save, pre_delete, pre_save
+)
+from django.db.models import Count
+from django.dispatch import receiver
+
+from workshop_app.models import Profile, Workshop, WorkshopType
+from . import cache as stats_cache
+from .models import WorkshopRollup
+
+
+def _coordinator_state(workshop):
+    return Profile.objects.filter(
+        user_id=workshop.coordinator_id
+    ).values_list("state", flat=True).first()
+
+
+@receiver(pre_save, sender=Workshop)
+def remember_rollup_key(sender, instance, raw=False, **kwargs):
+    """Store the key the workshop is counted under before it changes"""
+    instance._rollup_key = None
+    if raw or instance.pk is None:
+        return
+    old = Workshop.objects.filter(pk=instance.pk).values_list(
+        "date", "coordinator__profile__state", "workshop_type_id", "status"
+    ).first()
+    if old is not None:
+        instance._rollup_key = WorkshopRollup.objects.rollup_key(*old)
+
+
+@receiver(post_save, sender=Workshop)
+def update_rollup_on_save(sender, instance, raw=False, **kwargs):
+    if raw:
+        return
+    new_key = WorkshopRollup.objects.rollup_key(
+        instance.date, _coordinator_state(instance),
+        instance.workshop_type_id, instance.status
+    )
+    old_key = getattr(instance, "_rollup_key", None)
+    if old_key == new_key:
+        return
+    if old_key is not None:
+        WorkshopRollup.objects.bump(old_key, -1)
+    WorkshopRollup.objects.bump(new_key, 1)
+
+
+@receiver(pre_delete, sender=Workshop)
+def remember_rollup_key_on_delete(sender, instance, **kwargs):
+    # pre_delete fires before cascades remove the coordinator's profile
+    instance._rollup_key = WorkshopRollup.objects.rollup_key(
+        instance.date, _coordinator_state(instance),
+        instance.workshop_type_id, instance.status
+    )
+
+
+@receiver(post_delete, sender=Workshop)
+def update_rollup_on_delete(sender, instance, **kwargs):
+    key = getattr(instance, "_rollup_key", None)
+    if key is not None:
+        WorkshopRollup.objects.bump(key, -1)
+
+
+@receiver(pre_save, sender=Profile)
+def remember_profile_state(sender, instance, raw=False, update_fields=None,
+                           **kwargs):
+    """Store the state the coordinator's workshops are counted under"""
+    instance._rollup_state = None
+    if raw or (update_fields is not None and "state" not in update_fields):
+        return
+    # Workshops of a coordinator without a profile are counted under ""
+    instance._rollup_state = Profile.objects.filter(
+        pk=instance.pk
+    ).values_list("state", flat=True).first() or ""
+
+
+@receiver(post_save, sender=Profile)
+def update_rollup_on_state_change(sender, instance, raw=False, **kwargs):
+    old_state = getattr(instance, "_rollup_state", None)
+    if raw or old_state is None or old_state == (instance.state or ""):
+        return
+    counts = (
+        Workshop.objects.filter(coordinator_id=instance.user_id).order_by()
+        .values_list("date", "workshop_type_id", "status")
+        .annotate(count=Count("id"))
+    )
+    for date, workshop_type_id, status, count in counts:
+        WorkshopRollup.objects.bump(WorkshopRollup.objects.rollup_key(
+            date, old_state, workshop_type_id, status
+        ), -count)
+        WorkshopRollup.objects.bump(WorkshopRollup.objects.rollup_key(
+            date, instance.state, workshop_type_id, status
+        ), count)
+
+
+@receiver(post_save, sender=Workshop)
+@receiver(post_delete, sender=Workshop)
+@receiver(post_save, sender=WorkshopType)
+@receiver(post_delete, sender=WorkshopType)
+@receiver(post_save, sender=Profile)
+@receiver(post_delete, sender=Profile)
+def invalidate_stats_cache(sender, raw=False, **kwargs):
+    """Anything the public statistics show has changed"""
+    if not raw:
+        stats_cache.invalidate()
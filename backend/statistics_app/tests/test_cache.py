@@ -0,0 +1,102 @@
+import time
+from datetime import date
+from unittest import mock
+
+from django.contrib.auth.models import User
+from django.test import TestCase
+
+from statistics_app import cache as stats_cache
+from workshop_app.models import Profile, Workshop, WorkshopType
+
+
+class TestPublicStatsCache(TestCase):
+    url = "/api/public-workshop-stats/"
+    params = {"from_date": "2020-01-01", "to_date": "2020-01-31"}
+
+    def setUp(self):
+        stats_cache.get_cache().clear()
+        self.python = WorkshopType.objects.create(
+            name="Python", description="", duration=1, terms_and_conditions=""
+        )
+        self.coordinator = User.objects.create(username="coordinator")
+        Profile.objects.create(
+            user=self.coordinator, institute="IIT", department="electronics",
+            phone_number="1122993388", state="IN-MH"
+        )
+        self.workshop = self.create_workshop()
+
+    def create_workshop(self, day=5):
+        return Workshop.objects.create(
+            coordinator=self.coordinator, workshop_type=self.python,
+            date=date(2020, 1, day), status=1, tnc_accepted=True
+        )
+
+    def test_repeat_requests_are_served_from_cache(self):
+        first = self.client.get(self.url, self.params)
+        self.assertEqual(first.data["ws_type_count"], [1])
+        with self.assertNumQueries(0):
+            second = self.client.get(self.url, self.params)
+        self.assertEqual(first.data, second.data)
+        self.assertEqual(first["ETag"], second["ETag"])
+
+    def test_equivalent_params_share_an_entry(self):
+        self.client.get(self.url, {**self.params, "sort": "date"})
+        with self.assertNumQueries(0):
+            self.client.get(self.url, {"to_date": "2020-01-31 ",
+                                       "from_date": "2020-01-01",
+                                       "sort": "bogus"})
+
+    def test_workshop_changes_invalidate(self):
+        first = self.client.get(self.url, self.params)
+        self.create_workshop(day=6)
+        second = self.client.get(self.url, self.params)
+        self.assertEqual(second.data["ws_type_count"], [2])
+        self.assertNotEqual(first["ETag"], second["ETag"])
+
+        self.workshop.delete()
+        third = self.client.get(self.url, self.params)
+        self.assertEqual(third.data["ws_type_count"], [1])
+
+    def test_conditional_requests(self):
+        # A generation from an earlier second
+        stats_cache.get_cache().set(
+            stats_cache.GENERATION_KEY, ("earlier", int(time.time()) - 10),
+            None
+        )
+        first = self.client.get(self.url, self.params)
+        response = self.client.get(
+            self.url, self.params, HTTP_IF_NONE_MATCH=first["ETag"]
+        )
+        self.assertEqual(response.status_code, 304)
+        response = self.client.get(
+            self.url, self.params,
+            HTTP_IF_MODIFIED_SINCE=first["Last-Modified"]
+        )
+        self.assertEqual(response.status_code, 304)
+
+        self.create_workshop(day=6)
+        response = self.client.get(
+            self.url, self.params, HTTP_IF_NONE_MATCH=first["ETag"]
+        )
+        self.assertEqual(response.status_code, 200)
+        response = self.client.get(
+            self.url, self.params,
+            HTTP_IF_MODIFIED_SINCE=first["Last-Modified"]
+        )
+        self.assertEqual(response.status_code, 200)
+
+    def test_no_304_from_if_modified_since_within_the_same_second(self):
+        with mock.patch.object(stats_cache.time, "time", return_value=1e9):
+            stats_cache.invalidate()
+            first = self.client.get(self.url, self.params)
+            # Could change again before the second is over
+            response = self.client.get(
+                self.url, self.params,
+                HTTP_IF_MODIFIED_SINCE=first["Last-Modified"]
+            )
+            self.assertEqual(response.status_code, 200)
+        response = self.client.get(
+            self.url, self.params,
+            HTTP_IF_MODIFIED_SINCE=first["Last-Modified"]
+        )
+        self.assertEqual(response.status_code, 304)
@@ -0,0 +1,90 @@
+import csv
+import tracemalloc
+import uuid
+from datetime import date, timedelta
+
+from django.contrib.auth.models import User
+from django.db import connection
+from django.test import TestCase
+
+from workshop_app.models import Profile, Workshop, WorkshopType
+
+
+class TestStatisticsExport(TestCase):
+    params = {"from_date": "2020-01-01", "to_date": "2020-12-31",
+              "sort": "date", "download": "download"}
+
+    def setUp(self):
+        self.python = WorkshopType.objects.create(
+            name="Python", description="", duration=1, terms_and_conditions=""
+        )
+        self.coordinator = User.objects.create(
+            username="coordinator", first_name="Ada", last_name="Lovelace"
+        )
+        Profile.objects.create(
+            user=self.coordinator, institute="IIT", department="electronics",
+            phone_number="1122993388", state="IN-MH"
+        )
+
+    def bulk_insert_workshops(self, count):
+        """Raw insert, model instances make setting up 500k rows too slow"""
+        # A coordinator proposes one workshop of a type per day, so spread
+        # the rows over every day of 2020 and enough workshop types
+        days = 366
+        types = WorkshopType.objects.bulk_create(
+            WorkshopType(name=f"Type {i}", description="", duration=1,
+                         terms_and_conditions="")
+            for i in range(-(-count // days))
+        )
+        rows = (
+            (uuid.uuid4().hex, self.coordinator.id, types[i // days].id,
+             date(2020, 1, 1) + timedelta(days=i % days), 1, True)
+            for i in range(count)
+        )
+        with connection.cursor() as cursor:
+            cursor.executemany(
+                f"INSERT INTO {Workshop._meta.db_table} (uid, coordinator_id, "
+                "workshop_type_id, date, status, tnc_accepted) "
+                "VALUES (%s, %s, %s, %s, %s, %s)", rows
+            )
+
+    def test_csv_content(self):
+        Workshop.objects.create(
+            coordinator=self.coordinator, workshop_type=self.python,
+            date=date(2020, 3, 4), status=1, tnc_accepted=True
+        )
+        response = self.client.get("/statistics/public", self.params)
+        self.assertTrue(response.streaming)
+        self.assertEqual(
+            response["Content-Disposition"],
+            "attachment; filename=statistics.csv"
+        )
+        content = b"".join(response.streaming_content).decode()
+        self.assertEqual(list(csv.reader(content.splitlines())), [
+            ["workshop_type__name", "coordinator__first_name",
+             "coordinator__last_name", "instructor__first_name",
+             "instructor__last_name", "coordinator__profile__state",
+             "date", "status"],
+            ["Python", "Ada", "Lovelace", "", "", "Maharashtra",
+             "2020-03-04", "Success"],
+        ])
+
+    def test_no_data(self):
+        response = self.client.get("/statistics/public", self.params)
+        self.assertFalse(response.streaming)
+        self.assertEqual(response.status_code, 200)
+
+    def test_500k_rows_stream_in_bounded_memory(self):
+        self.bulk_insert_workshops(500000)
+        response = self.client.get("/statistics/public", self.params)
+
+        tracemalloc.start()
+        try:
+            lines = 0
+            for chunk in response.streaming_content:
+                lines += chunk.count(b"\n")
+            _, peak = tracemalloc.get_traced_memory()
+        finally:
+            tracemalloc.stop()
+        self.assertEqual(lines, 500001)
+        self.assertLess(peak, 16 * 1024 * 1024)
@@ -0,0 +1,144 @@
+from datetime import date
+from io import StringIO
+
+from django.contrib.auth.models import User
+from django.core.management import call_command
+from django.test import TestCase
+
+from statistics_app.models import WorkshopRollup
+from workshop_app.models import Profile, Workshop, WorkshopType
+
+
+class TestWorkshopRollup(TestCase):
+    def setUp(self):
+        self.python = WorkshopType.objects.create(
+            name="Python", description="", duration=1, terms_and_conditions=""
+        )
+        self.coordinator = User.objects.create(username="coordinator")
+        Profile.objects.create(
+            user=self.coordinator, institute="IIT", department="electronics",
+            phone_number="1122993388", state="IN-MH"
+        )
+
+    def create_workshop(self, **kwargs):
+        kwargs.setdefault("date", date(2020, 1, 10))
+        kwargs.setdefault("status", 0)
+        kwargs.setdefault("coordinator", self.coordinator)
+        return Workshop.objects.create(
+            workshop_type=self.python, tnc_accepted=True, **kwargs
+        )
+
+    def rollup(self):
+        return set(WorkshopRollup.objects.filter(count__gt=0).values_list(
+            "date", "state", "workshop_type_id", "status", "count"
+        ))
+
+    def assertRollupMatchesRebuild(self):
+        incremental = self.rollup()
+        WorkshopRollup.objects.rebuild()
+        self.assertEqual(incremental, self.rollup())
+
+    def test_create_accept_redate_delete(self):
+        other = User.objects.create(username="other")
+        Profile.objects.create(
+            user=other, institute="IIT", department="cs",
+            phone_number="1122993388", state="IN-MH"
+        )
+        workshop = self.create_workshop()
+        self.create_workshop(coordinator=other)
+        self.assertEqual(self.rollup(), {
+            (date(2020, 1, 10), "IN-MH", self.python.id, 0, 2)
+        })
+
+        workshop.status = 1
+        workshop.save()
+        workshop.date = date(2020, 2, 1)
+        workshop.save()
+        self.assertEqual(self.rollup(), {
+            (date(2020, 1, 10), "IN-MH", self.python.id, 0, 1),
+            (date(2020, 2, 1), "IN-MH", self.python.id, 1, 1),
+        })
+        self.assertRollupMatchesRebuild()
+
+        workshop.delete()
+        self.assertEqual(self.rollup(), {
+            (date(2020, 1, 10), "IN-MH", self.python.id, 0, 1)
+        })
+
+    def test_coordinator_delete_cascades_to_rollup(self):
+        self.create_workshop(status=1)
+        self.coordinator.delete()
+        self.assertEqual(self.rollup(), set())
+
+    def test_coordinator_state_change_moves_counts(self):
+        self.create_workshop(status=1)
+        self.create_workshop(date=date(2020, 1, 11), status=1)
+        profile = self.coordinator.profile
+        profile.state = "IN-KA"
+        profile.save()
+        self.assertEqual(self.rollup(), {
+            (date(2020, 1, 10), "IN-KA", self.python.id, 1, 1),
+            (date(2020, 1, 11), "IN-KA", self.python.id, 1, 1),
+        })
+        self.assertRollupMatchesRebuild()
+
+        params = {"from_date": "2020-01-01", "to_date": "2020-01-31",
+                  "sort": "date"}
+        response = self.client.get("/statistics/public", params)
+        self.assertEqual(response.context["ws_states"], ["Karnataka"])
+
+    def test_stats_match_workshop_manager(self):
+        ka = User.objects.create(username="ka")
+        Profile.objects.create(
+            user=ka, institute="IIT", department="electronics",
+            phone_number="1122993388", state="IN-KA"
+        )
+        for day in (1, 2, 3):
+            self.create_workshop(date=date(2020, 1, day), status=1)
+        Workshop.objects.create(
+            coordinator=ka, workshop_type=self.python, tnc_accepted=True,
+            date=date(2020, 1, 2), status=1
+        )
+        self.create_workshop(date=date(2020, 3, 1), status=1)
+
+        workshops = Workshop.objects.filter(
+            status=1, date__range=("2020-01-01", "2020-01-31")
+        )
+        with self.assertNumQueries(1):
+            stats = WorkshopRollup.objects.get_workshops_by_state_and_type(
+                "2020-01-01", "2020-01-31"
+            )
+        self.assertEqual(
+            stats, Workshop.objects.get_workshops_by_state_and_type(workshops)
+        )
+        self.assertEqual(stats[0], (["Maharashtra", "Karnataka"], [3, 1]))
+        self.assertEqual(
+            WorkshopRollup.objects.get_workshops_by_state_and_type(
+                "2020-01-01", "2020-01-31", state="IN-KA"
+            )[0],
+            (["Karnataka"], [1])
+        )
+
+    def test_rebuild_command(self):
+        self.create_workshop()
+        WorkshopRollup.objects.all().delete()
+        out = StringIO()
+        call_command("rebuild_workshop_rollup", stdout=out)
+        self.assertIn("1 row(s)", out.getvalue())
+        self.assertEqual(self.rollup(), {
+            (date(2020, 1, 10), "IN-MH", self.python.id, 0, 1)
+        })
+
+    def test_public_stats_read_from_rollup(self):
+        self.create_workshop(date=date(2020, 1, 2), status=1)
+        params = {"from_date": "2020-01-01", "to_date": "2020-01-31",
+                  "sort": "date"}
+        response = self.client.get("/statistics/public", params)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.context["ws_states"], ["Maharashtra"])
+        self.assertEqual(response.context["ws_type_count"], [1])
+
+        response = self.client.get("/api/public-workshop-stats/", params)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data["ws_type"], ["Python"])
+        self.assertEqual(response.data["ws_count"], [1])
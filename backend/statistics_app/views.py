@@ -1,6 +1,5 @@
 # Python Imports
 import datetime as dt
-import pandas as pd
 
 # Django Imports
 from django.template.loader import get_template
@@ -11,20 +10,28 @@ from django.core.paginator import Paginator
 from django.shortcuts import render, redirect
 from django.urls import reverse
 from django.utils import timezone
-from django.http import HttpResponse
 
 # Local Imports
 from workshop_app.models import (
-    Profile, User, has_profile, Workshop, WorkshopType, Testimonial,
-    states
+    Profile, User, has_profile, Workshop, WorkshopType, Testimonial
 )
+from workshop_app.exports import (
+    Column, WORKSHOP_STATUS_EXPORT, export_rows, state_name,
+    streaming_export_response
+)
+from workshop_app.roles import is_instructor
 from teams.models import Team
 from .forms import FilterForm
+from .models import WorkshopRollup
 
 
-def is_instructor(user):
-    '''Check if the user is having instructor rights'''
-    return user.groups.filter(name='instructor').exists()
+EXPORT_COLUMNS = [
+    Column("workshop_type__name"), Column("coordinator__first_name"),
+    Column("coordinator__last_name"), Column("instructor__first_name"),
+    Column("instructor__last_name"),
+    Column("coordinator__profile__state", format=state_name),
+    Column("date"), Column("status", format=WORKSHOP_STATUS_EXPORT.get),
+]
 
 
 def is_email_checked(user):
@@ -57,41 +64,35 @@ def workshop_public_stats(request):
             workshops = workshops.filter(coordinator__profile__state=state)
         if workshoptype:
             workshops = workshops.filter(workshop_type_id=workshoptype)
+        rollup_filters = {"from_date": from_date, "to_date": to_date,
+                          "state": state, "workshop_type": workshoptype}
     else:
         today = timezone.now()
         upto = today + dt.timedelta(days=15)
         workshops = Workshop.objects.filter(
             date__range=(today, upto), status=1
             ).order_by("date")
+        rollup_filters = {"from_date": today, "to_date": upto}
     if show_workshops:
         if is_instructor(user):
             workshops = workshops.filter(instructor_id=user.id)
         else:
             workshops = workshops.filter(coordinator_id=user.id)
     if download:
-        data = workshops.values(
-            "workshop_type__name", "coordinator__first_name",
-            "coordinator__last_name", "instructor__first_name",
-            "instructor__last_name", "coordinator__profile__state",
-            "date", "status"
-        )
-        df = pd.DataFrame(list(data))
-        if not df.empty:
-            df.status.replace(
-                [0, 1, 2], ['Pending', 'Success', 'Reject'], inplace=True
+        if workshops.exists():
+            return streaming_export_response(
+                'statistics', [c.header for c in EXPORT_COLUMNS],
+                export_rows(workshops, EXPORT_COLUMNS)
             )
-            codes, states_map = list(zip(*states))
-            df.coordinator__profile__state.replace(
-                codes, states_map, inplace=True
+        messages.add_message(request, messages.WARNING, "No data found")
+    if show_workshops:
+        (ws_states, ws_count), (ws_type, ws_type_count) = \
+            Workshop.objects.get_workshops_by_state_and_type(workshops)
+    else:
+        (ws_states, ws_count), (ws_type, ws_type_count) = \
+            WorkshopRollup.objects.get_workshops_by_state_and_type(
+                **rollup_filters
             )
-            response = HttpResponse(content_type='text/csv')
-            response['Content-Disposition'] = f'attachment; filename=statistics.csv'
-            output_file = df.to_csv(response, index=False)
-            return response
-        else:
-            messages.add_message(request, messages.WARNING, "No data found")
-    ws_states, ws_count = Workshop.objects.get_workshops_by_state(workshops)
-    ws_type, ws_type_count = Workshop.objects.get_workshops_by_type(workshops)
     paginator = Paginator(workshops, 30)
     page = request.GET.get('page')
     workshops = paginator.get_page(page)
@@ -117,13 +118,7 @@ def team_stats(request, team_id=None):
         )
         return redirect(reverse("workshop_app:index"))
 
-    member_workshop_data = {}
-    for member in team.members.all():
-        workshop_count = Workshop.objects.filter(
-            instructor_id=member.user.id).count()
-        member_workshop_data[member.user.get_full_name()] = workshop_count
-    team_labels = list(member_workshop_data.keys())
-    ws_count = list(member_workshop_data.values())
+    team_labels, ws_count = team.get_member_workshop_counts()
     return render(
         request, 'statistics_app/team_stats.html',
         {'team_labels': team_labels, "ws_count": ws_count, 'all_teams': teams,
@@ -1,4 +1,5 @@
 from django.db import models
+from django.db.models import Count
 from django.contrib.auth.models import User
 
 from workshop_app.models import Profile
@@ -10,3 +11,20 @@ class Team(models.Model):
 
     def __str__(self):
         return f"Team created by {self.creator.get_full_name()}"
+
+    def get_member_workshop_counts(self):
+        """Names of the members and the number of workshops each instructed,
+        fetched in one annotated query.
+        """
+        members = self.members.order_by("id").values_list(
+            "id", "user__first_name", "user__last_name"
+        ).annotate(
+            workshop_count=Count("user__workshop_app_workshop_related")
+        )
+        member_workshop_data = {}
+        for _, first_name, last_name, workshop_count in members:
+            # Same format as User.get_full_name()
+            full_name = f"{first_name} {last_name}".strip()
+            member_workshop_data[full_name] = workshop_count
+        return (list(member_workshop_data.keys()),
+                list(member_workshop_data.values()))
@@ -1,3 +1,84 @@
+from datetime import date
+
+from django.contrib.auth.models import Group, User
+from django.core.cache import cache
+from django.db import connection
 from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+
+from teams.models import Team
+from workshop_app.models import Profile, Workshop, WorkshopType
+
+
+class TestTeamStats(TestCase):
+    def setUp(self):
+        self.python = WorkshopType.objects.create(
+            name="Python", description="", duration=1, terms_and_conditions=""
+        )
+        self.instructor_group = Group.objects.create(name="instructor")
+        self.creator = self.create_member("creator", workshops=2)
+        self.creator.user.set_password("pass@123")
+        self.creator.user.save()
+        self.team = Team.objects.create(creator=self.creator.user)
+        self.team.members.add(self.creator)
+
+    def create_member(self, username, workshops=0):
+        user = User.objects.create(
+            username=username, first_name=username.title(), last_name="Member"
+        )
+        self.instructor_group.user_set.add(user)
+        profile = Profile.objects.create(
+            user=user, institute="IIT", department="electronics",
+            phone_number="1122993388", position="instructor"
+        )
+        for day in range(1, workshops + 1):
+            Workshop.objects.create(
+                coordinator=user, instructor=user, workshop_type=self.python,
+                date=date(2020, 1, day), status=1, tnc_accepted=True
+            )
+        return profile
+
+    def add_members(self, count):
+        for i in range(count):
+            self.team.members.add(
+                self.create_member(f"member{self.team.members.count()}",
+                                   workshops=i % 3)
+            )
+
+    def count_queries(self, url):
+        # Start cold so cached group lookups do not skew the comparison
+        cache.clear()
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(url)
+        self.assertEqual(response.status_code, 200)
+        return len(queries), response
+
+    def test_member_workshop_counts(self):
+        self.add_members(3)
+        with self.assertNumQueries(1):
+            labels, counts = self.team.get_member_workshop_counts()
+        self.assertEqual(
+            labels, ["Creator Member", "Member1 Member", "Member2 Member",
+                     "Member3 Member"]
+        )
+        self.assertEqual(counts, [2, 0, 1, 2])
+
+    def test_team_stats_queries_do_not_grow_with_members(self):
+        self.client.login(username="creator", password="pass@123")
+        url = f"/statistics/team/{self.team.id}"
+        small, _ = self.count_queries(url)
+        self.add_members(10)
+        large, response = self.count_queries(url)
+        self.assertEqual(small, large)
+        self.assertEqual(response.context["ws_count"][0], 2)
+        self.assertEqual(len(response.context["team_labels"]), 11)
 
-# Create your tests here.
+    def test_team_stats_api_queries_do_not_grow_with_members(self):
+        self.client.login(username="creator", password="pass@123")
+        url = f"/api/team-stats/{self.team.id}/"
+        small, _ = self.count_queries(url)
+        self.add_members(10)
+        large, response = self.count_queries(url)
+        self.assertEqual(small, large)
+        self.assertEqual(len(response.data["all_teams"][0]["members"]), 11)
+        self.assertEqual(response.data["ws_count"][0], 2)
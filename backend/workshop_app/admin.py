@@ -1,120 +1,84 @@
-import pandas as pd
-
 from django.contrib import admin
-from django.http import HttpResponse
+from django.utils import timezone
 
+from .exports import Column, StreamingExportMixin, WORKSHOP_STATUS_EXPORT
 from .models import (
     Profile, WorkshopType,
     Workshop,
-    Testimonial, Comment, Banner, AttachmentFile
+    Testimonial, Comment, Banner, AttachmentFile, QueuedEmail,
+    SentReminder
 )
 
-try:
-    from StringIO import StringIO as string_io
-except ImportError:
-    from io import BytesIO as string_io
-
 
 # Custom Classes
-class ProfileAdmin(admin.ModelAdmin):
+class ProfileAdmin(StreamingExportMixin, admin.ModelAdmin):
     list_display = ['title', 'user', 'institute', 'location', 'department',
                     'phone_number', 'position']
     list_filter = ['position', 'department']
-    actions = ['download_csv']
-
-    def download_csv(self, request, queryset):
-        data = queryset.values(
-            "title", "user__first_name", "user__last_name",
-            "user__email", "institute", "location", "department",
-            "phone_number"
-        )
-        df = pd.DataFrame(data)
-        response = HttpResponse(content_type='text/csv')
-        response['Content-Disposition'] = f'attachment; filename=profile.csv'
-        output_file = df.to_csv(response, index=False)
-        return response
-
-    download_csv.short_description = "Download CSV file for selected stats."
+    export_filename = 'profile'
+    export_columns = [
+        "title", "user__first_name", "user__last_name", "user__email",
+        "institute", "location", "department", "phone_number"
+    ]
 
 
-class WorkshopAdmin(admin.ModelAdmin):
+class WorkshopAdmin(StreamingExportMixin, admin.ModelAdmin):
     list_display = ['workshop_type', 'instructor', 'date', 'status', 'coordinator']
     list_filter = ['workshop_type', 'date']
-    actions = ['download_csv']
-
-    def download_csv(self, request, queryset):
-        data = queryset.values(
-            "workshop_type__name", "date", "coordinator__first_name",
-            "coordinator__last_name", "instructor__first_name",
-            "instructor__last_name", "status"
-        )
-        df = pd.DataFrame(data)
-        df.status.replace(
-            [0, 1, 2], ['Pending', 'Success', 'Reject'], inplace=True
-        )
-        response = HttpResponse(content_type='text/csv')
-        response['Content-Disposition'] = f'attachment; filename=workshops.csv'
-        output_file = df.to_csv(response, index=False)
-        return response
-
-    download_csv.short_description = "Download CSV file for selected stats."
+    export_filename = 'workshops'
+    export_columns = [
+        "workshop_type__name", "date", "coordinator__first_name",
+        "coordinator__last_name", "instructor__first_name",
+        "instructor__last_name",
+        Column("status", format=WORKSHOP_STATUS_EXPORT.get)
+    ]
 
 
 class AttachmentFileInline(admin.TabularInline):
     model = AttachmentFile
 
 
-class WorkshopTypeAdmin(admin.ModelAdmin):
+class WorkshopTypeAdmin(StreamingExportMixin, admin.ModelAdmin):
     list_display = ['name', 'duration']
     list_filter = ['name']
-    actions = ['download_csv']
     inlines = [AttachmentFileInline]
+    export_filename = 'workshoptype_data'
+    export_columns = ['name', 'duration']
 
-    def download_csv(self, request, queryset):
-        openfile = string_io()
-        response = HttpResponse(content_type='text/csv')
-        response['Content-Disposition'] = 'attachment;filename=workshoptype_data.csv'
-        writer = csv.writer(response)
-        writer.writerow(['name', 'duration'])
-
-        for q in queryset:
-            writer.writerow([q.name, q.duration])
-
-        openfile.seek(0)
-        response.write(openfile.read())
-        return response
 
-    download_csv.short_description = "Download CSV file for selected stats."
-
-
-class TestimonialAdmin(admin.ModelAdmin):
+class TestimonialAdmin(StreamingExportMixin, admin.ModelAdmin):
     list_display = ['name', 'department', 'institute']
     list_filter = ['department']
-    actions = ['download_csv']
+    export_filename = 'testimonials_data'
+    export_columns = ['name', 'department', 'institute']
+
 
-    def download_csv(self, request, queryset):
-        openfile = string_io()
-        response = HttpResponse(content_type='text/csv')
-        response['Content-Disposition'] = 'attachment;filename=testimonials_data.csv'
-        writer = csv.writer(response)
-        writer.writerow(['name', 'department', 'institute'])
+class CommentAdmin(admin.ModelAdmin):
+    list_display = ['workshop', 'comment', 'created_date', 'author', 'public']
+    list_filter = ['workshop', 'author', 'created_date', 'public']
 
-        for q in queryset:
-            writer.writerow([q.name,
-                             q.department,
-                             q.institute
-                             ])
 
-        openfile.seek(0)
-        response.write(openfile.read())
-        return response
+class QueuedEmailAdmin(admin.ModelAdmin):
+    list_display = ['subject', 'to', 'status', 'attempts', 'created_date',
+                    'sent_date']
+    list_filter = ['status', 'created_date']
+    search_fields = ['to', 'subject']
+    readonly_fields = ['attempts', 'last_error', 'sent_date']
+    actions = ['requeue']
 
-    download_csv.short_description = "Download CSV file for selected stats."
+    @admin.action(description="Retry selected emails now")
+    def requeue(self, request, queryset):
+        updated = queryset.exclude(status=QueuedEmail.SENT).update(
+            status=QueuedEmail.PENDING, attempts=0,
+            next_attempt=timezone.now()
+        )
+        self.message_user(request, f"{updated} email(s) queued for retry")
 
 
-class CommentAdmin(admin.ModelAdmin):
-    list_display = ['workshop', 'comment', 'created_date', 'author', 'public']
-    list_filter = ['workshop', 'author', 'created_date', 'public']
+class SentReminderAdmin(admin.ModelAdmin):
+    list_display = ['workshop', 'role', 'workshop_date', 'days_before',
+                    'created_date']
+    list_filter = ['role', 'days_before']
 
 
 # Register your models here.
@@ -125,3 +89,5 @@ admin.site.register(Testimonial, TestimonialAdmin)
 admin.site.register(Comment, CommentAdmin)
 admin.site.register(Banner)
 admin.site.register(AttachmentFile)
+admin.site.register(QueuedEmail, QueuedEmailAdmin)
+admin.site.register(SentReminder, SentReminderAdmin)
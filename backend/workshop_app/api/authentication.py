@@ -0,0 +1,55 @@
+"""JWT authentication that trusts the claims in the access token.
+
+Reads (GET, HEAD, OPTIONS) get a ``ClaimsUser`` built from the signed token
+without touching the database. Writes still load the ``User`` row, since
+views save it as a foreign key, but both take their group names from the
+``groups`` claim so role checks need no query either.
+
+Claims are as fresh as the access token: a group change or deactivation
+applies once the client refreshes it (ACCESS_TOKEN_LIFETIME), and
+refreshing re-reads the groups.
+"""
+from rest_framework.permissions import SAFE_METHODS
+from rest_framework_simplejwt.authentication import JWTAuthentication
+from rest_framework_simplejwt.models import TokenUser
+
+from workshop_app import roles
+
+GROUPS_CLAIM = 'groups'
+
+
+class ClaimsUser(TokenUser):
+    """A user known only from the claims of their access token"""
+
+    @property
+    def email(self):
+        return self.token.get('email', '')
+
+    @property
+    def first_name(self):
+        return self.token.get('first_name', '')
+
+    @property
+    def last_name(self):
+        return self.token.get('last_name', '')
+
+    def get_full_name(self):
+        return f'{self.first_name} {self.last_name}'.strip()
+
+
+class ClaimsJWTAuthentication(JWTAuthentication):
+    def authenticate(self, request):
+        self.stateless = request.method in SAFE_METHODS
+        return super().authenticate(request)
+
+    def get_user(self, validated_token):
+        groups = validated_token.get(GROUPS_CLAIM)
+        if groups is None:
+            # Issued before roles were put in the token
+            return super().get_user(validated_token)
+        if self.stateless:
+            user = ClaimsUser(validated_token)
+        else:
+            user = super().get_user(validated_token)
+        roles.set_group_names(user, groups)
+        return user
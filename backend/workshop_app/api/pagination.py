@@ -0,0 +1,25 @@
+from rest_framework.pagination import CursorPagination, PageNumberPagination
+
+MAX_PAGE_SIZE = 500
+
+
+class StandardPagination(PageNumberPagination):
+    """Default for list endpoints, clients may ask for ?page_size=N"""
+    page_size_query_param = 'page_size'
+    max_page_size = MAX_PAGE_SIZE
+
+
+class KeysetPagination(CursorPagination):
+    """Cursor (keyset) pagination: every page is a ``WHERE key < cursor``
+    lookup instead of an OFFSET, so deep pages cost the same as the first.
+    """
+    page_size_query_param = 'page_size'
+    max_page_size = MAX_PAGE_SIZE
+
+
+class WorkshopPagination(KeysetPagination):
+    ordering = ('-date', '-id')
+
+
+class CommentPagination(KeysetPagination):
+    ordering = ('-created_date', '-id')
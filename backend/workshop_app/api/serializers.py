@@ -1,40 +1,118 @@
 from rest_framework import serializers
+from rest_framework.permissions import SAFE_METHODS
 from django.contrib.auth.models import User
+from django.db import IntegrityError, transaction
 from workshop_app.models import (
     Profile, WorkshopType, AttachmentFile, Workshop, Testimonial, Comment, Banner
 )
 from cms.models import Nav, SubNav, Page, StaticFile
 from teams.models import Team
 
-class UserSerializer(serializers.ModelSerializer):
+def parse_field_list(value):
+    return {name.strip() for name in (value or '').split(',') if name.strip()}
+
+class EagerLoadingMixin:
+    """Serializers list the relations they render so that views can load
+    them up front instead of once per row. ``only_fields`` optionally
+    restricts the columns loaded to the ones the serializer outputs.
+    """
+    select_related_fields = ()
+    prefetch_related_fields = ()
+    only_fields = ()
+
+    @classmethod
+    def setup_eager_loading(cls, queryset, fields=None):
+        """``fields`` are the top level fields that will be rendered, when
+        given the relations and columns of the other fields are skipped.
+        """
+        def wanted(lookup):
+            return fields is None or lookup.split('__')[0] in fields
+
+        select_related = [f for f in cls.select_related_fields if wanted(f)]
+        prefetch_related = [
+            f for f in cls.prefetch_related_fields if wanted(f)
+        ]
+        only = [f for f in cls.only_fields if wanted(f)]
+        if fields is not None and not cls.only_fields:
+            only = [f.name for f in queryset.model._meta.concrete_fields
+                    if f.name in fields]
+
+        if select_related:
+            queryset = queryset.select_related(*select_related)
+        if prefetch_related:
+            queryset = queryset.prefetch_related(*prefetch_related)
+        if only:
+            queryset = queryset.only(*only)
+        elif fields is not None:
+            queryset = queryset.only(queryset.model._meta.pk.name)
+        return queryset
+
+class DynamicFieldsMixin:
+    """Sparse fieldsets: ``?fields=a,b`` renders only those fields and
+    ``?omit=c`` leaves fields out. Only applies to reads.
+    """
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        request = self.context.get('request')
+        keep = self.get_requested_fields(request, self.fields)
+        if keep is not None:
+            for name in set(self.fields) - keep:
+                self.fields.pop(name)
+
+    @classmethod
+    def get_requested_fields(cls, request, field_names=None):
+        """Names of the fields asked for, or None to render everything"""
+        if request is None or request.method not in SAFE_METHODS:
+            return None
+        fields = parse_field_list(request.query_params.get('fields'))
+        omit = parse_field_list(request.query_params.get('omit'))
+        if not fields and not omit:
+            return None
+        if field_names is None:
+            field_names = cls().fields
+        keep = set(field_names) & fields if fields else set(field_names)
+        return keep - omit
+
+class ModelSerializer(DynamicFieldsMixin, EagerLoadingMixin,
+                      serializers.ModelSerializer):
+    """Base for the API serializers"""
+
+class UserSerializer(ModelSerializer):
     groups = serializers.StringRelatedField(many=True, read_only=True)
-    
+    prefetch_related_fields = ('groups',)
+
     class Meta:
         model = User
         fields = ('id', 'username', 'email', 'first_name', 'last_name', 'groups')
 
-class ProfileSerializer(serializers.ModelSerializer):
+class ProfileSerializer(ModelSerializer):
     user = UserSerializer(read_only=True)
+    select_related_fields = ('user',)
+    prefetch_related_fields = ('user__groups',)
+
     class Meta:
         model = Profile
         fields = '__all__'
 
-class WorkshopTypeSerializer(serializers.ModelSerializer):
+class WorkshopTypeSerializer(ModelSerializer):
     class Meta:
         model = WorkshopType
         fields = '__all__'
 
-class AttachmentFileSerializer(serializers.ModelSerializer):
+class AttachmentFileSerializer(ModelSerializer):
     class Meta:
         model = AttachmentFile
         fields = '__all__'
 
-class WorkshopSerializer(serializers.ModelSerializer):
+class WorkshopSerializer(ModelSerializer):
     coordinator = UserSerializer(read_only=True)
     instructor = UserSerializer(read_only=True)
     workshop_type = WorkshopTypeSerializer(read_only=True)
     coordinator_id = serializers.IntegerField(write_only=True, required=False)
     workshop_type_id = serializers.IntegerField(write_only=True)
+    select_related_fields = ('coordinator', 'instructor', 'workshop_type')
+    prefetch_related_fields = ('coordinator__groups', 'instructor__groups')
 
     class Meta:
         model = Workshop
@@ -46,50 +124,96 @@ class WorkshopSerializer(serializers.ModelSerializer):
             validated_data['coordinator_id'] = self.context['request'].user.id
         
         # Create the workshop
-        workshop = Workshop.objects.create(
-            coordinator_id=validated_data['coordinator_id'],
-            workshop_type_id=validated_data['workshop_type_id'],
-            date=validated_data['date'],
-            status=validated_data.get('status', 0),  # Default to pending
-            tnc_accepted=validated_data.get('tnc_accepted', False)
-        )
+        try:
+            with transaction.atomic():
+                workshop = Workshop.objects.create(
+                    coordinator_id=validated_data['coordinator_id'],
+                    workshop_type_id=validated_data['workshop_type_id'],
+                    date=validated_data['date'],
+                    status=validated_data.get('status', 0),  # Default to pending
+                    tnc_accepted=validated_data.get('tnc_accepted', False)
+                )
+        except IntegrityError:
+            raise serializers.ValidationError(
+                'This workshop has already been proposed for that date.'
+            )
         return workshop
 
-class TestimonialSerializer(serializers.ModelSerializer):
+class UserSummarySerializer(ModelSerializer):
+    class Meta:
+        model = User
+        fields = ('id', 'first_name', 'last_name')
+
+class WorkshopTypeSummarySerializer(ModelSerializer):
+    class Meta:
+        model = WorkshopType
+        fields = ('id', 'name', 'duration')
+
+class WorkshopListSerializer(ModelSerializer):
+    """Compact workshop rows for listings, see WorkshopSerializer for the
+    full representation.
+    """
+    coordinator = UserSummarySerializer(read_only=True)
+    instructor = UserSummarySerializer(read_only=True)
+    workshop_type = WorkshopTypeSummarySerializer(read_only=True)
+    select_related_fields = ('coordinator', 'instructor', 'workshop_type')
+    only_fields = (
+        'id', 'date', 'status', 'tnc_accepted',
+        'coordinator__id', 'coordinator__first_name', 'coordinator__last_name',
+        'instructor__id', 'instructor__first_name', 'instructor__last_name',
+        'workshop_type__id', 'workshop_type__name', 'workshop_type__duration',
+    )
+
+    class Meta:
+        model = Workshop
+        fields = ('id', 'date', 'status', 'tnc_accepted', 'coordinator',
+                  'instructor', 'workshop_type')
+
+class TestimonialSerializer(ModelSerializer):
     class Meta:
         model = Testimonial
         fields = '__all__'
 
-class CommentSerializer(serializers.ModelSerializer):
+class CommentSerializer(ModelSerializer):
     author = UserSerializer(read_only=True)
     workshop = WorkshopSerializer(read_only=True)
+    select_related_fields = (
+        'author', 'workshop__coordinator', 'workshop__instructor',
+        'workshop__workshop_type'
+    )
+    prefetch_related_fields = (
+        'author__groups', 'workshop__coordinator__groups',
+        'workshop__instructor__groups'
+    )
 
     class Meta:
         model = Comment
         fields = '__all__'
 
-class BannerSerializer(serializers.ModelSerializer):
+class BannerSerializer(ModelSerializer):
     class Meta:
         model = Banner
         fields = '__all__'
 
-class NavSerializer(serializers.ModelSerializer):
+class NavSerializer(ModelSerializer):
     class Meta:
         model = Nav
         fields = '__all__'
 
-class SubNavSerializer(serializers.ModelSerializer):
+class SubNavSerializer(ModelSerializer):
     nav = NavSerializer(read_only=True)
+    select_related_fields = ('nav',)
+
     class Meta:
         model = SubNav
         fields = '__all__'
 
-class PageSerializer(serializers.ModelSerializer):
+class PageSerializer(ModelSerializer):
     class Meta:
         model = Page
         fields = '__all__'
 
-class StaticFileSerializer(serializers.ModelSerializer):
+class StaticFileSerializer(ModelSerializer):
     class Meta:
         model = StaticFile
         fields = '__all__'
@@ -105,14 +229,19 @@ class ChangePasswordSerializer(serializers.Serializer):
             raise serializers.ValidationError({'new_password2': ["New passwords must match."]})
         return data
 
-class TeamSerializer(serializers.ModelSerializer):
+class TeamSerializer(ModelSerializer):
     members = ProfileSerializer(many=True, read_only=True)
     creator = UserSerializer(read_only=True)
+    select_related_fields = ('creator',)
+    prefetch_related_fields = (
+        'creator__groups', 'members__user', 'members__user__groups'
+    )
+
     class Meta:
         model = Team
         fields = '__all__'
 
-class UserRegistrationSerializer(serializers.ModelSerializer):
+class UserRegistrationSerializer(ModelSerializer):
     password = serializers.CharField(write_only=True)
     password2 = serializers.CharField(write_only=True)
     profile_data = serializers.DictField(write_only=True, required=False)
@@ -1,9 +1,10 @@
-from django.db import models
+from django.db import IntegrityError, models, transaction
 from rest_framework import viewsets
 from django.contrib.auth.models import User
 from .serializers import (
     UserSerializer, ProfileSerializer, WorkshopTypeSerializer,
-    AttachmentFileSerializer, WorkshopSerializer, TestimonialSerializer,
+    AttachmentFileSerializer, WorkshopSerializer, WorkshopListSerializer,
+    TestimonialSerializer,
     CommentSerializer, BannerSerializer, NavSerializer, SubNavSerializer, PageSerializer, StaticFileSerializer, TeamSerializer, ChangePasswordSerializer, UserRegistrationSerializer
 )
 from workshop_app.models import (
@@ -11,77 +12,152 @@ from workshop_app.models import (
 )
 from cms.models import Nav, SubNav, Page, StaticFile
 from teams.models import Team
+from workshop_app.outbox import queue_email
+from workshop_app.roles import is_instructor
+from statistics_app import cache as stats_cache
+from statistics_app.models import WorkshopRollup
 from rest_framework.decorators import api_view, permission_classes
 from rest_framework.response import Response
 from rest_framework import status
-from django.utils import timezone
-from datetime import timedelta
 from django.contrib.auth.hashers import make_password
 from django.contrib.sites.shortcuts import get_current_site
-from django.core.mail import EmailMessage
 from django.template.loader import render_to_string
 from django.utils.encoding import force_bytes, force_str
-from django.utils.http import urlsafe_base64_encode, urlsafe_base64_decode
+from django.utils.http import (
+    http_date, urlsafe_base64_encode, urlsafe_base64_decode
+)
 from django.contrib.auth.tokens import default_token_generator
 from rest_framework import generics
 from rest_framework.permissions import IsAuthenticated, AllowAny
-from rest_framework_simplejwt.views import TokenObtainPairView
-from workshop_app.serializers import CustomTokenObtainPairSerializer
+from rest_framework_simplejwt.views import (
+    TokenObtainPairView, TokenRefreshView
+)
+from workshop_app.serializers import (
+    CustomTokenObtainPairSerializer, CustomTokenRefreshSerializer
+)
+from .pagination import CommentPagination, WorkshopPagination
 from django.conf import settings
 
+EXPAND_VALUES = ('1', 'true', 'full', 'all')
+# unique_workshop_proposal allows one workshop of a type per coordinator/day
+DUPLICATE_DATE_MESSAGE = ('The coordinator already has this workshop '
+                          'on that date.')
+
+
+def wants_expanded(request):
+    """``?expand=full`` asks list endpoints for the detail representation"""
+    return request.query_params.get('expand', '').lower() in EXPAND_VALUES
+
+
+class EagerLoadingViewSetMixin:
+    """Load what the serializer renders up front, honouring ``?fields=``
+    and ``?omit=`` so that unused columns and relations are not queried.
+    """
+
+    def get_queryset(self):
+        queryset = super().get_queryset()
+        serializer_class = self.get_serializer_class()
+        if not hasattr(serializer_class, 'setup_eager_loading'):
+            return queryset
+        fields = serializer_class.get_requested_fields(self.request)
+        if fields is not None:
+            # The cursor paginator reads its ordering fields off every row
+            ordering = getattr(self.paginator, 'ordering', None) or ()
+            if isinstance(ordering, str):
+                ordering = (ordering,)
+            fields = fields | {field.lstrip('-') for field in ordering}
+        return serializer_class.setup_eager_loading(queryset, fields)
+
+
+class CompactListMixin:
+    """Use ``list_serializer_class`` for list responses unless the client
+    passes ``?expand=``; retrieve and writes keep ``serializer_class``.
+    """
+    list_serializer_class = None
+
+    def get_serializer_class(self):
+        if (self.action == 'list' and self.list_serializer_class
+                and not wants_expanded(self.request)):
+            return self.list_serializer_class
+        return super().get_serializer_class()
+
+
 class CustomTokenObtainPairView(TokenObtainPairView):
     serializer_class = CustomTokenObtainPairSerializer
 
-class UserViewSet(viewsets.ModelViewSet):
-    queryset = User.objects.all()
+class CustomTokenRefreshView(TokenRefreshView):
+    serializer_class = CustomTokenRefreshSerializer
+
+class UserViewSet(EagerLoadingViewSetMixin, viewsets.ModelViewSet):
+    queryset = User.objects.order_by('id')
     serializer_class = UserSerializer
 
-class ProfileViewSet(viewsets.ModelViewSet):
-    queryset = Profile.objects.all()
+class ProfileViewSet(EagerLoadingViewSetMixin, viewsets.ModelViewSet):
+    queryset = Profile.objects.order_by('id')
     serializer_class = ProfileSerializer
 
-class WorkshopTypeViewSet(viewsets.ModelViewSet):
+class WorkshopTypeViewSet(EagerLoadingViewSetMixin, viewsets.ModelViewSet):
     queryset = WorkshopType.objects.all()
     serializer_class = WorkshopTypeSerializer
+    # Small reference table, always returned in full
+    pagination_class = None
 
-class AttachmentFileViewSet(viewsets.ModelViewSet):
-    queryset = AttachmentFile.objects.all()
+class AttachmentFileViewSet(EagerLoadingViewSetMixin, viewsets.ModelViewSet):
+    queryset = AttachmentFile.objects.order_by('id')
     serializer_class = AttachmentFileSerializer
 
-class WorkshopViewSet(viewsets.ModelViewSet):
+class WorkshopViewSet(CompactListMixin, EagerLoadingViewSetMixin,
+                      viewsets.ModelViewSet):
     queryset = Workshop.objects.all()
     serializer_class = WorkshopSerializer
-
-class TestimonialViewSet(viewsets.ModelViewSet):
-    queryset = Testimonial.objects.all()
+    list_serializer_class = WorkshopListSerializer
+    pagination_class = WorkshopPagination
+
+    def get_queryset(self):
+        queryset = super().get_queryset()
+        # ?dashboard=instructor lists the user's workshops and the pending
+        # requests they may accept, one cursor page at a time
+        if (self.action == 'list' and
+                self.request.query_params.get('dashboard') == 'instructor'):
+            pending = models.Q(status=0)
+            if self.request.user.is_authenticated:
+                pending |= models.Q(instructor_id=self.request.user.id)
+            queryset = queryset.filter(pending)
+        return queryset
+
+class TestimonialViewSet(EagerLoadingViewSetMixin, viewsets.ModelViewSet):
+    queryset = Testimonial.objects.order_by('id')
     serializer_class = TestimonialSerializer
 
-class CommentViewSet(viewsets.ModelViewSet):
+class CommentViewSet(EagerLoadingViewSetMixin, viewsets.ModelViewSet):
     queryset = Comment.objects.all()
     serializer_class = CommentSerializer
+    pagination_class = CommentPagination
 
-class BannerViewSet(viewsets.ModelViewSet):
-    queryset = Banner.objects.all()
+class BannerViewSet(EagerLoadingViewSetMixin, viewsets.ModelViewSet):
+    queryset = Banner.objects.order_by('id')
     serializer_class = BannerSerializer
 
-class NavViewSet(viewsets.ModelViewSet):
+class NavViewSet(EagerLoadingViewSetMixin, viewsets.ModelViewSet):
     queryset = Nav.objects.all()
     serializer_class = NavSerializer
+    pagination_class = None
 
-class SubNavViewSet(viewsets.ModelViewSet):
+class SubNavViewSet(EagerLoadingViewSetMixin, viewsets.ModelViewSet):
     queryset = SubNav.objects.all()
     serializer_class = SubNavSerializer
+    pagination_class = None
 
-class PageViewSet(viewsets.ModelViewSet):
-    queryset = Page.objects.all()
+class PageViewSet(EagerLoadingViewSetMixin, viewsets.ModelViewSet):
+    queryset = Page.objects.order_by('id')
     serializer_class = PageSerializer
 
-class StaticFileViewSet(viewsets.ModelViewSet):
-    queryset = StaticFile.objects.all()
+class StaticFileViewSet(EagerLoadingViewSetMixin, viewsets.ModelViewSet):
+    queryset = StaticFile.objects.order_by('id')
     serializer_class = StaticFileSerializer
 
-class TeamViewSet(viewsets.ModelViewSet):
-    queryset = Team.objects.all()
+class TeamViewSet(EagerLoadingViewSetMixin, viewsets.ModelViewSet):
+    queryset = Team.objects.order_by('id')
     serializer_class = TeamSerializer
 
 class ChangePasswordView(generics.UpdateAPIView):
@@ -108,67 +184,86 @@ class ChangePasswordView(generics.UpdateAPIView):
 
         return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
 
-@api_view(['GET'])
-@permission_classes([AllowAny])
-def workshop_public_stats_api(request):
-    from_date = request.GET.get('from_date')
-    to_date = request.GET.get('to_date')
-    state = request.GET.get('state')
-    workshoptype = request.GET.get('workshop_type')
-    sort = request.GET.get('sort', 'date')
-
-    workshops = Workshop.objects.filter(status=1)
-
-    if from_date and to_date:
-        workshops = workshops.filter(date__range=(from_date, to_date))
-    else:
-        today = timezone.now()
-        upto = today + timedelta(days=15)
-        workshops = workshops.filter(date__range=(today, upto))
-    
-    if state:
-        workshops = workshops.filter(coordinator__profile__state=state)
-    if workshoptype:
-        workshops = workshops.filter(workshop_type_id=workshoptype)
-    
-    workshops = workshops.order_by(sort)
-
-    # Replicate get_workshops_by_state and get_workshops_by_type logic
-    ws_states, ws_count = Workshop.objects.get_workshops_by_state(workshops)
-    ws_type, ws_type_count = Workshop.objects.get_workshops_by_type(workshops)
+def _public_stats(request, filters):
+    workshops = Workshop.objects.filter(
+        status=1, date__range=(filters['from_date'], filters['to_date'])
+    )
+    if filters['state']:
+        workshops = workshops.filter(
+            coordinator__profile__state=filters['state'])
+    if filters['workshop_type']:
+        workshops = workshops.filter(
+            workshop_type_id=filters['workshop_type'])
+
+    list_serializer = (WorkshopSerializer if wants_expanded(request)
+                       else WorkshopListSerializer)
+    workshops = list_serializer.setup_eager_loading(
+        workshops.order_by(filters['sort']),
+        list_serializer.get_requested_fields(request)
+    )
+
+    # State and type breakdowns from the pre-aggregated daily rollup
+    (ws_states, ws_count), (ws_type, ws_type_count) = \
+        WorkshopRollup.objects.get_workshops_by_state_and_type(
+            filters['from_date'], filters['to_date'],
+            state=filters['state'], workshop_type=filters['workshop_type']
+        )
 
-    serializer = WorkshopSerializer(workshops, many=True)
+    serializer = list_serializer(
+        workshops, many=True, context={'request': request}
+    )
 
-    return Response({
-        'workshops': serializer.data,
+    return {
+        'workshops': list(serializer.data),
         'ws_states': ws_states,
         'ws_count': ws_count,
         'ws_type': ws_type,
         'ws_type_count': ws_type_count,
-    }, status=status.HTTP_200_OK)
+    }
+
+@api_view(['GET'])
+@permission_classes([AllowAny])
+def workshop_public_stats_api(request):
+    """Public statistics, cached until a workshop changes.
+
+    Responses carry an ETag and Last-Modified so that repeat visitors
+    get a 304 without the stats being recomputed.
+    """
+    filters = stats_cache.normalise_params(request.query_params)
+    token, last_modified = stats_cache.get_generation()
+    key = stats_cache.make_key(filters, token)
+    etag = stats_cache.make_etag(key)
+    headers = {
+        'ETag': etag,
+        'Last-Modified': http_date(last_modified),
+        'Cache-Control': 'public, max-age=0, must-revalidate',
+    }
+    if stats_cache.not_modified(request, etag, last_modified):
+        return Response(status=status.HTTP_304_NOT_MODIFIED, headers=headers)
+
+    cache = stats_cache.get_cache()
+    data = cache.get(key)
+    if data is None:
+        data = _public_stats(request, filters)
+        cache.set(key, data, settings.STATS_CACHE_TIMEOUT)
+    return Response(data, status=status.HTTP_200_OK, headers=headers)
 
 @api_view(['GET'])
 def team_stats_api(request, team_id=None):
     user = request.user
-    teams = Team.objects.all()
     if team_id:
-        team = teams.get(id=team_id)
+        team = Team.objects.get(id=team_id)
     else:
-        team = teams.first()
+        team = Team.objects.first()
 
-    if not team.members.filter(user=user).exists():
+    if not team.members.filter(user_id=user.id).exists():
         return Response(
             {"detail": "You are not added to the team"},
             status=status.HTTP_403_FORBIDDEN
         )
 
-    member_workshop_data = {}
-    for member in team.members.all():
-        workshop_count = Workshop.objects.filter(
-            instructor=member.user).count()
-        member_workshop_data[member.user.get_full_name()] = workshop_count
-    team_labels = list(member_workshop_data.keys())
-    ws_count = list(member_workshop_data.values())
+    team_labels, ws_count = team.get_member_workshop_counts()
+    teams = TeamSerializer.setup_eager_loading(Team.objects.all())
 
     return Response({
         'team_labels': team_labels,
@@ -182,10 +277,9 @@ def team_stats_api(request, team_id=None):
 def register_user(request):
     serializer = UserRegistrationSerializer(data=request.data)
     if serializer.is_valid(raise_exception=True):
-        user = serializer.save()
-
         # For development, automatically activate users
         if settings.DEBUG:
+            user = serializer.save()
             user.is_active = True
             user.save()
             return Response({
@@ -194,17 +288,18 @@ def register_user(request):
                 'username': user.username
             }, status=status.HTTP_201_CREATED)
         else:
-            # Production: Send activation email
-            current_site = get_current_site(request)
-            mail_subject = 'Activate your account.'
-            message = render_to_string('workshop_app/activation.html', {
-                'user': user,
-                'domain': current_site.domain,
-                'uid': urlsafe_base64_encode(force_bytes(user.pk)),
-                'token': default_token_generator.make_token(user),
-            })
-            email = EmailMessage(mail_subject, message, to=[user.email])
-            email.send()
+            # Production: queue the activation email in the same
+            # transaction as the user; the outbox worker sends it
+            with transaction.atomic():
+                user = serializer.save()
+                current_site = get_current_site(request)
+                message = render_to_string('workshop_app/activation.html', {
+                    'user': user,
+                    'domain': current_site.domain,
+                    'uid': urlsafe_base64_encode(force_bytes(user.pk)),
+                    'token': default_token_generator.make_token(user),
+                })
+                queue_email('Activate your account.', message, [user.email])
 
             return Response({
                 'message': 'Registration successful, please check your email for activation.',
@@ -236,7 +331,7 @@ def accept_workshop_api(request, pk):
     except Workshop.DoesNotExist:
         return Response(status=status.HTTP_404_NOT_FOUND)
 
-    if not request.user.groups.filter(name='instructor').exists():
+    if not is_instructor(request.user):
         return Response({'detail': 'Only instructors can accept workshops.'}, status=status.HTTP_403_FORBIDDEN)
 
     workshop.status = 1  # Accepted
@@ -251,7 +346,7 @@ def change_workshop_date_api(request, pk):
     except Workshop.DoesNotExist:
         return Response(status=status.HTTP_404_NOT_FOUND)
 
-    if not request.user.groups.filter(name='instructor').exists():
+    if not is_instructor(request.user):
         return Response({'detail': 'Only instructors can change workshop dates.'}, status=status.HTTP_403_FORBIDDEN)
 
     new_date = request.data.get('date')
@@ -259,7 +354,11 @@ def change_workshop_date_api(request, pk):
         return Response({'date': ['This field is required.']}, status=status.HTTP_400_BAD_REQUEST)
 
     workshop.date = new_date
-    workshop.save()
+    try:
+        with transaction.atomic():
+            workshop.save()
+    except IntegrityError:
+        return Response({'date': [DUPLICATE_DATE_MESSAGE]}, status=status.HTTP_400_BAD_REQUEST)
     return Response({'message': 'Workshop date changed successfully!'}, status=status.HTTP_200_OK)
 
 @api_view(['DELETE'])
@@ -303,7 +402,11 @@ def change_workshop_date_api(request, pk):
             return Response({'message': 'Date is required'}, status=status.HTTP_400_BAD_REQUEST)
         
         workshop.date = new_date
-        workshop.save()
+        try:
+            with transaction.atomic():
+                workshop.save()
+        except IntegrityError:
+            return Response({'message': DUPLICATE_DATE_MESSAGE}, status=status.HTTP_400_BAD_REQUEST)
         
         return Response({'message': 'Workshop date updated successfully'}, status=status.HTTP_200_OK)
     except Workshop.DoesNotExist:
@@ -327,9 +430,17 @@ def get_user_workshops_api(request):
     user = request.user
     
     # Get workshops where user is coordinator or instructor
-    workshops = Workshop.objects.filter(
-        models.Q(coordinator=user) | models.Q(instructor=user)
-    ).order_by('-date')
+    list_serializer = (WorkshopSerializer if wants_expanded(request)
+                       else WorkshopListSerializer)
+    workshops = list_serializer.setup_eager_loading(
+        Workshop.objects.filter(
+            models.Q(coordinator_id=user.id) |
+            models.Q(instructor_id=user.id)
+        ).order_by('-date'),
+        list_serializer.get_requested_fields(request)
+    )
     
-    serializer = WorkshopSerializer(workshops, many=True)
+    serializer = list_serializer(
+        workshops, many=True, context={'request': request}
+    )
     return Response(serializer.data, status=status.HTTP_200_OK)
@@ -5,3 +5,8 @@ from django.apps import AppConfig
 
 class WorkshopAppConfig(AppConfig):
     name = 'workshop_app'
+
+    def ready(self):
+        from . import signals  # noqa: F401
+        from .send_mails import configure_email_logging
+        configure_email_logging()
@@ -0,0 +1,83 @@
+"""Encoded MIME parts for workshop instruction files, cached per workshop
+type so confirming a booking does not re-read and re-encode every file for
+each recipient. Only the most recently used few directories are kept, so a
+long-running mail worker does not hold every type's files in memory.
+"""
+import base64
+import mimetypes
+import mmap
+import os
+import threading
+from collections import OrderedDict
+from email.mime.base import MIMEBase
+
+from django.conf import settings
+
+# Directories whose encoded parts are kept, least recently used first
+MAX_CACHED_DIRECTORIES = 4
+
+_parts = OrderedDict()
+_lock = threading.Lock()
+
+
+def attachment_dir(workshop_type_name):
+    """Folder under MEDIA_ROOT holding a workshop type's files"""
+    return workshop_type_name.replace(" ", "_")
+
+
+def _signature(folder):
+    """Name, size and mtime of every file, to spot changes made by other
+    processes (signals only reach the process that saved the file)"""
+    with os.scandir(folder) as entries:
+        return tuple(sorted(
+            (entry.name, entry.stat().st_size, entry.stat().st_mtime_ns)
+            for entry in entries if entry.is_file()
+        ))
+
+
+def _encode(path):
+    """Base64-encode a file through mmap instead of read()"""
+    with open(path, 'rb') as f:
+        if os.fstat(f.fileno()).st_size:
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as data:
+                payload = base64.encodebytes(data)
+        else:
+            payload = b''
+    name = os.path.basename(path)
+    mimetype = mimetypes.guess_type(name)[0] or 'application/octet-stream'
+    part = MIMEBase(*mimetype.split('/', 1))
+    part.set_payload(payload.decode('ascii'))
+    part['Content-Transfer-Encoding'] = 'base64'
+    part.add_header('Content-Disposition', 'attachment', filename=name)
+    return part
+
+
+def get_attachment_parts(directory):
+    """MIME parts for every file in MEDIA_ROOT/``directory``
+
+    The parts are shared between messages and must not be modified.
+    """
+    folder = os.path.join(settings.MEDIA_ROOT, directory)
+    if not os.path.isdir(folder):
+        invalidate(directory)
+        return []
+    signature = _signature(folder)
+    with _lock:
+        cached = _parts.get(directory)
+        if cached is None or cached[0] != signature:
+            parts = [_encode(os.path.join(folder, name))
+                     for name, _, _ in signature]
+            cached = _parts[directory] = (signature, parts)
+        _parts.move_to_end(directory)
+        while len(_parts) > MAX_CACHED_DIRECTORIES:
+            _parts.popitem(last=False)
+    return cached[1]
+
+
+def invalidate(directory=None):
+    """Drop the cached parts for ``directory``, or for every directory"""
+    with _lock:
+        if directory is None:
+            _parts.clear()
+        else:
+            _parts.pop(directory, None)
@@ -0,0 +1,64 @@
+"""Merge held notifications into one summary email per recipient"""
+from collections import defaultdict
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import transaction
+from django.utils import timezone
+
+from .models import Profile, QueuedEmail
+from .send_mails import render_email
+
+
+def release_digests(now=None):
+    """Queue a digest for every recipient whose oldest held notification
+    is older than their digest interval; return (digests, notifications)
+
+    A lone held notification is released as it is. Notifications for
+    someone who has since turned digests off are released straight away,
+    each as its own email.
+    """
+    now = now or timezone.now()
+    digests, merged_ids, released_ids = [], [], []
+    with transaction.atomic():
+        held = list(QueuedEmail.objects.filter(
+            status=QueuedEmail.HELD
+        ).select_for_update(skip_locked=True).order_by('created_date', 'id'))
+        if not held:
+            return 0, 0
+        by_recipient = defaultdict(list)
+        for email in held:
+            by_recipient[email.to].append(email)
+        intervals = dict(Profile.objects.filter(
+            user__email__in=by_recipient, digest_interval__gt=0
+        ).values_list('user__email', 'digest_interval'))
+
+        for recipient, emails in by_recipient.items():
+            since = emails[0].created_date
+            hours = intervals.get(recipient, 0)
+            if since > now - timedelta(hours=hours):
+                continue
+            if hours == 0 or len(emails) == 1:
+                released_ids.extend(email.id for email in emails)
+                continue
+            digests.append(QueuedEmail(
+                subject=f"FOSSEE workshop updates: "
+                        f"{len(emails)} notifications",
+                body=render_email('digest', {
+                    'emails': emails,
+                    'since': timezone.localtime(since).strftime(
+                        '%Y-%m-%d %H:%M'),
+                    'production_url': settings.PRODUCTION_URL,
+                }),
+                from_email=settings.SENDER_EMAIL, to=recipient
+            ))
+            merged_ids.extend(email.id for email in emails)
+
+        QueuedEmail.objects.bulk_create(digests)
+        QueuedEmail.objects.filter(id__in=merged_ids).update(
+            status=QueuedEmail.DIGESTED, sent_date=now
+        )
+        QueuedEmail.objects.filter(id__in=released_ids).update(
+            status=QueuedEmail.PENDING, next_attempt=now
+        )
+    return len(digests), len(merged_ids)
@@ -0,0 +1,158 @@
+import csv
+import zlib
+from itertools import chain
+
+from django.core.serializers.json import DjangoJSONEncoder
+from django.http import StreamingHttpResponse
+
+from .models import states
+
+# Rows are grouped into chunks of roughly this many characters so the
+# server does not flush one tiny write per row.
+CHUNK_SIZE = 64 * 1024
+
+# Rows fetched from the database per round trip while exporting
+QUERY_CHUNK_SIZE = 2000
+
+WORKSHOP_STATUS_EXPORT = {0: 'Pending', 1: 'Success', 2: 'Reject'}
+STATE_NAMES = dict(states)
+
+
+def state_name(code):
+    return STATE_NAMES.get(code, code)
+
+
+class Echo:
+    """Pseudo-buffer for csv.writer: write() hands the line straight back"""
+
+    def write(self, value):
+        return value
+
+
+class Column:
+    """An exported column: a values() lookup, its header and a formatter"""
+
+    def __init__(self, field, header=None, format=None):
+        self.field = field
+        self.header = header or field
+        self.format = format
+
+    def __repr__(self):
+        return f"Column({self.field!r})"
+
+
+def export_rows(queryset, columns, chunk_size=QUERY_CHUNK_SIZE):
+    """Yield formatted rows for ``columns``, read from the db in chunks"""
+    rows = queryset.values_list(*[c.field for c in columns]).iterator(
+        chunk_size=chunk_size
+    )
+    formatters = [(i, c.format) for i, c in enumerate(columns) if c.format]
+    if not formatters:
+        yield from rows
+        return
+    for row in rows:
+        row = list(row)
+        for i, format in formatters:
+            row[i] = format(row[i])
+        yield row
+
+
+def _chunked(lines, chunk_size):
+    buffer, size = [], 0
+    for line in lines:
+        buffer.append(line)
+        size += len(line)
+        if size >= chunk_size:
+            yield "".join(buffer)
+            buffer, size = [], 0
+    if buffer:
+        yield "".join(buffer)
+
+
+def iter_csv(header, rows, chunk_size=CHUNK_SIZE):
+    """Yield CSV text for ``header`` and ``rows`` in chunks of ~chunk_size"""
+    writer = csv.writer(Echo())
+    lines = (writer.writerow(row) for row in chain([header], rows))
+    yield from _chunked(lines, chunk_size)
+
+
+def iter_ndjson(header, rows, chunk_size=CHUNK_SIZE):
+    """Yield one JSON object per row, keyed by ``header``"""
+    encoder = DjangoJSONEncoder()
+    lines = (encoder.encode(dict(zip(header, row))) + "\n" for row in rows)
+    yield from _chunked(lines, chunk_size)
+
+
+def iter_gzip(chunks):
+    """Gzip a stream of text chunks without buffering the whole output"""
+    compressor = zlib.compressobj(wbits=zlib.MAX_WBITS | 16)
+    for chunk in chunks:
+        data = compressor.compress(chunk.encode("utf-8"))
+        if data:
+            yield data
+    yield compressor.flush()
+
+
+EXPORT_FORMATS = {
+    "csv": (iter_csv, "text/csv", "csv"),
+    "ndjson": (iter_ndjson, "application/x-ndjson", "ndjson"),
+}
+
+
+def streaming_export_response(filename, header, rows, format="csv",
+                              compress=False):
+    """Download that starts sending rows before the export is complete
+
+    ``filename`` is given without extension, it is added for the format.
+    """
+    iter_format, content_type, extension = EXPORT_FORMATS[format]
+    content = iter_format(header, rows)
+    filename = f"{filename}.{extension}"
+    if compress:
+        content = iter_gzip(content)
+        content_type = "application/gzip"
+        filename += ".gz"
+    response = StreamingHttpResponse(content, content_type=content_type)
+    response['Content-Disposition'] = f'attachment; filename={filename}'
+    return response
+
+
+class StreamingExportMixin:
+    """ModelAdmin mixin adding streaming CSV / gzipped CSV / NDJSON actions
+
+    Subclasses list the exported ``export_columns`` (Column instances or
+    plain values() lookups) and an ``export_filename`` without extension.
+    """
+    export_columns = ()
+    export_filename = "export"
+    export_chunk_size = QUERY_CHUNK_SIZE
+    actions = ['download_csv', 'download_csv_gzip', 'download_ndjson']
+
+    def get_export_columns(self):
+        return [c if isinstance(c, Column) else Column(c)
+                for c in self.export_columns]
+
+    def export(self, queryset, format="csv", compress=False):
+        columns = self.get_export_columns()
+        return streaming_export_response(
+            self.export_filename, [c.header for c in columns],
+            export_rows(queryset, columns, self.export_chunk_size),
+            format=format, compress=compress
+        )
+
+    def download_csv(self, request, queryset):
+        return self.export(queryset)
+
+    download_csv.short_description = "Download CSV file for selected stats."
+
+    def download_csv_gzip(self, request, queryset):
+        return self.export(queryset, compress=True)
+
+    download_csv_gzip.short_description = \
+        "Download gzipped CSV file for selected stats."
+
+    def download_ndjson(self, request, queryset):
+        return self.export(queryset, format="ndjson")
+
+    download_ndjson.short_description = \
+        "Download NDJSON file for selected stats."
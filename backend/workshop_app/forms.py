@@ -245,3 +245,6 @@ class ProfileForm(forms.ModelForm):
         self.fields['location'].widget.attrs.update(
             {'class': "form-control", 'placeholder': 'Location'}
         )
+        self.fields['digest_interval'].widget.attrs.update(
+            {'class': "custom-select"}
+        )
@@ -0,0 +1,49 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from workshop_app.digests import release_digests
+from workshop_app.outbox import drain
+from workshop_app.transport import close_transport, get_transport
+
+
+class Command(BaseCommand):
+    help = ("Deliver emails waiting in the outbox, retrying failed ones and "
+            "releasing digests that are due")
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--once', action='store_true',
+            help='Drain the outbox once and exit instead of polling'
+        )
+        parser.add_argument(
+            '--interval', type=float, default=5,
+            help='Seconds to sleep between polls (default: 5)'
+        )
+        parser.add_argument(
+            '--batch-size', type=int, default=None,
+            help='Emails claimed per batch (default: EMAIL_OUTBOX_BATCH_SIZE)'
+        )
+        parser.add_argument(
+            '--rate', type=float, default=None,
+            help='Maximum emails per second (default: EMAIL_OUTBOX_RATE_LIMIT)'
+        )
+
+    def handle(self, *args, **options):
+        transport = get_transport()
+        try:
+            while True:
+                release_digests()
+                sent, failed = drain(options['batch_size'], transport,
+                                     options['rate'])
+                if sent or failed:
+                    rate = transport.metrics.messages_per_second
+                    self.stdout.write(
+                        f"Sent {sent} email(s), {failed} failed "
+                        f"({rate:.1f} messages/s overall)"
+                    )
+                if options['once']:
+                    break
+                time.sleep(options['interval'])
+        finally:
+            close_transport()
@@ -0,0 +1,61 @@
+import time
+from datetime import date
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+
+from workshop_app.outbox import drain
+from workshop_app.reminders import build_reminders, due_reminders, save_reminders
+
+
+class Command(BaseCommand):
+    help = ("Queue reminder emails for accepted workshops due in "
+            "WORKSHOP_REMINDER_DAYS days; safe to run more than once a day")
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--days', type=int, nargs='+', default=None,
+            help='Days before the workshop to remind on '
+                 '(default: WORKSHOP_REMINDER_DAYS)'
+        )
+        parser.add_argument(
+            '--today', type=date.fromisoformat, default=None,
+            help='Run as if today were this date (YYYY-MM-DD)'
+        )
+        parser.add_argument(
+            '--batch-size', type=int, default=None,
+            help='Rows per INSERT (default: EMAIL_OUTBOX_BATCH_SIZE)'
+        )
+        parser.add_argument(
+            '--deliver', action='store_true',
+            help='Also drain the outbox now instead of leaving it to the '
+                 'send_queued_mail worker'
+        )
+        parser.add_argument(
+            '--dry-run', action='store_true',
+            help='Build the reminders and report throughput without '
+                 'queueing anything'
+        )
+
+    def handle(self, *args, **options):
+        today = options['today'] or timezone.localdate()
+        schedule = options['days'] or settings.WORKSHOP_REMINDER_DAYS
+
+        start = time.perf_counter()
+        reminders = list(due_reminders(today, schedule))
+        emails, records = build_reminders(reminders)
+        if not options['dry_run']:
+            save_reminders(emails, records, options['batch_size'])
+        elapsed = time.perf_counter() - start
+
+        workshops = len({reminder.workshop.id for reminder in reminders})
+        verb = "Would queue" if options['dry_run'] else "Queued"
+        rate = len(emails) / elapsed if elapsed else 0
+        self.stdout.write(
+            f"{verb} {len(emails)} reminder(s) for {workshops} workshop(s) "
+            f"in {elapsed:.2f}s ({rate:.0f}/s)"
+        )
+        if options['deliver'] and not options['dry_run']:
+            sent, failed = drain(options['batch_size'])
+            self.stdout.write(f"Sent {sent} email(s), {failed} failed")
@@ -0,0 +1,132 @@
+"""Serving uploaded files with conditional and range requests.
+
+``serve_file`` answers If-None-Match / If-Modified-Since with 304, a single
+``Range: bytes=...`` with 206, and can hand the transfer to the web server
+(MEDIA_OFFLOAD) so large files do not hold a Python worker.
+"""
+import mimetypes
+import os
+import re
+
+from django.conf import settings
+from django.http import FileResponse, HttpResponse, StreamingHttpResponse
+from django.utils.cache import get_conditional_response, patch_cache_control
+from django.utils.http import http_date, parse_http_date_safe
+
+RANGE_RE = re.compile(r'^bytes=(\d*)-(\d*)$')
+BLOCK_SIZE = 64 * 1024
+
+
+def make_etag(stat):
+    return f'"{stat.st_mtime_ns:x}-{stat.st_size:x}"'
+
+
+def parse_range(header, size):
+    """``(start, end)`` of a single byte range, inclusive
+
+    Returns None when the header should be ignored (absent, malformed or
+    several ranges) and raises ValueError when it cannot be satisfied.
+    """
+    match = RANGE_RE.match(header.replace(' ', '')) if header else None
+    if match is None:
+        return None
+    first, last = match.groups()
+    if not first:
+        if not last:
+            return None
+        # The last N bytes
+        length = int(last)
+        if length == 0 or size == 0:
+            raise ValueError(header)
+        return max(size - length, 0), size - 1
+    start = int(first)
+    end = min(int(last), size - 1) if last else size - 1
+    if start >= size or start > end:
+        raise ValueError(header)
+    return start, end
+
+
+def if_range_matches(request, etag, last_modified):
+    """True if a Range may be honoured under the request's If-Range"""
+    validator = request.headers.get('If-Range')
+    if not validator:
+        return True
+    if validator.startswith(('"', 'W/')):
+        return validator == etag
+    return parse_http_date_safe(validator) == int(last_modified)
+
+
+def iter_range(path, start, length):
+    with open(path, 'rb') as f:
+        f.seek(start)
+        while length > 0:
+            chunk = f.read(min(BLOCK_SIZE, length))
+            if not chunk:
+                break
+            length -= len(chunk)
+            yield chunk
+
+
+def offload(path, relative_path):
+    """An empty response telling the web server to send ``path``"""
+    response = HttpResponse()
+    if settings.MEDIA_OFFLOAD == 'x-sendfile':
+        response['X-Sendfile'] = path
+    else:
+        response['X-Accel-Redirect'] = (
+            settings.MEDIA_ACCEL_PREFIX.rstrip('/') + '/' +
+            relative_path.replace(os.sep, '/')
+        )
+    return response
+
+
+def serve_file(request, path, relative_path, filename=None):
+    """Send the file at ``path``; ``relative_path`` is its name under
+    MEDIA_ROOT, used by the X-Accel-Redirect offload"""
+    stat = os.stat(path)
+    etag = make_etag(stat)
+    last_modified = stat.st_mtime
+    response = get_conditional_response(
+        request, etag=etag, last_modified=int(last_modified)
+    )
+    if response is None:
+        response = _file_response(request, path, relative_path, stat,
+                                  etag, last_modified)
+    content_type = mimetypes.guess_type(filename or path)[0]
+    if response.status_code in (200, 206):
+        response['Content-Type'] = content_type or 'application/octet-stream'
+    if filename:
+        response['Content-Disposition'] = (
+            f'inline; filename="{filename.replace(chr(34), "")}"'
+        )
+    response['ETag'] = etag
+    response['Last-Modified'] = http_date(last_modified)
+    response['Accept-Ranges'] = 'bytes'
+    patch_cache_control(response, private=True,
+                        max_age=settings.MEDIA_CACHE_MAX_AGE)
+    return response
+
+
+def _file_response(request, path, relative_path, stat, etag, last_modified):
+    if settings.MEDIA_OFFLOAD:
+        # The web server handles Range itself
+        return offload(path, relative_path)
+    size = stat.st_size
+    requested = None
+    if request.method == 'GET' and if_range_matches(request, etag,
+                                                    last_modified):
+        try:
+            requested = parse_range(request.headers.get('Range'), size)
+        except ValueError:
+            response = HttpResponse(status=416)
+            response['Content-Range'] = f'bytes */{size}'
+            return response
+    if requested is None:
+        return FileResponse(open(path, 'rb'))
+    start, end = requested
+    response = StreamingHttpResponse(
+        iter_range(path, start, end - start + 1), status=206
+    )
+    response['Content-Range'] = f'bytes {start}-{end}/{size}'
+    response['Content-Length'] = str(end - start + 1)
+    return response
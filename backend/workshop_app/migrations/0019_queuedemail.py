@@ -0,0 +1,34 @@
+# Generated by Django 5.2.6 on 2026-10-18 13:43
+
+import django.utils.timezone
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('workshop_app', '0018_alter_attachmentfile_id_alter_banner_id_and_more'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='QueuedEmail',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('subject', models.CharField(max_length=255)),
+                ('body', models.TextField()),
+                ('from_email', models.CharField(max_length=255)),
+                ('to', models.TextField(help_text='Comma separated list of recipients')),
+                ('attachment_dir', models.CharField(blank=True, help_text='Directory under MEDIA_ROOT whose files are attached', max_length=255)),
+                ('status', models.IntegerField(choices=[(0, 'Pending'), (1, 'Sending'), (2, 'Sent'), (3, 'Failed')], default=0)),
+                ('attempts', models.PositiveIntegerField(default=0)),
+                ('last_error', models.TextField(blank=True)),
+                ('created_date', models.DateTimeField(default=django.utils.timezone.now)),
+                ('next_attempt', models.DateTimeField(default=django.utils.timezone.now)),
+                ('sent_date', models.DateTimeField(blank=True, null=True)),
+            ],
+            options={
+                'indexes': [models.Index(fields=['status', 'next_attempt'], name='workshop_ap_status_57e5ab_idx')],
+            },
+        ),
+    ]
@@ -0,0 +1,29 @@
+# Generated by Django 5.2.6 on 2026-10-18 13:50
+
+import django.db.models.deletion
+import django.utils.timezone
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('workshop_app', '0019_queuedemail'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='SentReminder',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('role', models.CharField(choices=[('instructor', 'Instructor'), ('coordinator', 'Coordinator')], max_length=20)),
+                ('workshop_date', models.DateField()),
+                ('days_before', models.PositiveIntegerField()),
+                ('created_date', models.DateTimeField(default=django.utils.timezone.now)),
+                ('workshop', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, to='workshop_app.workshop')),
+            ],
+            options={
+                'constraints': [models.UniqueConstraint(fields=('workshop', 'role', 'workshop_date', 'days_before'), name='unique_sent_reminder')],
+            },
+        ),
+    ]
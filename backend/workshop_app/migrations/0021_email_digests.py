@@ -0,0 +1,23 @@
+# Generated by Django 5.2.6 on 2026-10-18 13:55
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('workshop_app', '0020_sentreminder'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='profile',
+            name='digest_interval',
+            field=models.PositiveIntegerField(choices=[(0, 'Send each email immediately'), (1, 'Hourly digest'), (24, 'Daily digest')], default=0, help_text='Collect workshop proposals and date changes into one summary email instead of one email each'),
+        ),
+        migrations.AlterField(
+            model_name='queuedemail',
+            name='status',
+            field=models.IntegerField(choices=[(0, 'Pending'), (1, 'Sending'), (2, 'Sent'), (3, 'Failed'), (4, 'Held for digest'), (5, 'Sent in a digest')], default=0),
+        ),
+    ]
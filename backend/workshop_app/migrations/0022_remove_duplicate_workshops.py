@@ -0,0 +1,62 @@
+from django.db import migrations
+from django.db.models import Case, Count, F, IntegerField, Value, When
+
+
+def remove_duplicate_proposals(apps, schema_editor):
+    """Keep one of several proposals for the same coordinator, type and
+    date, moving comments over and keeping the rollup counts right
+
+    An accepted workshop wins over a pending one and a pending one over a
+    deleted one, then one with an instructor, then the oldest.
+    """
+    Workshop = apps.get_model('workshop_app', 'Workshop')
+    Comment = apps.get_model('workshop_app', 'Comment')
+    WorkshopRollup = apps.get_model('statistics_app', 'WorkshopRollup')
+    groups = (
+        Workshop.objects.order_by()
+        .values('coordinator_id', 'date', 'workshop_type_id')
+        .annotate(proposals=Count('id'))
+        .filter(proposals__gt=1)
+    )
+    precedence = Case(
+        When(status=1, instructor__isnull=False, then=Value(0)),
+        When(status=1, then=Value(1)),
+        When(status=0, instructor__isnull=False, then=Value(2)),
+        When(status=0, then=Value(3)),
+        When(instructor__isnull=False, then=Value(4)),
+        default=Value(5), output_field=IntegerField()
+    )
+    for group in list(groups):
+        group.pop('proposals')
+        proposals = Workshop.objects.filter(**group)
+        keep = proposals.order_by(precedence, 'id').values_list(
+            'id', flat=True
+        )[0]
+        duplicates = proposals.exclude(id=keep)
+        Comment.objects.filter(workshop__in=duplicates).update(
+            workshop_id=keep
+        )
+        for date, state, workshop_type_id, status in duplicates.values_list(
+                'date', 'coordinator__profile__state', 'workshop_type_id',
+                'status'):
+            WorkshopRollup.objects.filter(
+                date=date, state=state or '',
+                workshop_type_id=workshop_type_id, status=status,
+                count__gte=1
+            ).update(count=F('count') - 1)
+        duplicates.delete()
+
+
+class Migration(migrations.Migration):
+    # Before 0023 adds unique_workshop_proposal; kept separate so the data
+    # changes are committed before PostgreSQL alters the table
+
+    dependencies = [
+        ('workshop_app', '0021_email_digests'),
+        ('statistics_app', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.RunPython(remove_duplicate_proposals,
+                             migrations.RunPython.noop),
+    ]
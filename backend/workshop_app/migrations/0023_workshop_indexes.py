@@ -0,0 +1,27 @@
+# Generated by Django 5.2.6 on 2026-10-18 14:15
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('workshop_app', '0022_remove_duplicate_workshops'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='workshop',
+            index=models.Index(fields=['status', 'date'], name='workshop_status_date_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='workshop',
+            index=models.Index(fields=['instructor', 'date'], name='workshop_instructor_date_idx'),
+        ),
+        migrations.AddConstraint(
+            model_name='workshop',
+            constraint=models.UniqueConstraint(fields=('coordinator', 'date', 'workshop_type'), name='unique_workshop_proposal'),
+        ),
+    ]
@@ -1,6 +1,6 @@
 import os
 import uuid
-import pandas as pd
+from collections import Counter
 
 from django.contrib.auth.models import User
 from django.core.validators import RegexValidator
@@ -8,6 +8,8 @@ from django.db import models
 from django.utils import timezone
 from django.core.validators import MinValueValidator
 
+from .attachments import attachment_dir
+
 position_choices = (
     ("coordinator", "Coordinator"),
     ("instructor", "Instructor")
@@ -44,6 +46,13 @@ source = (
     ("From other College", "From other College"),
 )
 
+# Hours between notification digests; 0 sends every email straight away
+digest_choices = (
+    (0, "Send each email immediately"),
+    (1, "Hourly digest"),
+    (24, "Daily digest"),
+)
+
 states = (
     ("", "---------"),
     ("IN-AP", "Andhra Pradesh"),
@@ -91,7 +100,7 @@ def has_profile(user):
 
 
 def attachments(instance, filename):
-    return os.sep.join((instance.workshop_type.name.replace(" ", '_'), filename))
+    return os.sep.join((attachment_dir(instance.workshop_type.name), filename))
 
 
 class Profile(models.Model):
@@ -125,6 +134,11 @@ class Profile(models.Model):
     is_email_verified = models.BooleanField(default=False)
     activation_key = models.CharField(max_length=255, blank=True, null=True)
     key_expiry_time = models.DateTimeField(blank=True, null=True)
+    digest_interval = models.PositiveIntegerField(
+        choices=digest_choices, default=0,
+        help_text='Collect workshop proposals and date changes into one '
+                  'summary email instead of one email each'
+    )
 
     def __str__(self):
         return f"Profile for {self.user.get_full_name()}"
@@ -159,31 +173,58 @@ class AttachmentFile(models.Model):
 
 class WorkshopManager(models.Manager):
 
+    def _count_by(self, workshops, field):
+        """GROUP BY ``field`` in the database, largest groups first"""
+        return (
+            workshops.order_by().values_list(field)
+            .annotate(count=models.Count("id"))
+            .order_by("-count", field)
+        )
+
     def get_workshops_by_state(self, workshops):
-        w = workshops.values_list("coordinator__profile__state", flat=True)
         states_map = dict(states)
-        df = pd.DataFrame(list(w))
         data_states, data_counts = [], []
-        if not df.empty:
-            grouped_data = df.value_counts().to_dict()
-            for state, count in grouped_data.items():
-                state_name = state[0]
-                data_states.append(states_map[state_name])
-                data_counts.append(count)
+        for state, count in self._count_by(
+                workshops, "coordinator__profile__state"):
+            if state is None:
+                continue
+            data_states.append(states_map.get(state, state))
+            data_counts.append(count)
         return data_states, data_counts
 
     def get_workshops_by_type(self, workshops):
-        w = workshops.values_list("workshop_type__name", flat=True)
-        df = pd.DataFrame(list(w))
         data_wstypes, data_counts = [], []
-        if not df.empty:
-            grouped_data = df.value_counts().to_dict()
-            for ws, count in grouped_data.items():
-                ws_name = ws[0]
-                data_wstypes.append(ws_name)
-                data_counts.append(count)
+        for ws_name, count in self._count_by(workshops, "workshop_type__name"):
+            data_wstypes.append(ws_name)
+            data_counts.append(count)
         return data_wstypes, data_counts
 
+    def get_workshops_by_state_and_type(self, workshops):
+        """Both breakdowns from a single GROUP BY (state, type) query.
+
+        Returns ``((states, state_counts), (types, type_counts))`` with the
+        same contract as get_workshops_by_state and get_workshops_by_type.
+        """
+        rows = (
+            workshops.order_by()
+            .values_list("coordinator__profile__state", "workshop_type__name")
+            .annotate(count=models.Count("id"))
+        )
+        by_state, by_type = Counter(), Counter()
+        for state, ws_name, count in rows:
+            if state is not None:
+                by_state[state] += count
+            by_type[ws_name] += count
+
+        states_map = dict(states)
+        state_groups = sorted(by_state.items(), key=lambda g: (-g[1], g[0]))
+        type_groups = sorted(by_type.items(), key=lambda g: (-g[1], g[0]))
+        return (
+            ([states_map.get(s, s) for s, _ in state_groups],
+             [c for _, c in state_groups]),
+            ([t for t, _ in type_groups], [c for _, c in type_groups]),
+        )
+
 
 class Workshop(models.Model):
     """
@@ -211,6 +252,25 @@ class Workshop(models.Model):
 
     objects = WorkshopManager()
 
+    class Meta:
+        constraints = [
+            # One proposal per coordinator, workshop type and date; also
+            # serves the coordinator's workshops ordered by date
+            models.UniqueConstraint(
+                fields=['coordinator', 'date', 'workshop_type'],
+                name='unique_workshop_proposal'
+            )
+        ]
+        indexes = [
+            # Accepted/pending workshops in a date range (statistics, the
+            # instructor dashboard)
+            models.Index(fields=['status', 'date'],
+                         name='workshop_status_date_idx'),
+            # An instructor's upcoming workshops
+            models.Index(fields=['instructor', 'date'],
+                         name='workshop_instructor_date_idx'),
+        ]
+
     def __str__(self):
         return f"{self.workshop_type} on {self.date} by {self.coordinator}"
 
@@ -260,3 +320,70 @@ class Banner(models.Model):
 
     def __str__(self):
         return self.title
+
+
+class QueuedEmail(models.Model):
+    """
+    Outgoing email waiting to be delivered by `manage.py send_queued_mail`
+    """
+    PENDING, SENDING, SENT, FAILED, HELD, DIGESTED = range(6)
+    STATUS_CHOICES = [(PENDING, 'Pending'),
+                      (SENDING, 'Sending'),
+                      (SENT, 'Sent'),
+                      (FAILED, 'Failed'),
+                      # Waiting to be merged into the recipient's digest
+                      (HELD, 'Held for digest'),
+                      (DIGESTED, 'Sent in a digest')]
+
+    subject = models.CharField(max_length=255)
+    body = models.TextField()
+    from_email = models.CharField(max_length=255)
+    to = models.TextField(help_text='Comma separated list of recipients')
+    attachment_dir = models.CharField(
+        max_length=255, blank=True,
+        help_text='Directory under MEDIA_ROOT whose files are attached'
+    )
+    status = models.IntegerField(choices=STATUS_CHOICES, default=PENDING)
+    attempts = models.PositiveIntegerField(default=0)
+    last_error = models.TextField(blank=True)
+    created_date = models.DateTimeField(default=timezone.now)
+    # When a pending email is next due, or when a claimed one may be retaken
+    next_attempt = models.DateTimeField(default=timezone.now)
+    sent_date = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        indexes = [models.Index(fields=['status', 'next_attempt'])]
+
+    def __str__(self):
+        return f"{self.subject} to {self.to}"
+
+    @property
+    def recipients(self):
+        return [address for address in self.to.split(',') if address]
+
+
+class SentReminder(models.Model):
+    """
+    Records reminders queued by `manage.py send_reminders` so reruns skip them
+    """
+    ROLE_CHOICES = [('instructor', 'Instructor'),
+                    ('coordinator', 'Coordinator')]
+
+    workshop = models.ForeignKey(Workshop, on_delete=models.CASCADE)
+    role = models.CharField(max_length=20, choices=ROLE_CHOICES)
+    # The workshop date the reminder was for, so a rescheduled workshop
+    # is reminded again
+    workshop_date = models.DateField()
+    days_before = models.PositiveIntegerField()
+    created_date = models.DateTimeField(default=timezone.now)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(
+                fields=['workshop', 'role', 'workshop_date', 'days_before'],
+                name='unique_sent_reminder'
+            )
+        ]
+
+    def __str__(self):
+        return f"{self.days_before} day reminder to {self.role} of {self.workshop}"
@@ -0,0 +1,164 @@
+import logging
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.mail import EmailMultiAlternatives
+from django.db import transaction
+from django.utils import timezone
+
+from .attachments import get_attachment_parts
+from .models import Profile, QueuedEmail
+from .transport import RateLimiter, get_transport
+
+logger = logging.getLogger(__name__)
+
+# Upper bound for the delay between two attempts at the same email
+MAX_RETRY_DELAY = 6 * 60 * 60
+
+
+def digest_recipients(recipients):
+    """The addresses in ``recipients`` whose owners want digests"""
+    return set(Profile.objects.filter(
+        user__email__in=recipients, digest_interval__gt=0
+    ).values_list('user__email', flat=True))
+
+
+def queue_email(subject, body, recipients, from_email=None,
+                attachment_dir='', digest=False):
+    """Store an email in the outbox; the worker sends it later
+
+    With ``digest``, an email to a single recipient who asked for digests
+    is held and later merged into their summary email.
+    """
+    status = QueuedEmail.PENDING
+    if digest and len(recipients) == 1 and digest_recipients(recipients):
+        status = QueuedEmail.HELD
+    return QueuedEmail.objects.create(
+        subject=subject, body=body,
+        from_email=from_email or settings.SENDER_EMAIL,
+        to=','.join(recipients), attachment_dir=attachment_dir,
+        status=status
+    )
+
+
+def queue_mass_email(subject, body, recipients, from_email=None,
+                     digest=False):
+    """Queue one copy of an email per recipient with a single insert
+
+    Every recipient gets their own message so addresses are not disclosed
+    to each other; the rows are written with ``bulk_create``.
+    """
+    from_email = from_email or settings.SENDER_EMAIL
+    held = digest_recipients(recipients) if digest else set()
+    return QueuedEmail.objects.bulk_create(
+        [QueuedEmail(subject=subject, body=body, from_email=from_email,
+                     to=recipient,
+                     status=(QueuedEmail.HELD if recipient in held
+                             else QueuedEmail.PENDING))
+         for recipient in recipients],
+        batch_size=settings.EMAIL_OUTBOX_BATCH_SIZE
+    )
+
+
+def retry_delay(attempts):
+    """Seconds to wait after the ``attempts``-th failed attempt"""
+    delay = settings.EMAIL_OUTBOX_RETRY_DELAY * 2 ** (attempts - 1)
+    return timedelta(seconds=min(delay, MAX_RETRY_DELAY))
+
+
+def claim_batch(batch_size=None):
+    """Mark up to ``batch_size`` due emails as sending and return them
+
+    Rows locked by another worker are skipped. A claim expires after
+    ``EMAIL_OUTBOX_LEASE`` seconds so emails held by a worker that died are
+    retried.
+    """
+    batch_size = batch_size or settings.EMAIL_OUTBOX_BATCH_SIZE
+    now = timezone.now()
+    with transaction.atomic():
+        ids = list(
+            QueuedEmail.objects.filter(
+                status__in=[QueuedEmail.PENDING, QueuedEmail.SENDING],
+                next_attempt__lte=now
+            ).order_by('next_attempt', 'id')
+            .select_for_update(skip_locked=True)
+            .values_list('id', flat=True)[:batch_size]
+        )
+        QueuedEmail.objects.filter(id__in=ids).update(
+            status=QueuedEmail.SENDING,
+            next_attempt=now + timedelta(seconds=settings.EMAIL_OUTBOX_LEASE)
+        )
+    return list(QueuedEmail.objects.filter(id__in=ids).order_by('id'))
+
+
+def build_message(email, connection=None):
+    message = EmailMultiAlternatives(
+        email.subject, email.body, email.from_email, email.recipients,
+        connection=connection
+    )
+    if email.attachment_dir:
+        for part in get_attachment_parts(email.attachment_dir):
+            message.attach(part)
+    return message
+
+
+def mark_sent(email):
+    email.status = QueuedEmail.SENT
+    email.attempts += 1
+    email.sent_date = timezone.now()
+    email.last_error = ''
+    email.save(update_fields=['status', 'attempts', 'sent_date',
+                              'last_error'])
+
+
+def mark_failed(email, error):
+    """Schedule a retry, or give up once the attempts are exhausted"""
+    email.attempts += 1
+    email.last_error = repr(error)
+    if email.attempts >= settings.EMAIL_OUTBOX_MAX_ATTEMPTS:
+        email.status = QueuedEmail.FAILED
+        logger.error("Giving up on email %s after %s attempts: %r",
+                     email.pk, email.attempts, error)
+    else:
+        email.status = QueuedEmail.PENDING
+        email.next_attempt = timezone.now() + retry_delay(email.attempts)
+        logger.warning("Email %s failed (attempt %s): %r",
+                       email.pk, email.attempts, error)
+    email.save(update_fields=['status', 'attempts', 'last_error',
+                              'next_attempt'])
+
+
+def deliver(emails, transport=None, limiter=None):
+    """Send ``emails`` with the configured transport; return the number sent"""
+    transport = transport or get_transport()
+    messages, ready = [], []
+    for email in emails:
+        try:
+            messages.append(build_message(email))
+        except Exception as error:
+            mark_failed(email, error)
+        else:
+            ready.append(email)
+    sent = 0
+    for email, error in zip(ready, transport.send(messages, limiter)):
+        if error is None:
+            mark_sent(email)
+            sent += 1
+        else:
+            mark_failed(email, error)
+    return sent
+
+
+def drain(batch_size=None, transport=None, rate=None):
+    """Deliver every due email; return (sent, failed) counts"""
+    sent = failed = 0
+    if rate is None:
+        rate = settings.EMAIL_OUTBOX_RATE_LIMIT
+    limiter = RateLimiter(rate)
+    while True:
+        emails = claim_batch(batch_size)
+        if not emails:
+            return sent, failed
+        delivered = deliver(emails, transport, limiter)
+        sent += delivered
+        failed += len(emails) - delivered
@@ -1,14 +1,11 @@
 path=$1 #command line argument to virtual environment
 
 DIR="$( cd "$( dirname "$0" )" && pwd )"
-cd $DIR
+cd $DIR/..
 
 #Activate virtual environment
-source $1bin/activate 
-#Run script to send reminder mails
-python reminder_script.py
-#Train chatbot
-cd ..
-python manage.py train
+source $1bin/activate
+#Queue reminder mails; the send_queued_mail worker delivers them
+python manage.py send_reminders
 #Deactivate Virtual environment
 deactivate
@@ -0,0 +1,65 @@
+"""Reminder emails for accepted workshops coming up soon"""
+from collections import namedtuple
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import transaction
+
+from .models import QueuedEmail, SentReminder, Workshop
+from .send_mails import render_email
+
+Reminder = namedtuple('Reminder', 'workshop role recipient days_before')
+
+
+def due_reminders(today, schedule):
+    """Reminders due on ``today`` for ``schedule`` (days before the
+    workshop) that have not been queued yet. Uses two queries."""
+    lead_by_date = {today + timedelta(days=days): days for days in schedule}
+    workshops = Workshop.objects.filter(
+        status=1, date__in=lead_by_date
+    ).select_related(
+        'coordinator', 'instructor', 'workshop_type'
+    ).order_by('date', 'id')
+    sent = set(SentReminder.objects.filter(
+        workshop_date__in=lead_by_date
+    ).values_list('workshop_id', 'role', 'workshop_date', 'days_before'))
+
+    for workshop in workshops:
+        days_before = lead_by_date[workshop.date]
+        for role, user in (('instructor', workshop.instructor),
+                           ('coordinator', workshop.coordinator)):
+            if user is None or not user.email:
+                continue
+            if (workshop.id, role, workshop.date, days_before) in sent:
+                continue
+            yield Reminder(workshop, role, user, days_before)
+
+
+def build_reminders(reminders):
+    """Unsaved outbox rows and their SentReminder records"""
+    emails, records = [], []
+    for reminder in reminders:
+        workshop = reminder.workshop
+        body = render_email(f'reminder_{reminder.role}', {
+            'name': reminder.recipient.get_full_name(),
+            'workshop_date': str(workshop.date),
+            'workshop_title': workshop.workshop_type.name,
+        })
+        emails.append(QueuedEmail(
+            subject=f"Gentle Reminder about workshop on {workshop.date}",
+            body=body, from_email=settings.SENDER_EMAIL,
+            to=reminder.recipient.email
+        ))
+        records.append(SentReminder(
+            workshop=workshop, role=reminder.role,
+            workshop_date=workshop.date, days_before=reminder.days_before
+        ))
+    return emails, records
+
+
+def save_reminders(emails, records, batch_size=None):
+    """Queue the emails and record them in one transaction"""
+    batch_size = batch_size or settings.EMAIL_OUTBOX_BATCH_SIZE
+    with transaction.atomic():
+        QueuedEmail.objects.bulk_create(emails, batch_size=batch_size)
+        SentReminder.objects.bulk_create(records, batch_size=batch_size)
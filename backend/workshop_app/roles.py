@@ -0,0 +1,71 @@
+"""Group membership of a user, looked up once per request.
+
+The group names are memoised on the user object, which lives for one
+request, and kept in the cache for ROLE_CACHE_TIMEOUT seconds so most
+requests need no query at all. Adding or removing a user's groups, or
+renaming or deleting a group, drops the cached entries (see
+workshop_app.signals).
+
+Caching across requests needs a cache shared by every worker: with the
+per-process local memory cache only the worker that made a change drops
+its entry, and the others would keep granting a revoked role. That is why
+ROLE_CACHE_TIMEOUT defaults to 0 unless CACHE_BACKEND is shared.
+"""
+from django.conf import settings
+from django.core.cache import cache
+
+INSTRUCTOR = 'instructor'
+
+# Attribute the names are memoised under on the user object
+_ATTRIBUTE = '_group_names'
+
+
+def cache_key(user_id):
+    return f'user-groups:{user_id}'
+
+
+def get_group_names(user):
+    """Names of the groups ``user`` belongs to, as a frozenset"""
+    if user is None or not user.is_authenticated:
+        return frozenset()
+    names = getattr(user, _ATTRIBUTE, None)
+    if names is not None:
+        return names
+    timeout = settings.ROLE_CACHE_TIMEOUT
+    names = cache.get(cache_key(user.pk)) if timeout else None
+    if names is None:
+        names = frozenset(user.groups.values_list('name', flat=True))
+        if timeout:
+            cache.set(cache_key(user.pk), names, timeout)
+    setattr(user, _ATTRIBUTE, names)
+    return names
+
+
+def set_group_names(user, names):
+    """Use ``names`` as the user's groups for the rest of the request, e.g.
+    when they come from a signed token"""
+    setattr(user, _ATTRIBUTE, frozenset(names))
+
+
+def has_group(user, name):
+    return name in get_group_names(user)
+
+
+def is_instructor(user):
+    """Check if the user is having instructor rights"""
+    return has_group(user, INSTRUCTOR)
+
+
+def invalidate(user_ids):
+    """Forget the cached groups of the users with ``user_ids``"""
+    cache.delete_many([cache_key(user_id) for user_id in user_ids])
+
+
+def invalidate_user(user):
+    user.__dict__.pop(_ATTRIBUTE, None)
+    invalidate([user.pk])
+
+
+def invalidate_group(group):
+    """Forget the cached groups of every member of ``group``"""
+    invalidate(group.user_set.values_list('id', flat=True))
@@ -3,14 +3,10 @@ __author__ = "Akshen Doke"
 import hashlib
 import logging
 import logging.config
-import os
 
 import yaml
 import re
-from django.core.mail import send_mail
-from textwrap import dedent
 from random import randint
-from smtplib import SMTP
 from django.utils.crypto import get_random_string
 from string import punctuation, digits
 try:
@@ -18,24 +14,15 @@ try:
 except ImportError:
 	from string import ascii_letters as letters
 from workshop_portal.settings import (
-					EMAIL_HOST,
-					EMAIL_PORT,
-					EMAIL_HOST_USER,
-					EMAIL_HOST_PASSWORD,
-					EMAIL_USE_TLS,
 					PRODUCTION_URL,
-					SENDER_EMAIL,
 					ADMIN_EMAIL
 					)
-from django.core.mail import EmailMultiAlternatives
 from django.conf import settings
-from os import listdir, path
-from email.mime.multipart import MIMEMultipart
-from email.mime.text import MIMEText
-from email.mime.base import MIMEBase
-from email import encoders
-from time import sleep
+from django.template import Context, Engine
+from os import path
+from .attachments import attachment_dir
 from .models import WorkshopType
+from .outbox import queue_email, queue_mass_email
 
 
 def validateEmail(email):
@@ -53,44 +40,33 @@ def generate_activation_key(username):
 	return hashlib.sha256((secret_key + username).encode('utf-8')).hexdigest()
 
 
-def send_smtp_email(request=None, subject=None, message=None,
-				user_position=None, workshop_date=None,
-				workshop_title=None, user_name=None,
-				other_email=None, phone_number=None,
-				institute=None, attachment=None):
+def configure_email_logging():
 	'''
-		Send email using SMTPLIB
+	Apply LOG_FOLDER/emailconfig.yaml. Called once from
+	WorkshopAppConfig.ready instead of on every email.
 	'''
+	config_path = path.join(settings.LOG_FOLDER, 'emailconfig.yaml')
+	try:
+		with open(config_path, 'r') as configfile:
+			logging.config.dictConfig(yaml.safe_load(configfile))
+	except (OSError, ValueError, yaml.YAMLError) as error:
+		logging.getLogger(__name__).warning(
+			"Email logging not configured from %s: %s", config_path, error)
+
+
+# Plain-text engine for email bodies: no HTML autoescaping, and the cached
+# loader compiles each template once per process.
+email_templates = Engine(
+	dirs=[path.join(path.dirname(__file__), 'templates', 'workshop_app', 'emails')],
+	autoescape=False,
+	loaders=[('django.template.loaders.cached.Loader',
+			['django.template.loaders.filesystem.Loader'])],
+	)
 
-	msg = MIMEMultipart()
-	msg['From'] = EMAIL_HOST_USER
-	msg['To'] = other_email
-	msg['Subject'] = subject
-	body = message
-	msg.attach(MIMEText(body, 'plain'))
-
-	if attachment:
-		from django.conf import settings
-		from os import listdir, path
-		files = listdir(settings.MEDIA_ROOT)
-		for f in files:
-			attachment = open(path.join(settings.MEDIA_ROOT,f), 'rb')
-			part = MIMEBase('application', 'octet-stream')
-			part.set_payload((attachment).read())
-			encoders.encode_base64(part)
-			part.add_header('Content-Disposition', "attachment; filename= %s " % f)
-			msg.attach(part)
-
-
-	server = SMTP(EMAIL_HOST, EMAIL_PORT)
-	server.ehlo()
-	server.starttls()
-	server.ehlo()
-	server.esmtp_features['auth']='LOGIN DIGEST-MD5 PLAIN'
-	server.login(EMAIL_HOST_USER, EMAIL_HOST_PASSWORD)
-	text = msg.as_string()
-	server.sendmail(EMAIL_HOST_USER, other_email, text)
-	server.close()
+
+def render_email(name, context):
+	return email_templates.get_template(name + '.txt').render(
+		Context(context, autoescape=False))
 
 
 def send_email(	request, call_on,
@@ -98,342 +74,136 @@ def send_email(	request, call_on,
 			new_workshop_date=None,
 			workshop_title=None, user_name=None,
 			other_email=None, phone_number=None,
-			institute=None, key=None
+			institute=None, key=None, recipients=None
 			):
 	'''
 	Email sending function while registration and
-	booking confirmation.
+	booking confirmation. Emails are only queued here and delivered
+	by `manage.py send_queued_mail`.
+
+	For 'Proposed Workshop', `recipients` may list every instructor's
+	address; each gets a copy of the same message. Proposals and date
+	changes are held for recipients who chose a digest on their profile.
 	'''
-	try:
-		with open(path.join(settings.LOG_FOLDER, 'emailconfig.yaml'), 'r') as configfile:
-			config_dict = yaml.load(configfile)
-		logging.config.dictConfig(config_dict)
-	except:
-		print('File Not Found and Configuration Error')
+	context = {
+		'production_url': PRODUCTION_URL, 'key': key,
+		'user_name': user_name, 'phone_number': phone_number,
+		'institute': institute, 'workshop_date': workshop_date,
+		'new_workshop_date': new_workshop_date,
+		'workshop_title': workshop_title,
+		}
 
 	if call_on == "Registration":
-		message = dedent("""\
-					Thank you for registering as a coordinator with us.
-
-					Please click on the below link to
-					activate your account
-					{0}/workshop/activate_user/{1}
-
-					After activation you can proceed to book your dates for
-					the workshop(s).
-
-					In case of queries regarding workshop booking(s),
-					revert to this email.""".format(PRODUCTION_URL, key))
+		message = render_email('registration', context)
 
 		logging.info("New Registration from: %s", request.user.email)
-		try:
-			send_mail(
-				"Coordinator Registration at FOSSEE, IIT Bombay", message, SENDER_EMAIL,
-				[request.user.email], fail_silently=True
-				)
-
-		except Exception:
-			send_smtp_email(request=request,
-				subject="Coordinator Registration - FOSSEE, IIT Bombay",
-				message=message, other_email=request.user.email,
-				)
+		queue_email(
+				"Coordinator Registration at FOSSEE, IIT Bombay", message,
+				[request.user.email])
 
 	elif call_on == "Booking":
 		if user_position == "instructor":
-			message = dedent("""\
-					Coordinator name:{0}
-					Coordinator email: {1}
-					Contact number:{2}
-					Institute:{3}
-					Workshop date:{4}
-					Workshop title:{5}
-
-					You may accept or reject this booking
-					{6}/workshop/dashboard""".format(
-					user_name, request.user.email,
-					request.user.profile.phone_number,
-					request.user.profile.institute,
-					workshop_date, workshop_title,
-					PRODUCTION_URL
-					))
+			context.update(
+				coordinator_email=request.user.email,
+				phone_number=request.user.profile.phone_number,
+				institute=request.user.profile.institute,
+				)
+			message = render_email('booking_instructor', context)
 
 			logging.info("Booking Done by{0} for {1} ".format(request.user.email,
 								other_email))
-			try:
-				send_mail(
+			queue_email(
 					"New FOSSEE Workshop booking on {0}".format(workshop_date),
-					message, SENDER_EMAIL, [other_email],
-					fail_silently=True
-					)
-			except Exception:
-				send_smtp_email(request=request,
-					subject="New FOSSEE Workshop booking on {0}"
-					.format(workshop_date),
-					message=message, other_email=other_email,
-					)
+					message, [other_email])
 		else:
-			message = dedent("""\
-					Thank You for New FOSSEE Workshop booking.
-
-					Workshop date:{0}
-					Workshop title:{1}
-
-					Your request has been received and is awaiting instructor
-					approval/disapproval. You will be notified about the status
-					via email and on {2}/workshop/status
-
-					Please Note: Unless you get a confirmation email for this workshop with
-					the list of instructions, your workshop shall be in the waiting list.
+			message = render_email('booking_coordinator', context)
 
-					In case of queries regarding workshop booking(s), revert
-					to this email.""".format(
-					workshop_date, workshop_title, PRODUCTION_URL
-					))
-
-			try:
-				send_mail(
+			queue_email(
 					"Pending Request for New FOSSEE Workshop booking on {0}"
-					.format(workshop_date), message, SENDER_EMAIL,
-					[request.user.email], fail_silently=True
-					)
-			except Exception:
-				send_smtp_email(request=request,
-					subject="Pending Request for New FOSSEE Workshop booking \
-					on {0}".format(workshop_date),
-					message=message, other_email=request.user.email,
-					)
+					.format(workshop_date), message,
+					[request.user.email])
 
 	elif call_on == "Booking Confirmed":
+		subject = "FOSSEE Workshop booking confirmation  on {0}".\
+			format(workshop_date)
 		if user_position == "instructor":
-			message = dedent("""\
-			Coordinator name:{0}
-			Coordinator email: {1}
-			Contact number:{2}
-			Institute:{3}
-			Workshop date:{4}
-			Workshop title:{5}
-
-			You have accepted this booking.  Detailed instructions have
-			been sent to the coordinator. 
-			
-			This is a auto-generated mail.
-			""".format(user_name, other_email,
-				phone_number, institute, workshop_date, workshop_title))
+			context['coordinator_email'] = other_email
+			message = render_email('booking_confirmed_instructor', context)
 
 			logging.info("Booking Confirmed by {0} for {1} ".format(request.user.email,
 								other_email))
 
-			subject = "FOSSEE Workshop booking confirmation  on {0}".\
-				format(workshop_date)
-			msg = EmailMultiAlternatives(subject, message, SENDER_EMAIL, [request.user.email])
-			attachment_paths = path.join(settings.MEDIA_ROOT, workshop_title.replace(" ","_"))
-			if os.path.exists(attachment_paths):
-				files = listdir(attachment_paths)
-			else:
-				files = []
-			for f in files:
-				attachment = open(path.join(attachment_paths, f), 'rb')
-				part = MIMEBase('application', 'octet-stream')
-				part.set_payload((attachment).read())
-				encoders.encode_base64(part)
-				part.add_header('Content-Disposition', "attachment; filename= %s " % f)
-				msg.attach(part)
-				sleep(1)
-			msg.send()
+			queue_email(subject, message, [request.user.email],
+				attachment_dir=attachment_dir(workshop_title))
 
 		else:
-			message = dedent("""\
-				Instructor name:{0}
-				Instructor email: {1}
-				Contact number:{2}
-				Workshop date:{3}
-				Workshop title:{4}
-
-				Your workshop booking has been accepted. Detailed
-				instructions are attached below.
-
-				In case of queries regarding the workshop
-				instructions/schedule revert to this email.""".format(
-				request.user.username, request.user.email,
-				phone_number, workshop_date, workshop_title
-				))
-
-			subject = "FOSSEE Workshop booking confirmation  on {0}".\
-				format(workshop_date)
-			msg = EmailMultiAlternatives(subject, message, SENDER_EMAIL, [other_email])
-			attachment_paths = path.join(settings.MEDIA_ROOT, workshop_title.replace(" ","_"))
-			if os.path.exists(attachment_paths):
-				files = listdir(attachment_paths)
-			else:
-				files = []
-			for f in files:
-				attachment = open(path.join(attachment_paths, f), 'rb')
-				part = MIMEBase('application', 'octet-stream')
-				part.set_payload((attachment).read())
-				encoders.encode_base64(part)
-				part.add_header('Content-Disposition', "attachment; filename= %s " % f)
-				msg.attach(part)
-			msg.send()
+			context.update(
+				instructor_name=request.user.username,
+				instructor_email=request.user.email,
+				)
+			message = render_email('booking_confirmed_coordinator', context)
+
+			queue_email(subject, message, [other_email],
+				attachment_dir=attachment_dir(workshop_title))
 
 
 	elif call_on == "Booking Request Rejected":
 		if user_position == "instructor":
-			message = dedent("""\
-					Coordinator name: {0}
-					Coordinator email: {1}
-					Contact number: {2}
-					Institute: {3}
-					Workshop date: {4}
-					Workshop title: {5}
-
-					You have rejected this booking.  The coordinator has
-					been notified.
-					
-					This is a auto-generated mail.
-					""".format(user_name, other_email,
-					phone_number, institute,
-					workshop_date, workshop_title))
+			context['coordinator_email'] = other_email
+			message = render_email('booking_rejected_instructor', context)
 
 			logging.info("Booking Rejected by {0} for {1} ".format(request.user.email,
 								other_email))
 
-			try:
-				send_mail("FOSSEE Workshop booking rejected for {0}"
-					.format(workshop_date), message, SENDER_EMAIL,
-					[request.user.email], fail_silently=True)
-			except Exception:
-				send_smtp_email(request=request,
-					subject="FOSSEE Workshop booking rejected for {0}".
-					format(workshop_date), message=message,
-					other_email=request.user.email
-					)
+			queue_email("FOSSEE Workshop booking rejected for {0}"
+					.format(workshop_date), message,
+					[request.user.email])
 		else:
-			message = dedent("""\
-					Workshop date:{0}
-					Workshop title:{1}
-
-					We regret to inform you that your workshop booking
-					has been rejected due to unavailability of the
-					instructor. You may try booking other available
-					slots {2}/book/ or you can also Propose a workshop
-					based on your available date.
-					
-					This is a auto-generated mail.
-					"""
-					.format(workshop_date, workshop_title, PRODUCTION_URL))
-
-			try:
-				send_mail("FOSSEE Workshop booking rejected for {0}".
-					format(workshop_date), message, SENDER_EMAIL,
-					[other_email], fail_silently=True)
-			except Exception:
-				send_smtp_email(request=request,
-					subject="FOSSEE Workshop booking rejected for {0}".
-					format(workshop_date), message=message,
-					other_email=other_email
-					)
+			message = render_email('booking_rejected_coordinator', context)
 
-	elif call_on =='Workshop Deleted':
-		message = dedent("""\
-				You have deleted a Workshop.
+			queue_email("FOSSEE Workshop booking rejected for {0}".
+					format(workshop_date), message,
+					[other_email])
 
-				Workshop date:{0}
-				Workshop title:{1}
-				
-				This is a auto-generated mail.
-				"""
-				.format(workshop_date, workshop_title))
+	elif call_on =='Workshop Deleted':
+		message = render_email('workshop_deleted', context)
 
 		logging.info("Workshop Deleted by {0} for {1} ".format(request.user.email,
 								workshop_date))
-		try:
-			send_mail("FOSSEE workshop deleted for {0}".format(workshop_date),
-				message, SENDER_EMAIL, [request.user.email],
-				fail_silently=True)
-		except Exception:
-			send_smtp_email(request=request,
-				subject="FOSSEE Workshop deleted for {0}".
-				format(workshop_date), message=message,
-				other_email=request.user.email
-				)
+		queue_email("FOSSEE workshop deleted for {0}".format(workshop_date),
+				message, [request.user.email])
 
 	elif call_on == 'Proposed Workshop':
 		if user_position == "instructor":
-			message = dedent("""\
-					A coordinator has proposed a workshop. The details are 
-					given below:
-
-					Coordinator name: {0}
-					Coordinator email: {1}
-					Contact number: {2}
-					Institute: {3}
-					Workshop date: {4}
-					Workshop title: {5}
-
-					Please Accept only if you are willing to take the workshop.
-					{6}/my_workshops/ 
-
-					This is a auto-generated mail.
-					"""
-					.format(user_name, request.user.email,
-					phone_number, institute,
-					workshop_date, workshop_title,
-					PRODUCTION_URL))
+			context['coordinator_email'] = request.user.email
+			message = render_email('proposed_workshop', context)
 
 			logging.info("Workshop Proposed by {0} for {1} ".format(request.user.email,
 								workshop_date))
 
-			send_mail("Proposed Workshop on {0}".
-					format(workshop_date), message, SENDER_EMAIL,
-					[other_email], fail_silently=False)
+			if recipients is None:
+				recipients = [other_email]
+			recipients = [email for email in recipients if email]
+			# Nobody to notify, e.g. before any instructor has registered
+			if recipients:
+				queue_mass_email("Proposed Workshop on {0}".
+						format(workshop_date), message,
+						recipients, digest=True)
 
 	elif call_on == 'Change Date':
 		if user_position == "instructor":
-			message = dedent("""\
-					Dear Instructor,
-
-					Your workshop date has been changed from {0} to {1}.
-					
-					This is a auto-generated mail.
-					"""
-					.format(
-					workshop_date, new_workshop_date))
+			message = render_email('change_date_instructor', context)
 
 			logging.info("Workshop Date Changed Done by {0} from {1} to {2}"
 						.format(request.user.email,
 						new_workshop_date, workshop_date))
-			try:
-				send_mail(
+			queue_email(
 					"FOSSEE Python Workshop Date Changed",
-					message, SENDER_EMAIL, [request.user.email],
-					fail_silently=True
-					)
-			except Exception:
-				send_smtp_email(request=request,
-					subject="FOSSEE Python Workshop Date Changed",
-					message=message, other_email=other_email,
-					)
+					message, [request.user.email], digest=True)
 		else:
-			message = dedent("""\
-					Dear Coordinator,
-
-					Your workshop has been rescheduled from {0} to {1}.
-					
-					This is a auto-generated mail.
-					"""
-					.format(
-					workshop_date, new_workshop_date
-					))
-
-			try:
-				send_mail(
-					"FOSSEE Python Workshop Date Changed",
-					message, SENDER_EMAIL,
-					[other_email], fail_silently=True
-					)
-			except Exception:
-				send_smtp_email(request=request,
-					subject="FOSSEE Python Workshop Date Changed",
-					message=message, other_email=request.user.email,
-					)
+			message = render_email('change_date_coordinator', context)
 
+			queue_email(
+					"FOSSEE Python Workshop Date Changed",
+					message,
+					[other_email], digest=True)
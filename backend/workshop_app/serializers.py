@@ -1,7 +1,12 @@
 from rest_framework import serializers
+from rest_framework.exceptions import AuthenticationFailed
 from django.contrib.auth.models import User, Group
-from rest_framework_simplejwt.serializers import TokenObtainPairSerializer
+from rest_framework_simplejwt.serializers import (
+    TokenObtainPairSerializer, TokenRefreshSerializer
+)
+from rest_framework_simplejwt.tokens import AccessToken
 from workshop_app.models import Profile
+from workshop_app.roles import get_group_names
 
 class CustomTokenObtainPairSerializer(TokenObtainPairSerializer):
     @classmethod
@@ -13,7 +18,7 @@ class CustomTokenObtainPairSerializer(TokenObtainPairSerializer):
         token['email'] = user.email
         token['first_name'] = user.first_name
         token['last_name'] = user.last_name
-        token['groups'] = list(user.groups.values_list('name', flat=True))
+        token['groups'] = sorted(get_group_names(user))
         
         # Add profile information if exists
         try:
@@ -26,6 +31,26 @@ class CustomTokenObtainPairSerializer(TokenObtainPairSerializer):
             
         return token
 
+class CustomTokenRefreshSerializer(TokenRefreshSerializer):
+    """Re-read the groups claim, which API permission checks trust, so a
+    group change reaches the client with its next access token"""
+    def validate(self, attrs):
+        refresh = self.token_class(attrs['refresh'])
+        # A user deleted or deactivated since the token was issued gets a
+        # 401, not a DoesNotExist from the base class
+        user = User.objects.filter(
+            pk=refresh.payload.get('user_id'), is_active=True
+        ).first()
+        if user is None:
+            raise AuthenticationFailed(
+                self.error_messages['no_active_account'], 'no_active_account'
+            )
+        data = super().validate(attrs)
+        access = AccessToken(data['access'])
+        access['groups'] = sorted(get_group_names(user))
+        data['access'] = str(access)
+        return data
+
 class UserSerializer(serializers.ModelSerializer):
     groups = serializers.StringRelatedField(many=True, read_only=True)
     
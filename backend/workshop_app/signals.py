@@ -0,0 +1,42 @@
+from django.contrib.auth.models import Group, User
+from django.db.models.signals import (
+    m2m_changed, post_delete, post_save, pre_delete
+)
+from django.dispatch import receiver
+
+from . import attachments, roles
+from .models import AttachmentFile
+
+
+@receiver(post_save, sender=AttachmentFile)
+@receiver(post_delete, sender=AttachmentFile)
+def invalidate_attachment_parts(sender, instance, **kwargs):
+    attachments.invalidate(
+        attachments.attachment_dir(instance.workshop_type.name)
+    )
+
+
+@receiver(m2m_changed, sender=User.groups.through)
+def invalidate_user_groups(sender, instance, action, reverse, pk_set,
+                           **kwargs):
+    if not reverse:
+        # user.groups.add(...) and friends
+        if action in ('post_add', 'post_remove', 'post_clear'):
+            roles.invalidate_user(instance)
+    elif action == 'pre_clear':
+        # group.user_set.clear(): find the members while they are there
+        instance._cleared_user_ids = list(
+            instance.user_set.values_list('id', flat=True)
+        )
+    elif action == 'post_clear':
+        roles.invalidate(getattr(instance, '_cleared_user_ids', []))
+    elif action in ('post_add', 'post_remove'):
+        roles.invalidate(pk_set)
+
+
+@receiver(post_save, sender=Group)
+@receiver(pre_delete, sender=Group)
+def invalidate_group_members(sender, instance, raw=False, **kwargs):
+    # A renamed or deleted group changes its members' group names
+    if not raw and not kwargs.get('created'):
+        roles.invalidate_group(instance)
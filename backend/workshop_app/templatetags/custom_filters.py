@@ -1,7 +1,9 @@
 from django import template
 
+from workshop_app import roles
+
 register = template.Library()
 
 @register.filter(name='has_group')
 def has_group(user, group_name):
-    return user.groups.filter(name=group_name).exists()
+    return roles.has_group(user, group_name)
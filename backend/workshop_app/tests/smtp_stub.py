@@ -0,0 +1,72 @@
+"""A local aiosmtpd server for tests that talk real SMTP"""
+import asyncio
+import shutil
+import socket
+import tempfile
+
+from aiosmtpd.controller import Controller
+from django.test import TestCase, override_settings
+
+from workshop_app.transport import close_transport
+
+
+def free_port():
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+class RecordingHandler:
+    """aiosmtpd handler that keeps every message, optionally slowly, and
+    refuses the addresses in ``refuse``"""
+
+    def __init__(self, delay=0, refuse=()):
+        self.delay = delay
+        self.refuse = set(refuse)
+        self.messages = []
+        self.connections = set()
+        self.active = self.max_active = 0
+
+    async def handle_RCPT(self, server, session, envelope, address,
+                          rcpt_options):
+        if address in self.refuse:
+            return "550 No such user"
+        envelope.rcpt_tos.append(address)
+        return "250 OK"
+
+    async def handle_DATA(self, server, session, envelope):
+        self.active += 1
+        self.max_active = max(self.max_active, self.active)
+        try:
+            await asyncio.sleep(self.delay)
+        finally:
+            self.active -= 1
+        self.messages.append(envelope)
+        self.connections.add(session.peer)
+        return "250 Message accepted for delivery"
+
+
+class FakeSMTPTestCase(TestCase):
+    """Points Django's SMTP backend at a fresh local server per test"""
+    smtp_delay = 0
+    smtp_refuse = ()
+
+    def setUp(self):
+        self.handler = RecordingHandler(self.smtp_delay, self.smtp_refuse)
+        self.smtp = Controller(self.handler, hostname="127.0.0.1",
+                               port=free_port())
+        self.smtp.start()
+        self.addCleanup(self.smtp.stop)
+        self.media_root = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.media_root)
+        smtp_settings = override_settings(
+            EMAIL_BACKEND="django.core.mail.backends.smtp.EmailBackend",
+            EMAIL_HOST="127.0.0.1", EMAIL_PORT=self.smtp.port,
+            EMAIL_HOST_USER="", EMAIL_HOST_PASSWORD="",
+            EMAIL_USE_TLS=False, EMAIL_TIMEOUT=10,
+            MEDIA_ROOT=self.media_root
+        )
+        smtp_settings.enable()
+        self.addCleanup(smtp_settings.disable)
+        # Pooled connections must not outlive the server
+        self.addCleanup(close_transport)
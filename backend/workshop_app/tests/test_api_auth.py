@@ -0,0 +1,84 @@
+from datetime import date
+
+from django.contrib.auth.models import Group, User
+from django.core.cache import cache
+from django.test import TestCase
+from rest_framework_simplejwt.tokens import AccessToken, RefreshToken
+
+from workshop_app.models import Profile, Workshop, WorkshopType
+
+
+class TestClaimsAuthentication(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.addCleanup(cache.clear)
+        self.instructors = Group.objects.create(name="instructor")
+        self.user = User.objects.create_user(
+            "instructor", "i@example.com", "pass@123", first_name="Ada"
+        )
+        self.user.groups.add(self.instructors)
+        Profile.objects.create(
+            user=self.user, institute="IIT", department="electronics",
+            phone_number="1122993388", position="instructor"
+        )
+        self.workshop = Workshop.objects.create(
+            coordinator=self.user, workshop_type=WorkshopType.objects.create(
+                name="Python", description="", duration=1,
+                terms_and_conditions=""
+            ), date=date(2030, 1, 1), status=0, tnc_accepted=True
+        )
+        self.tokens = self.client.post("/api/token/", {
+            "username": "instructor", "password": "pass@123"
+        }).json()
+        cache.clear()
+
+    def auth(self, access=None):
+        return {"HTTP_AUTHORIZATION":
+                f"Bearer {access or self.tokens['access']}"}
+
+    def test_token_carries_roles(self):
+        access = AccessToken(self.tokens["access"])
+        self.assertEqual(access["groups"], ["instructor"])
+        self.assertEqual(access["first_name"], "Ada")
+
+    def test_reads_make_no_auth_queries(self):
+        # Only the workshop list itself
+        with self.assertNumQueries(1):
+            response = self.client.get("/api/my-workshops/", **self.auth())
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual([w["id"] for w in response.json()],
+                         [self.workshop.id])
+
+    def test_writes_load_the_user(self):
+        response = self.client.post(
+            f"/api/workshops/{self.workshop.id}/accept/", **self.auth()
+        )
+        self.assertEqual(response.status_code, 200)
+        self.workshop.refresh_from_db()
+        self.assertEqual(self.workshop.instructor, self.user)
+
+    def test_tokens_without_roles_fall_back_to_the_database(self):
+        access = RefreshToken.for_user(self.user).access_token
+        self.assertNotIn("groups", access)
+        with self.assertNumQueries(2):
+            response = self.client.get("/api/my-workshops/",
+                                       **self.auth(str(access)))
+        self.assertEqual(response.status_code, 200)
+
+    def test_refresh_rereads_roles(self):
+        self.user.groups.remove(self.instructors)
+        response = self.client.post("/api/token/refresh/",
+                                    {"refresh": self.tokens["refresh"]})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(AccessToken(response.json()["access"])["groups"], [])
+
+    def test_refresh_rejects_inactive_and_deleted_users(self):
+        self.user.is_active = False
+        self.user.save()
+        response = self.client.post("/api/token/refresh/",
+                                    {"refresh": self.tokens["refresh"]})
+        self.assertEqual(response.status_code, 401)
+        self.user.delete()
+        response = self.client.post("/api/token/refresh/",
+                                    {"refresh": self.tokens["refresh"]})
+        self.assertEqual(response.status_code, 401)
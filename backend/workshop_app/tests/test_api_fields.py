@@ -0,0 +1,82 @@
+from datetime import date
+
+from django.contrib.auth.models import User
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+
+from workshop_app.models import Profile, Workshop, WorkshopType
+
+
+class TestSparseFieldsets(TestCase):
+    def setUp(self):
+        self.coordinator = User.objects.create(
+            username="coordinator", first_name="Ada", email="ada@example.com"
+        )
+        Profile.objects.create(
+            user=self.coordinator, institute="IIT", department="electronics",
+            phone_number="1122993388"
+        )
+        self.python = WorkshopType.objects.create(
+            name="Python", description="x" * 500, duration=1,
+            terms_and_conditions="y" * 500
+        )
+        for day in range(1, 6):
+            Workshop.objects.create(
+                coordinator=self.coordinator, workshop_type=self.python,
+                date=date(2020, 1, day), status=1, tnc_accepted=True
+            )
+
+    def get(self, url):
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(url)
+        self.assertEqual(response.status_code, 200)
+        return response, [q["sql"] for q in queries]
+
+    def test_fields(self):
+        response, queries = self.get("/api/workshops/?fields=id,status")
+        self.assertEqual(
+            response.data["results"][0], {"id": 5, "status": 1}
+        )
+        # No joins for the relations that were not asked for
+        self.assertEqual(len(queries), 1)
+        self.assertNotIn("JOIN", queries[0])
+
+    def test_omit(self):
+        response, queries = self.get(
+            "/api/workshop-types/?omit=description,terms_and_conditions"
+        )
+        self.assertEqual(
+            response.data, [{"id": self.python.id, "name": "Python",
+                             "duration": 1}]
+        )
+        self.assertNotIn("terms_and_conditions", queries[0])
+
+    def test_fields_on_nested_relation(self):
+        response, queries = self.get("/api/profiles/?fields=institute,user")
+        profile = response.data["results"][0]
+        self.assertEqual(set(profile), {"institute", "user"})
+        self.assertEqual(profile["user"]["email"], "ada@example.com")
+        self.assertNotIn('"phone_number"', " ".join(queries))
+
+    def test_expanded_detail_fields(self):
+        response, queries = self.get(
+            "/api/workshops/?expand=full&fields=date,workshop_type"
+        )
+        self.assertEqual(
+            set(response.data["results"][0]), {"date", "workshop_type"}
+        )
+        self.assertEqual(len(queries), 1)
+
+    def test_unknown_fields_are_ignored(self):
+        response, _ = self.get("/api/workshops/?fields=id,nope")
+        self.assertEqual(response.data["results"][0], {"id": 5})
+
+    def test_writes_ignore_fields(self):
+        User.objects.create_user(username="writer", password="pass@123")
+        self.client.login(username="writer", password="pass@123")
+        response = self.client.patch(
+            f"/api/workshop-types/{self.python.id}/?fields=id",
+            {"name": "Python 3"}, content_type="application/json"
+        )
+        self.assertEqual(response.data["name"], "Python 3")
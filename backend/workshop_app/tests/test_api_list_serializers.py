@@ -0,0 +1,75 @@
+import json
+from datetime import date
+
+from django.contrib.auth.models import User
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+
+from workshop_app.models import Workshop, WorkshopType
+
+
+class TestWorkshopListSerializer(TestCase):
+    def setUp(self):
+        self.coordinator = User.objects.create_user(
+            username="coordinator", password="pass@123", first_name="Ada",
+            last_name="Lovelace", email="ada@example.com"
+        )
+        self.python = WorkshopType.objects.create(
+            name="Python", description="x" * 2000, duration=2,
+            terms_and_conditions="y" * 2000
+        )
+        for day in range(1, 11):
+            Workshop.objects.create(
+                coordinator=self.coordinator, workshop_type=self.python,
+                date=date(2020, 1, day), status=1, tnc_accepted=True
+            )
+
+    def test_list_is_compact(self):
+        response = self.client.get("/api/workshops/")
+        workshop = response.data["results"][0]
+        self.assertEqual(workshop["coordinator"], {
+            "id": self.coordinator.id, "first_name": "Ada",
+            "last_name": "Lovelace"
+        })
+        self.assertEqual(workshop["workshop_type"], {
+            "id": self.python.id, "name": "Python", "duration": 2
+        })
+        self.assertIsNone(workshop["instructor"])
+        self.assertEqual(workshop["date"], "2020-01-10")
+
+    def test_expand_and_retrieve_are_full(self):
+        compact = self.client.get("/api/workshops/")
+        expanded = self.client.get("/api/workshops/?expand=full")
+        self.assertIn(
+            "terms_and_conditions",
+            expanded.data["results"][0]["workshop_type"]
+        )
+        self.assertGreater(
+            len(json.dumps(expanded.data)), 10 * len(json.dumps(compact.data))
+        )
+
+        workshop_id = compact.data["results"][0]["id"]
+        detail = self.client.get(f"/api/workshops/{workshop_id}/")
+        self.assertEqual(detail.data["coordinator"]["email"], "ada@example.com")
+        self.assertIn("description", detail.data["workshop_type"])
+
+    def test_list_does_not_load_text_blobs(self):
+        with CaptureQueriesContext(connection) as queries:
+            self.client.get("/api/workshops/")
+        self.assertEqual(len(queries), 1)
+        self.assertNotIn("terms_and_conditions", queries[0]["sql"])
+
+    def test_my_workshops_and_public_stats(self):
+        self.client.login(username="coordinator", password="pass@123")
+        response = self.client.get("/api/my-workshops/")
+        self.assertNotIn("description", response.data[0]["workshop_type"])
+        response = self.client.get("/api/my-workshops/?expand=1")
+        self.assertIn("description", response.data[0]["workshop_type"])
+
+        response = self.client.get(
+            "/api/public-workshop-stats/?from_date=2020-01-01"
+            "&to_date=2020-01-31"
+        )
+        self.assertEqual(len(response.data["workshops"]), 10)
+        self.assertNotIn("email", response.data["workshops"][0]["coordinator"])
@@ -0,0 +1,76 @@
+from datetime import date, timedelta
+
+from django.contrib.auth.models import User
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+
+from cms.models import Nav
+from workshop_app.models import Workshop, WorkshopType
+
+
+class TestApiPagination(TestCase):
+    def setUp(self):
+        self.coordinator = User.objects.create(username="coordinator")
+        self.python = WorkshopType.objects.create(
+            name="Python", description="", duration=1, terms_and_conditions=""
+        )
+        # Two workshops a day, which a coordinator can only propose for
+        # different workshop types
+        types = [self.python, WorkshopType.objects.create(
+            name="Scilab", description="", duration=1, terms_and_conditions=""
+        )]
+        start = date(2020, 1, 1)
+        Workshop.objects.bulk_create(
+            Workshop(coordinator=self.coordinator, workshop_type=types[i % 2],
+                     date=start + timedelta(days=i // 2), tnc_accepted=True)
+            for i in range(25)
+        )
+
+    def test_workshops_cursor_pages(self):
+        seen = []
+        url = "/api/workshops/?page_size=4"
+        while url:
+            with CaptureQueriesContext(connection) as queries:
+                response = self.client.get(url)
+            self.assertEqual(response.status_code, 200)
+            self.assertNotIn("count", response.data)
+            # Keyset pages seek to the cursor, they never count the table
+            sql = " ".join(q["sql"] for q in queries).upper()
+            self.assertNotIn("COUNT(", sql)
+            seen.extend((w["date"], w["id"]) for w in response.data["results"])
+            url = response.data["next"]
+
+        self.assertEqual(len(seen), 25)
+        self.assertEqual(seen, sorted(seen, reverse=True))
+
+    def test_page_size_is_capped(self):
+        response = self.client.get("/api/workshops/?page_size=100000")
+        self.assertEqual(len(response.data["results"]), 25)
+        response = self.client.get("/api/users/?page_size=1")
+        self.assertEqual(response.data["count"], 1)
+        self.assertEqual(len(response.data["results"]), 1)
+
+    def test_reference_tables_are_not_paginated(self):
+        Nav.objects.create(name="Home", link="/", position=1)
+        self.assertEqual(len(self.client.get("/api/navs/").data), 1)
+        response = self.client.get("/api/workshop-types/")
+        self.assertEqual(response.data[0]["name"], "Python")
+
+    def test_instructor_dashboard_pages(self):
+        instructor = User.objects.create(username="instructor")
+        ids = list(Workshop.objects.order_by("id")
+                   .values_list("id", flat=True))
+        Workshop.objects.filter(id__in=ids[:5]).update(
+            status=1, instructor=instructor
+        )
+        Workshop.objects.filter(id__in=ids[5:10]).update(status=1)
+        self.client.force_login(instructor)
+        seen = []
+        url = "/api/workshops/?dashboard=instructor&page_size=4"
+        while url:
+            response = self.client.get(url)
+            self.assertLessEqual(len(response.data["results"]), 4)
+            seen.extend(w["id"] for w in response.data["results"])
+            url = response.data["next"]
+        self.assertEqual(sorted(seen), ids[:5] + ids[10:])
@@ -0,0 +1,109 @@
+from datetime import date
+from itertools import count
+
+from django.contrib.auth.models import Group, User
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+
+from cms.models import Nav, SubNav
+from teams.models import Team
+from workshop_app.models import Comment, Profile, Workshop, WorkshopType
+
+
+class ConstantQueriesMixin:
+    """Fails when the number of queries behind a list endpoint grows with
+    the number of rows it returns.
+    """
+
+    def count_queries(self, url):
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(url)
+        self.assertEqual(response.status_code, 200, url)
+        return len(queries)
+
+    def assertConstantQueries(self, url, make_row, rows=(2, 8)):
+        counts = []
+        created = 0
+        for total in rows:
+            for _ in range(total - created):
+                make_row()
+            created = total
+            counts.append(self.count_queries(url))
+        self.assertEqual(
+            len(set(counts)), 1,
+            f"{url} ran {counts} queries for {list(rows)} rows"
+        )
+
+
+class TestListEndpointQueries(ConstantQueriesMixin, TestCase):
+    def setUp(self):
+        self.ids = count()
+        self.groups = [Group.objects.create(name="instructor"),
+                       Group.objects.create(name="coordinator")]
+        self.python = WorkshopType.objects.create(
+            name="Python", description="", duration=1, terms_and_conditions=""
+        )
+
+    def make_user(self):
+        user = User.objects.create(username=f"user{next(self.ids)}")
+        user.groups.set(self.groups)
+        return user
+
+    def make_profile(self):
+        return Profile.objects.create(
+            user=self.make_user(), institute="IIT", department="electronics",
+            phone_number="1122993388"
+        )
+
+    def make_workshop(self):
+        return Workshop.objects.create(
+            coordinator=self.make_user(), instructor=self.make_user(),
+            workshop_type=self.python, date=date(2020, 1, 1), status=1,
+            tnc_accepted=True
+        )
+
+    def make_comment(self):
+        return Comment.objects.create(
+            author=self.make_user(), comment="Nice",
+            workshop=self.make_workshop()
+        )
+
+    def make_subnav(self):
+        nav = Nav.objects.create(name="Nav", link="/", position=1)
+        return SubNav.objects.create(nav=nav, name="Sub", link="/", position=1)
+
+    def make_team(self):
+        team = Team.objects.create(creator=self.make_user())
+        team.members.add(self.make_profile(), self.make_profile())
+        return team
+
+    def test_users(self):
+        self.assertConstantQueries("/api/users/", self.make_user)
+
+    def test_profiles(self):
+        self.assertConstantQueries("/api/profiles/", self.make_profile)
+
+    def test_workshops(self):
+        self.assertConstantQueries("/api/workshops/", self.make_workshop)
+
+    def test_comments(self):
+        self.assertConstantQueries("/api/comments/", self.make_comment)
+
+    def test_subnavs(self):
+        self.assertConstantQueries("/api/subnavs/", self.make_subnav)
+
+    def test_teams(self):
+        self.assertConstantQueries("/api/teams/", self.make_team)
+
+    def test_public_workshop_stats(self):
+        def make_row():
+            workshop = self.make_workshop()
+            Profile.objects.create(
+                user=workshop.coordinator, institute="IIT",
+                department="electronics", phone_number="1122993388"
+            )
+        self.assertConstantQueries(
+            "/api/public-workshop-stats/?from_date=2020-01-01"
+            "&to_date=2020-01-31", make_row
+        )
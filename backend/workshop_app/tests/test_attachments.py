@@ -0,0 +1,94 @@
+import os
+import shutil
+import tempfile
+from email import message_from_bytes
+from unittest import mock
+
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.test import TestCase, override_settings
+
+from workshop_app import attachments
+from workshop_app.models import AttachmentFile, QueuedEmail, WorkshopType
+from workshop_app.outbox import build_message
+
+
+class TestAttachmentCache(TestCase):
+    def setUp(self):
+        self.media_root = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.media_root)
+        media = override_settings(MEDIA_ROOT=self.media_root)
+        media.enable()
+        self.addCleanup(media.disable)
+        attachments.invalidate()
+        self.addCleanup(attachments.invalidate)
+
+        self.python = WorkshopType.objects.create(
+            name="Python Basics", description="", duration=1,
+            terms_and_conditions=""
+        )
+        self.pdf = bytes(range(256)) * 4096
+        self.upload("schedule.pdf", self.pdf)
+        self.upload("notes.txt", b"Bring a laptop")
+
+    def upload(self, name, content):
+        return AttachmentFile.objects.create(
+            workshop_type=self.python,
+            attachments=SimpleUploadedFile(name, content)
+        )
+
+    def queue(self, to):
+        return QueuedEmail.objects.create(
+            subject="Confirmed", body="Body", from_email="from@example.com",
+            to=to, attachment_dir="Python_Basics"
+        )
+
+    def attached_files(self, email):
+        message = message_from_bytes(build_message(email).message().as_bytes())
+        return {
+            part.get_filename(): part.get_payload(decode=True)
+            for part in message.walk() if part.get_filename()
+        }
+
+    def test_files_are_encoded_once_for_all_recipients(self):
+        with mock.patch.object(attachments, "_encode",
+                               wraps=attachments._encode) as encode:
+            first = self.attached_files(self.queue("a@example.com"))
+            second = self.attached_files(self.queue("b@example.com"))
+        self.assertEqual(encode.call_count, 2)
+        self.assertEqual(first, second)
+        self.assertEqual(first["schedule.pdf"], self.pdf)
+        self.assertEqual(first["notes.txt"], b"Bring a laptop")
+
+    def test_attachment_changes_invalidate_the_cache(self):
+        email = self.queue("a@example.com")
+        self.assertEqual(len(self.attached_files(email)), 2)
+
+        extra = self.upload("slides.pdf", b"%PDF-1.4")
+        self.assertIn("slides.pdf", self.attached_files(email))
+
+        extra.attachments.delete(save=False)
+        extra.delete()
+        self.assertNotIn("slides.pdf", self.attached_files(email))
+
+    def test_files_changed_by_another_process_are_picked_up(self):
+        email = self.queue("a@example.com")
+        self.attached_files(email)
+        path = os.path.join(self.media_root, "Python_Basics", "notes.txt")
+        with open(path, "wb") as f:
+            f.write(b"Bring a laptop and a charger")
+        self.assertEqual(self.attached_files(email)["notes.txt"],
+                         b"Bring a laptop and a charger")
+
+    def test_missing_folder_has_no_attachments(self):
+        self.assertEqual(attachments.get_attachment_parts("Unknown"), [])
+
+    def test_only_recent_directories_are_kept(self):
+        names = [f"Type_{i}" for i in range(6)]
+        for name in names:
+            folder = os.path.join(self.media_root, name)
+            os.mkdir(folder)
+            with open(os.path.join(folder, "notes.txt"), "wb") as f:
+                f.write(b"Bring a laptop")
+            attachments.get_attachment_parts(name)
+        self.assertEqual(list(attachments._parts),
+                         names[-attachments.MAX_CACHED_DIRECTORIES:])
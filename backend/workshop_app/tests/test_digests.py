@@ -0,0 +1,107 @@
+from datetime import timedelta
+from io import StringIO
+
+from django.contrib.auth.models import User
+from django.core import mail
+from django.core.management import call_command
+from django.test import TestCase, override_settings
+from django.utils import timezone
+
+from workshop_app.digests import release_digests
+from workshop_app.models import Profile, QueuedEmail
+from workshop_app.outbox import queue_email, queue_mass_email
+
+
+@override_settings(EMAIL_BACKEND="django.core.mail.backends.locmem.EmailBackend",
+                   EMAIL_TRANSPORT="workshop_app.transport.Transport")
+class TestEmailDigests(TestCase):
+    def setUp(self):
+        self.daily = self.create_user("daily", digest_interval=24)
+        self.hourly = self.create_user("hourly", digest_interval=1)
+        self.immediate = self.create_user("immediate", digest_interval=0)
+
+    def create_user(self, username, digest_interval):
+        user = User.objects.create(username=username,
+                                   email=f"{username}@example.com")
+        Profile.objects.create(
+            user=user, institute="IIT", department="electronics",
+            phone_number="1122993388", position="instructor",
+            digest_interval=digest_interval
+        )
+        return user
+
+    def propose(self, count):
+        for i in range(count):
+            queue_mass_email(
+                f"Proposed Workshop on 2030-01-{i + 1:02d}", f"Proposal {i}",
+                ["daily@example.com", "hourly@example.com",
+                 "immediate@example.com"],
+                digest=True
+            )
+
+    def statuses(self, user):
+        return list(QueuedEmail.objects.filter(to=user.email).values_list(
+            "status", flat=True).distinct())
+
+    def test_only_digest_subscribers_are_held(self):
+        self.propose(3)
+        self.assertEqual(self.statuses(self.daily), [QueuedEmail.HELD])
+        self.assertEqual(self.statuses(self.immediate), [QueuedEmail.PENDING])
+
+    def test_non_digest_emails_are_never_held(self):
+        queue_email("Booking confirmed", "Body", ["daily@example.com"])
+        self.assertEqual(self.statuses(self.daily), [QueuedEmail.PENDING])
+
+    def test_notifications_are_merged_once_the_window_passes(self):
+        self.propose(30)
+        now = timezone.now()
+        self.assertEqual(release_digests(now), (0, 0))
+
+        self.assertEqual(release_digests(now + timedelta(hours=2)), (1, 30))
+        self.assertEqual(self.statuses(self.daily), [QueuedEmail.HELD])
+
+        self.assertEqual(release_digests(now + timedelta(hours=25)), (1, 30))
+        digest = QueuedEmail.objects.get(to="daily@example.com",
+                                         status=QueuedEmail.PENDING)
+        self.assertEqual(digest.subject,
+                         "FOSSEE workshop updates: 30 notifications")
+        self.assertIn("== Proposed Workshop on 2030-01-30 ==", digest.body)
+        self.assertIn("Proposal 0\n", digest.body)
+        self.assertEqual(
+            QueuedEmail.objects.filter(to="daily@example.com",
+                                       status=QueuedEmail.DIGESTED).count(),
+            30
+        )
+
+    def test_single_notification_is_released_unchanged(self):
+        queue_email("Date changed", "Body", ["hourly@example.com"],
+                    digest=True)
+        release_digests(timezone.now() + timedelta(hours=2))
+        email = QueuedEmail.objects.get()
+        self.assertEqual(
+            (email.subject, email.status), ("Date changed", QueuedEmail.PENDING)
+        )
+
+    def test_turning_digests_off_releases_held_notifications(self):
+        self.propose(2)
+        Profile.objects.filter(user=self.daily).update(digest_interval=0)
+        self.assertEqual(release_digests(), (0, 0))
+        self.assertEqual(
+            QueuedEmail.objects.filter(to="daily@example.com",
+                                       status=QueuedEmail.PENDING).count(),
+            2
+        )
+
+    def test_worker_sends_due_digests(self):
+        self.propose(10)
+        QueuedEmail.objects.update(
+            created_date=timezone.now() - timedelta(days=2)
+        )
+        call_command("send_queued_mail", "--once", stdout=StringIO())
+        # 10 immediate emails plus one digest for each subscriber
+        self.assertEqual(len(mail.outbox), 12)
+        self.assertEqual(
+            sorted(m.to[0] for m in mail.outbox
+                   if m.subject.startswith("FOSSEE workshop updates")),
+            ["daily@example.com", "hourly@example.com"]
+        )
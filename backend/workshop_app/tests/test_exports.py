@@ -0,0 +1,99 @@
+import csv
+import gzip
+import json
+from datetime import date
+
+from django.contrib.auth.models import User
+from django.test import TestCase
+
+from workshop_app.exports import Column, export_rows, iter_csv
+from workshop_app.models import Profile, Testimonial, Workshop, WorkshopType
+
+
+class TestStreamingExports(TestCase):
+    def setUp(self):
+        self.admin = User.objects.create_superuser(
+            username="admin", password="pass@123", email="admin@example.com"
+        )
+        self.client.login(username="admin", password="pass@123")
+        self.coordinator = User.objects.create(
+            username="coordinator", first_name="Ada", last_name="Lovelace",
+            email="ada@example.com"
+        )
+        self.profile = Profile.objects.create(
+            user=self.coordinator, title="Doctor", institute="IIT",
+            department="electronics", phone_number="1122993388",
+            location="Mumbai"
+        )
+        python = WorkshopType.objects.create(
+            name="Python", description="", duration=2, terms_and_conditions=""
+        )
+        self.workshop = Workshop.objects.create(
+            coordinator=self.coordinator, workshop_type=python,
+            date=date(2020, 3, 4), status=1, tnc_accepted=True
+        )
+
+    def run_action(self, model, action, ids):
+        response = self.client.post(
+            f"/admin/workshop_app/{model}/",
+            {"action": action, "_selected_action": ids}
+        )
+        self.assertTrue(response.streaming)
+        return response, b"".join(response.streaming_content)
+
+    def test_profile_csv(self):
+        response, content = self.run_action(
+            "profile", "download_csv", [self.profile.id]
+        )
+        self.assertEqual(
+            response["Content-Disposition"], "attachment; filename=profile.csv"
+        )
+        self.assertEqual(list(csv.reader(content.decode().splitlines())), [
+            ["title", "user__first_name", "user__last_name", "user__email",
+             "institute", "location", "department", "phone_number"],
+            ["Doctor", "Ada", "Lovelace", "ada@example.com", "IIT", "Mumbai",
+             "electronics", "1122993388"],
+        ])
+
+    def test_workshop_csv_gzip(self):
+        response, content = self.run_action(
+            "workshop", "download_csv_gzip", [self.workshop.id]
+        )
+        self.assertEqual(response["Content-Type"], "application/gzip")
+        self.assertEqual(
+            response["Content-Disposition"],
+            "attachment; filename=workshops.csv.gz"
+        )
+        rows = list(csv.reader(gzip.decompress(content).decode().splitlines()))
+        self.assertEqual(
+            rows[1], ["Python", "2020-03-04", "Ada", "Lovelace", "", "",
+                      "Success"]
+        )
+
+    def test_testimonial_ndjson(self):
+        testimonial = Testimonial.objects.create(
+            name="Grace", institute="IIT", department="cs", message="Great"
+        )
+        _, content = self.run_action(
+            "testimonial", "download_ndjson", [testimonial.id]
+        )
+        self.assertEqual(
+            [json.loads(line) for line in content.decode().splitlines()],
+            [{"name": "Grace", "department": "cs", "institute": "IIT"}]
+        )
+
+    def test_export_rows_reads_in_chunks(self):
+        for day in range(2, 6):
+            Workshop.objects.create(
+                coordinator=self.admin,
+                workshop_type=self.workshop.workshop_type,
+                date=date(2020, 3, day), status=0, tnc_accepted=True
+            )
+        columns = [Column("date"), Column("status", format=str)]
+        rows = export_rows(
+            Workshop.objects.order_by("date"), columns, chunk_size=2
+        )
+        chunks = list(iter_csv([c.header for c in columns], rows,
+                               chunk_size=1))
+        self.assertEqual(len(chunks), 6)
+        self.assertEqual(chunks[1], "2020-03-02,0\r\n")
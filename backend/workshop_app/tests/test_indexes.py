@@ -0,0 +1,183 @@
+from datetime import date, timedelta
+from unittest import skipUnless
+
+from django.contrib.auth.models import Group, User
+from django.contrib.messages import get_messages
+from django.db import IntegrityError, connection, transaction
+from django.db.models import Q
+from django.db.migrations.executor import MigrationExecutor
+from django.test import TestCase, TransactionTestCase
+
+from workshop_app.models import Workshop, WorkshopType
+
+# SQLite builds unique constraints into the table as automatic indexes
+UNIQUE_PROPOSAL_INDEX = {
+    "postgresql": "unique_workshop_proposal",
+    "sqlite": "sqlite_autoindex_workshop_app_workshop",
+}
+
+
+@skipUnless(connection.vendor in ("sqlite", "postgresql"),
+            "EXPLAIN output is checked for SQLite and PostgreSQL")
+class TestWorkshopIndexes(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.python = WorkshopType.objects.create(
+            name="Python", description="", duration=1, terms_and_conditions=""
+        )
+        cls.users = [User.objects.create(username=f"user{i}")
+                     for i in range(5)]
+        start = date(2030, 1, 1)
+        Workshop.objects.bulk_create(
+            Workshop(coordinator=cls.users[i % 5],
+                     instructor=cls.users[(i + 1) % 5],
+                     workshop_type=cls.python,
+                     date=start + timedelta(days=i), status=i % 3,
+                     tnc_accepted=True)
+            for i in range(200)
+        )
+        if connection.vendor == "sqlite":
+            with connection.cursor() as cursor:
+                cursor.execute("ANALYZE")
+
+    def plan(self, queryset):
+        if connection.vendor == "postgresql":
+            # A table this small would otherwise always be scanned
+            with connection.cursor() as cursor:
+                cursor.execute("SET LOCAL enable_seqscan = off")
+        return queryset.explain()
+
+    def assertUsesIndex(self, queryset, index):
+        plan = self.plan(queryset)
+        self.assertIn(index, plan)
+        return plan
+
+    def test_status_and_date_range(self):
+        self.assertUsesIndex(
+            Workshop.objects.filter(
+                status=1, date__range=(date(2030, 2, 1), date(2030, 2, 15))
+            ).order_by("date"),
+            "workshop_status_date_idx"
+        )
+
+    def test_instructor_dashboard(self):
+        queryset = Workshop.objects.filter(
+            Q(instructor=self.users[0].id, date__gte=date(2030, 3, 1)) |
+            Q(status=0)
+        ).order_by("-date")
+        plan = self.plan(queryset)
+        self.assertIn("workshop_instructor_date_idx", plan)
+        self.assertIn("workshop_status_date_idx", plan)
+
+    def test_coordinator_workshops_by_date(self):
+        plan = self.assertUsesIndex(
+            Workshop.objects.filter(coordinator=self.users[0].id)
+            .order_by("-date"),
+            UNIQUE_PROPOSAL_INDEX[connection.vendor]
+        )
+        if connection.vendor == "sqlite":
+            self.assertNotIn("TEMP B-TREE", plan)
+
+    def test_duplicate_proposals_are_rejected(self):
+        existing = Workshop.objects.first()
+        self.assertUsesIndex(
+            Workshop.objects.filter(
+                coordinator=existing.coordinator_id, date=existing.date,
+                workshop_type=existing.workshop_type_id
+            ),
+            UNIQUE_PROPOSAL_INDEX[connection.vendor]
+        )
+        with self.assertRaises(IntegrityError), transaction.atomic():
+            Workshop.objects.create(
+                coordinator_id=existing.coordinator_id, date=existing.date,
+                workshop_type_id=existing.workshop_type_id, tnc_accepted=True
+            )
+
+    def test_api_reports_duplicate_proposals(self):
+        existing = Workshop.objects.first()
+        self.client.force_login(existing.coordinator)
+        response = self.client.post("/api/workshops/", {
+            "workshop_type_id": existing.workshop_type_id,
+            "date": existing.date.isoformat(), "tnc_accepted": True
+        }, content_type="application/json")
+        self.assertEqual(response.status_code, 400)
+
+
+class TestDateChangeConflicts(TestCase):
+    def setUp(self):
+        python = WorkshopType.objects.create(
+            name="Python", description="", duration=1, terms_and_conditions=""
+        )
+        coordinator = User.objects.create(username="coordinator")
+        Workshop.objects.create(coordinator=coordinator, workshop_type=python,
+                                date=date(2030, 1, 1), tnc_accepted=True)
+        self.workshop = Workshop.objects.create(
+            coordinator=coordinator, workshop_type=python,
+            date=date(2030, 1, 2), tnc_accepted=True
+        )
+        instructor = User.objects.create(username="instructor")
+        instructor.groups.add(Group.objects.create(name="instructor"))
+        self.client.force_login(instructor)
+
+    def assertDateUnchanged(self):
+        self.workshop.refresh_from_db()
+        self.assertEqual(self.workshop.date, date(2030, 1, 2))
+
+    def test_view_reports_the_conflict(self):
+        response = self.client.post(
+            f"/workshop/change_workshop_date/{self.workshop.id}",
+            {"new_date": "2030-01-01"}
+        )
+        self.assertRedirects(response, "/workshop/dashboard",
+                             fetch_redirect_response=False)
+        self.assertEqual(
+            [m.level_tag for m in get_messages(response.wsgi_request)],
+            ["error"]
+        )
+        self.assertDateUnchanged()
+
+    def test_api_reports_the_conflict(self):
+        response = self.client.post(
+            f"/api/workshops/{self.workshop.id}/change-date/",
+            {"date": "2030-01-01"}, content_type="application/json"
+        )
+        self.assertEqual(response.status_code, 400)
+        self.assertDateUnchanged()
+
+
+class TestRemoveDuplicateProposals(TransactionTestCase):
+    before = [("workshop_app", "0021_email_digests")]
+    after = [("workshop_app", "0022_remove_duplicate_workshops")]
+
+    def migrate(self, targets=None):
+        executor = MigrationExecutor(connection)
+        targets = targets or executor.loader.graph.leaf_nodes()
+        executor.migrate(targets)
+        executor.loader.build_graph()
+        return executor.loader.project_state(targets).apps
+
+    def tearDown(self):
+        self.migrate()
+
+    def test_accepted_proposal_survives(self):
+        apps = self.migrate(self.before)
+        Workshop = apps.get_model("workshop_app", "Workshop")
+        User = apps.get_model("auth", "User")
+        WorkshopType = apps.get_model("workshop_app", "WorkshopType")
+        coordinator = User.objects.create(username="coordinator")
+        instructor = User.objects.create(username="instructor")
+        python = WorkshopType.objects.create(
+            name="Python", description="", duration=1, terms_and_conditions=""
+        )
+        proposal = dict(coordinator=coordinator, workshop_type=python,
+                        date=date(2030, 1, 1), tnc_accepted=True)
+        Workshop.objects.create(status=2, **proposal)
+        Workshop.objects.create(status=0, **proposal)
+        accepted = Workshop.objects.create(status=1, instructor=instructor,
+                                           **proposal)
+        Workshop.objects.create(status=1, **proposal)
+
+        apps = self.migrate(self.after)
+        Workshop = apps.get_model("workshop_app", "Workshop")
+        self.assertEqual(list(Workshop.objects.values_list("id", flat=True)),
+                         [accepted.id])
@@ -0,0 +1,59 @@
+from datetime import date
+
+from django.contrib.auth.models import User
+from django.test import TestCase
+
+from workshop_app.models import Profile, Workshop, WorkshopType
+
+
+class TestWorkshopManagerStats(TestCase):
+    def setUp(self):
+        self.python = WorkshopType.objects.create(
+            name="Python", description="", duration=1, terms_and_conditions=""
+        )
+        self.scilab = WorkshopType.objects.create(
+            name="Scilab", description="", duration=1, terms_and_conditions=""
+        )
+        for username, state in (("mh", "IN-MH"), ("ka", "IN-KA")):
+            user = User.objects.create(username=username)
+            Profile.objects.create(
+                user=user, institute="IIT", department="electronics",
+                phone_number="1122993388", state=state
+            )
+        mh, ka = User.objects.get(username="mh"), User.objects.get(username="ka")
+        for day, (coordinator, ws_type) in enumerate(
+                ((mh, self.python), (mh, self.python), (mh, self.scilab),
+                 (ka, self.scilab), (ka, self.scilab)), start=1):
+            Workshop.objects.create(
+                coordinator=coordinator, workshop_type=ws_type,
+                date=date(2020, 1, day), status=1, tnc_accepted=True
+            )
+
+    def test_workshops_by_state(self):
+        workshops = Workshop.objects.order_by("-date")
+        self.assertEqual(
+            Workshop.objects.get_workshops_by_state(workshops),
+            (["Maharashtra", "Karnataka"], [3, 2])
+        )
+
+    def test_workshops_by_type(self):
+        workshops = Workshop.objects.order_by("date")
+        self.assertEqual(
+            Workshop.objects.get_workshops_by_type(workshops),
+            (["Scilab", "Python"], [3, 2])
+        )
+
+    def test_workshops_by_state_and_type_uses_one_query(self):
+        workshops = Workshop.objects.filter(status=1).order_by("date")
+        with self.assertNumQueries(1):
+            by_state, by_type = \
+                Workshop.objects.get_workshops_by_state_and_type(workshops)
+        self.assertEqual(by_state, (["Maharashtra", "Karnataka"], [3, 2]))
+        self.assertEqual(by_type, (["Scilab", "Python"], [3, 2]))
+
+    def test_empty_queryset(self):
+        workshops = Workshop.objects.filter(status=2)
+        self.assertEqual(
+            Workshop.objects.get_workshops_by_state_and_type(workshops),
+            (([], []), ([], []))
+        )
@@ -0,0 +1,104 @@
+import shutil
+import tempfile
+from datetime import date
+
+from django.contrib.auth.models import Group, User
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.test import TestCase, override_settings
+
+from workshop_app.models import AttachmentFile, Workshop, WorkshopType
+
+
+class TestAttachmentDownload(TestCase):
+    def setUp(self):
+        self.media_root = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.media_root)
+        media = override_settings(MEDIA_ROOT=self.media_root)
+        media.enable()
+        self.addCleanup(media.disable)
+
+        python = WorkshopType.objects.create(
+            name="Python", description="", duration=1, terms_and_conditions=""
+        )
+        self.pdf = bytes(range(256)) * 400
+        self.file = AttachmentFile.objects.create(
+            workshop_type=python,
+            attachments=SimpleUploadedFile("schedule.pdf", self.pdf)
+        )
+        self.url = self.file.attachments.url
+
+        self.coordinator = User.objects.create_user("coordinator")
+        Workshop.objects.create(coordinator=self.coordinator,
+                                workshop_type=python, date=date(2030, 1, 1),
+                                tnc_accepted=True)
+        self.instructor = User.objects.create_user("instructor")
+        self.instructor.groups.add(Group.objects.create(name="instructor"))
+        self.other = User.objects.create_user("other")
+        self.client.force_login(self.coordinator)
+
+    def content(self, response):
+        return b"".join(response.streaming_content)
+
+    def test_full_download(self):
+        response = self.client.get(self.url)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(self.content(response), self.pdf)
+        self.assertEqual(response["Content-Type"], "application/pdf")
+        self.assertEqual(response["Accept-Ranges"], "bytes")
+        self.assertIn("private", response["Cache-Control"])
+        self.assertTrue(response.has_header("ETag"))
+
+    def test_permissions(self):
+        self.client.force_login(self.instructor)
+        self.assertEqual(self.client.get(self.url).status_code, 200)
+        self.client.force_login(self.other)
+        self.assertEqual(self.client.get(self.url).status_code, 403)
+        self.client.logout()
+        self.assertEqual(self.client.get(self.url).status_code, 302)
+        self.client.force_login(self.instructor)
+        self.assertEqual(self.client.get("/data/Python/missing.pdf")
+                         .status_code, 404)
+
+    def test_range_requests(self):
+        response = self.client.get(self.url, HTTP_RANGE="bytes=100-199")
+        self.assertEqual(response.status_code, 206)
+        self.assertEqual(response["Content-Range"],
+                         f"bytes 100-199/{len(self.pdf)}")
+        self.assertEqual(self.content(response), self.pdf[100:200])
+
+        response = self.client.get(self.url, HTTP_RANGE="bytes=-10")
+        self.assertEqual(self.content(response), self.pdf[-10:])
+        response = self.client.get(self.url, HTTP_RANGE="bytes=102000-")
+        self.assertEqual(self.content(response), self.pdf[102000:])
+
+        response = self.client.get(self.url, HTTP_RANGE="bytes=999999-")
+        self.assertEqual(response.status_code, 416)
+        self.assertEqual(response["Content-Range"], f"bytes */{len(self.pdf)}")
+
+        # Several ranges are answered with the whole file
+        response = self.client.get(self.url, HTTP_RANGE="bytes=0-1,5-6")
+        self.assertEqual(response.status_code, 200)
+
+    def test_conditional_requests(self):
+        etag = self.client.get(self.url)["ETag"]
+        response = self.client.get(self.url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 304)
+
+        response = self.client.get(self.url, HTTP_RANGE="bytes=0-9",
+                                   HTTP_IF_RANGE=etag)
+        self.assertEqual(response.status_code, 206)
+        response = self.client.get(self.url, HTTP_RANGE="bytes=0-9",
+                                   HTTP_IF_RANGE='"stale"')
+        self.assertEqual(response.status_code, 200)
+
+    def test_offload_to_the_web_server(self):
+        with override_settings(MEDIA_OFFLOAD="x-accel-redirect"):
+            response = self.client.get(self.url)
+        self.assertEqual(response["X-Accel-Redirect"],
+                         "/protected-media/" + self.file.attachments.name)
+        self.assertEqual(response["Content-Type"], "application/pdf")
+        self.assertEqual(response.content, b"")
+
+        with override_settings(MEDIA_OFFLOAD="x-sendfile"):
+            response = self.client.get(self.url)
+        self.assertEqual(response["X-Sendfile"], self.file.attachments.path)
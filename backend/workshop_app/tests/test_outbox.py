@@ -0,0 +1,233 @@
+import os
+import time
+from datetime import date, timedelta
+from email import message_from_bytes
+from io import StringIO
+
+from django.contrib.auth.models import Group, User
+from django.core.management import call_command
+from django.db import connection
+from django.test import override_settings
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+
+from workshop_app.models import Profile, QueuedEmail, Workshop, WorkshopType
+from workshop_app.outbox import drain, queue_email
+from workshop_app.tests.smtp_stub import FakeSMTPTestCase, free_port
+
+
+class TestViewsOnlyEnqueue(FakeSMTPTestCase):
+    # Each delivery would hold the request for this long if it were inline
+    smtp_delay = 2
+
+    def setUp(self):
+        super().setUp()
+        python = WorkshopType.objects.create(
+            name="Python Basics", description="", duration=1,
+            terms_and_conditions=""
+        )
+        self.instructor = User.objects.create(
+            username="instructor", email="instructor@example.com"
+        )
+        self.instructor.groups.add(Group.objects.create(name="instructor"))
+        Profile.objects.create(
+            user=self.instructor, institute="IIT", department="electronics",
+            phone_number="1122993388", position="instructor"
+        )
+        coordinator = User.objects.create(
+            username="coordinator", email="coordinator@example.com"
+        )
+        Profile.objects.create(
+            user=coordinator, institute="IIT", department="electronics",
+            phone_number="1122993388"
+        )
+        self.workshop = Workshop.objects.create(
+            coordinator=coordinator, workshop_type=python,
+            date=date(2030, 1, 5), tnc_accepted=True
+        )
+        folder = os.path.join(self.media_root, "Python_Basics")
+        os.mkdir(folder)
+        with open(os.path.join(folder, "schedule.txt"), "w") as f:
+            f.write("Day 1: Python")
+        self.client.force_login(self.instructor)
+
+    def test_accept_workshop_does_not_wait_for_smtp(self):
+        start = time.monotonic()
+        response = self.client.get(
+            f"/workshop/accept_workshop/{self.workshop.id}"
+        )
+        elapsed = time.monotonic() - start
+
+        self.assertEqual(response.status_code, 302)
+        self.assertLess(elapsed, self.smtp_delay)
+        self.assertEqual(self.handler.messages, [])
+        queued = QueuedEmail.objects.order_by("id")
+        self.assertEqual(
+            [email.recipients for email in queued],
+            [["instructor@example.com"], ["coordinator@example.com"]]
+        )
+        self.assertTrue(all(e.status == QueuedEmail.PENDING for e in queued))
+
+        self.assertEqual(drain(), (2, 0))
+        self.assertEqual(
+            sorted(m.rcpt_tos[0] for m in self.handler.messages),
+            ["coordinator@example.com", "instructor@example.com"]
+        )
+        message = message_from_bytes(self.handler.messages[0].content)
+        self.assertEqual(
+            [part.get_filename() for part in message.walk()
+             if part.get_filename()],
+            ["schedule.txt"]
+        )
+        self.assertFalse(
+            QueuedEmail.objects.exclude(status=QueuedEmail.SENT).exists()
+        )
+
+
+class TestProposeWorkshopFanOut(FakeSMTPTestCase):
+    def setUp(self):
+        super().setUp()
+        self.python = WorkshopType.objects.create(
+            name="Python", description="", duration=1,
+            terms_and_conditions=""
+        )
+        self.coordinator = User.objects.create(
+            username="coordinator", email="coordinator@example.com"
+        )
+        Profile.objects.create(
+            user=self.coordinator, institute="IIT", department="electronics",
+            phone_number="1122993388"
+        )
+        self.client.force_login(self.coordinator)
+
+    def add_instructors(self, count):
+        start = Profile.objects.filter(position="instructor").count()
+        for i in range(start, start + count):
+            user = User.objects.create(
+                username=f"instructor{i}", email=f"instructor{i}@example.com"
+            )
+            Profile.objects.create(
+                user=user, institute="IIT", department="electronics",
+                phone_number="1122993388", position="instructor"
+            )
+
+    def propose(self, day):
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.post("/workshop/propose/", {
+                "workshop_type": self.python.id,
+                "date": date(2030, 1, day).isoformat(),
+                "tnc_accepted": "on"
+            })
+        self.assertEqual(response.status_code, 302)
+        return len(queries)
+
+    def test_queries_do_not_grow_with_instructors(self):
+        self.add_instructors(2)
+        few = self.propose(1)
+        self.add_instructors(18)
+        many = self.propose(2)
+        self.assertEqual(few, many)
+        self.assertEqual(
+            QueuedEmail.objects.filter(to="instructor19@example.com").count(),
+            1
+        )
+
+    def test_no_instructors(self):
+        self.propose(1)
+        # Instructors without an address are skipped as well
+        user = User.objects.create(username="instructor", email="")
+        Profile.objects.create(
+            user=user, institute="IIT", department="electronics",
+            phone_number="1122993388", position="instructor"
+        )
+        self.propose(2)
+        self.assertEqual(
+            Workshop.objects.filter(coordinator=self.coordinator).count(), 2
+        )
+        self.assertFalse(QueuedEmail.objects.exists())
+
+    @override_settings(EMAIL_OUTBOX_BATCH_SIZE=50, EMAIL_TRANSPORT_WORKERS=1)
+    def test_notifications_share_one_smtp_connection(self):
+        self.add_instructors(20)
+        self.propose(1)
+        self.assertEqual(QueuedEmail.objects.count(), 20)
+        self.assertEqual(drain(), (20, 0))
+        self.assertEqual(len(self.handler.messages), 20)
+        self.assertEqual(len(self.handler.connections), 1)
+        # Nobody sees the other instructors' addresses
+        self.assertEqual(
+            {len(m.rcpt_tos) for m in self.handler.messages}, {1}
+        )
+
+    @override_settings(EMAIL_OUTBOX_BATCH_SIZE=5, EMAIL_TRANSPORT_WORKERS=4,
+                       EMAIL_MAX_CONNECTIONS_PER_HOST=2)
+    def test_connections_are_reused_across_batches(self):
+        self.add_instructors(12)
+        self.propose(1)
+        self.assertEqual(drain(), (12, 0))
+        self.assertLessEqual(len(self.handler.connections), 2)
+
+
+class TestOutboxWorker(FakeSMTPTestCase):
+    def test_worker_sends_pending_emails(self):
+        for i in range(3):
+            queue_email("Hello", "Body", [f"user{i}@example.com"])
+        out = StringIO()
+        call_command("send_queued_mail", "--once", stdout=out)
+        self.assertIn("Sent 3 email(s)", out.getvalue())
+        self.assertEqual(len(self.handler.messages), 3)
+        self.assertEqual(
+            QueuedEmail.objects.filter(status=QueuedEmail.SENT).count(), 3
+        )
+
+    def test_rate_limit_spaces_out_sends(self):
+        for i in range(5):
+            queue_email("Hello", "Body", [f"user{i}@example.com"])
+        start = time.monotonic()
+        self.assertEqual(drain(rate=20), (5, 0))
+        # Five sends at 20/s need at least four 50ms gaps
+        self.assertGreaterEqual(time.monotonic() - start, 0.2)
+
+    def test_emails_not_yet_due_are_left_alone(self):
+        email = queue_email("Hello", "Body", ["user@example.com"])
+        QueuedEmail.objects.filter(id=email.id).update(
+            next_attempt=timezone.now() + timedelta(minutes=5)
+        )
+        self.assertEqual(drain(), (0, 0))
+        self.assertEqual(self.handler.messages, [])
+
+    @override_settings(EMAIL_OUTBOX_RETRY_DELAY=60,
+                       EMAIL_OUTBOX_MAX_ATTEMPTS=3)
+    def test_failures_back_off_and_are_dead_lettered(self):
+        email = queue_email("Hello", "Body", ["user@example.com"])
+        with override_settings(EMAIL_PORT=free_port()), \
+                self.assertLogs("workshop_app", "WARNING"):
+            for attempt in range(1, 4):
+                before = timezone.now()
+                self.assertEqual(drain(), (0, 1))
+                email.refresh_from_db()
+                self.assertEqual(email.attempts, attempt)
+                if attempt < 3:
+                    self.assertEqual(email.status, QueuedEmail.PENDING)
+                    delay = email.next_attempt - before
+                    self.assertGreaterEqual(
+                        delay, timedelta(seconds=60 * 2 ** (attempt - 1))
+                    )
+                    # Not due again until the backoff has passed
+                    self.assertEqual(drain(), (0, 0))
+                    QueuedEmail.objects.filter(id=email.id).update(
+                        next_attempt=timezone.now()
+                    )
+        self.assertEqual(email.status, QueuedEmail.FAILED)
+        self.assertIn("Connection", email.last_error)
+        self.assertEqual(drain(), (0, 0))
+
+    def test_stale_claims_are_retried(self):
+        email = queue_email("Hello", "Body", ["user@example.com"])
+        QueuedEmail.objects.filter(id=email.id).update(
+            status=QueuedEmail.SENDING,
+            next_attempt=timezone.now() - timedelta(seconds=1)
+        )
+        self.assertEqual(drain(), (1, 0))
+        email.refresh_from_db()
+        self.assertEqual(email.status, QueuedEmail.SENT)
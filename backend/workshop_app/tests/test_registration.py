@@ -0,0 +1,52 @@
+import time
+
+from django.contrib.auth.models import User
+from django.test import override_settings
+
+from workshop_app.models import QueuedEmail
+from workshop_app.outbox import drain
+from workshop_app.tests.smtp_stub import FakeSMTPTestCase
+
+
+@override_settings(
+    DEBUG=False,
+    PASSWORD_HASHERS=["django.contrib.auth.hashers.MD5PasswordHasher"]
+)
+class TestRegistrationEmail(FakeSMTPTestCase):
+    # Each delivery would hold the request for this long if it were inline
+    smtp_delay = 2
+    url = "/api/register/"
+
+    def register(self, username):
+        return self.client.post(self.url, {
+            "username": username, "email": f"{username}@example.com",
+            "first_name": "Ada", "last_name": "Lovelace",
+            "password": "pass@123", "password2": "pass@123",
+            "profile_data": {"institute": "IIT", "phone_number": "1122993388"}
+        }, content_type="application/json")
+
+    def test_register_returns_before_the_email_is_sent(self):
+        start = time.monotonic()
+        response = self.register("ada")
+        elapsed = time.monotonic() - start
+
+        self.assertEqual(response.status_code, 201)
+        self.assertLess(elapsed, self.smtp_delay)
+        self.assertEqual(self.handler.messages, [])
+        email = QueuedEmail.objects.get()
+        self.assertEqual(email.recipients, ["ada@example.com"])
+        self.assertEqual(email.subject, "Activate your account.")
+
+        self.assertEqual(drain(), (1, 0))
+        self.assertEqual(self.handler.messages[0].rcpt_tos,
+                         ["ada@example.com"])
+
+    def test_failed_registration_queues_nothing(self):
+        response = self.client.post(self.url, {
+            "username": "ada", "email": "ada@example.com",
+            "first_name": "Ada", "last_name": "Lovelace",
+            "password": "pass@123", "password2": "different"
+        }, content_type="application/json")
+        self.assertEqual(response.status_code, 400)
+        self.assertFalse(QueuedEmail.objects.exists())
+        self.assertFalse(User.objects.exists())
@@ -0,0 +1,103 @@
+from datetime import date, timedelta
+from io import StringIO
+
+from django.contrib.auth.models import User
+from django.core import mail
+from django.core.management import call_command
+from django.test import TestCase, override_settings
+
+from workshop_app.models import QueuedEmail, SentReminder, Workshop, WorkshopType
+from workshop_app.reminders import due_reminders
+
+TODAY = date(2030, 1, 1)
+
+
+@override_settings(WORKSHOP_REMINDER_DAYS=[2],
+                   EMAIL_BACKEND="django.core.mail.backends.locmem.EmailBackend")
+class TestSendReminders(TestCase):
+    def setUp(self):
+        self.python = WorkshopType.objects.create(
+            name="Python", description="", duration=1, terms_and_conditions=""
+        )
+        self.instructor = User.objects.create(
+            username="instructor", first_name="Ian", last_name="Structor",
+            email="instructor@example.com"
+        )
+        self.coordinator = User.objects.create(
+            username="coordinator", first_name="Cora", last_name="Dinator",
+            email="coordinator@example.com"
+        )
+        self.workshop = self.create_workshop(days=2)
+
+    def create_workshop(self, days, status=1, coordinator=None):
+        return Workshop.objects.create(
+            coordinator=coordinator or self.coordinator,
+            instructor=self.instructor,
+            workshop_type=self.python, date=TODAY + timedelta(days=days),
+            status=status, tnc_accepted=True
+        )
+
+    def run_command(self, *args):
+        out = StringIO()
+        call_command("send_reminders", "--today", TODAY.isoformat(), *args,
+                     stdout=out)
+        return out.getvalue()
+
+    def test_queues_one_reminder_per_role(self):
+        self.create_workshop(days=2, status=0,
+                             coordinator=User.objects.create(username="other"))
+        self.create_workshop(days=3)
+        output = self.run_command()
+        self.assertIn("Queued 2 reminder(s) for 1 workshop(s)", output)
+        emails = QueuedEmail.objects.order_by("to")
+        self.assertEqual(
+            [email.to for email in emails],
+            ["coordinator@example.com", "instructor@example.com"]
+        )
+        self.assertIn("Dear Ian Structor,", emails[1].body)
+        self.assertIn("you have a workshop on 2030-01-03,\nfor Python.",
+                      emails[1].body)
+
+    def test_reruns_are_idempotent(self):
+        self.run_command()
+        self.assertIn("Queued 0 reminder(s)", self.run_command())
+        self.assertEqual(QueuedEmail.objects.count(), 2)
+
+    def test_rescheduled_workshop_is_reminded_again(self):
+        self.run_command()
+        self.workshop.date = TODAY + timedelta(days=7)
+        self.workshop.save()
+        self.assertIn("Queued 2 reminder(s)", self.run_command("--days", "7"))
+        self.assertEqual(SentReminder.objects.count(), 4)
+
+    def test_schedule_with_several_lead_times(self):
+        self.create_workshop(days=7)
+        self.run_command("--days", "7", "2")
+        self.assertEqual(
+            sorted(SentReminder.objects.values_list("days_before", flat=True)),
+            [2, 2, 7, 7]
+        )
+
+    def test_dry_run_queues_nothing(self):
+        output = self.run_command("--dry-run")
+        self.assertIn("Would queue 2 reminder(s)", output)
+        self.assertFalse(QueuedEmail.objects.exists())
+        self.assertFalse(SentReminder.objects.exists())
+
+    def test_deliver_drains_the_outbox(self):
+        self.run_command("--deliver")
+        self.assertEqual(len(mail.outbox), 2)
+
+    def test_query_count_does_not_grow_with_workshops(self):
+        for i in range(20):
+            self.create_workshop(
+                days=2, coordinator=User.objects.create(
+                    username=f"user{i}", email=f"user{i}@example.com"
+                )
+            )
+        with self.assertNumQueries(2):
+            reminders = list(due_reminders(TODAY, [2]))
+            names = [r.recipient.get_full_name() for r in reminders]
+            titles = [r.workshop.workshop_type.name for r in reminders]
+        self.assertEqual(len(names), 42)
+        self.assertEqual(set(titles), {"Python"})
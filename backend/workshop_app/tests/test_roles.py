@@ -0,0 +1,76 @@
+from django.contrib.auth.models import AnonymousUser, Group, User
+from django.core.cache import cache
+from django.template import Context, Template
+from django.test import TestCase, override_settings
+
+from workshop_app.roles import get_group_names, is_instructor
+
+
+# As with a shared CACHE_BACKEND
+@override_settings(ROLE_CACHE_TIMEOUT=300)
+class TestRoles(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.addCleanup(cache.clear)
+        self.instructors = Group.objects.create(name="instructor")
+        self.user = User.objects.create_user("instructor", "i@example.com",
+                                             "pass@123")
+        self.user.groups.add(self.instructors)
+
+    def fresh(self):
+        """The user as a new request would load it"""
+        return User.objects.get(pk=self.user.pk)
+
+    def test_groups_are_loaded_once_per_request(self):
+        user = self.fresh()
+        with self.assertNumQueries(1):
+            self.assertTrue(is_instructor(user))
+            self.assertTrue(is_instructor(user))
+            Template(
+                '{% load custom_filters %}'
+                '{% if user|has_group:"instructor" %}yes{% endif %}'
+            ).render(Context({"user": user}))
+
+    def test_groups_are_cached_across_requests(self):
+        is_instructor(self.fresh())
+        user = self.fresh()
+        with self.assertNumQueries(0):
+            self.assertEqual(get_group_names(user), {"instructor"})
+
+    @override_settings(ROLE_CACHE_TIMEOUT=0)
+    def test_cross_request_cache_can_be_disabled(self):
+        is_instructor(self.fresh())
+        user = self.fresh()
+        with self.assertNumQueries(1):
+            is_instructor(user)
+
+    def test_anonymous_users_have_no_groups(self):
+        with self.assertNumQueries(0):
+            self.assertFalse(is_instructor(AnonymousUser()))
+
+    def test_changing_a_users_groups_invalidates(self):
+        self.assertTrue(is_instructor(self.user))
+        self.user.groups.remove(self.instructors)
+        self.assertFalse(is_instructor(self.user))
+        self.assertFalse(is_instructor(self.fresh()))
+        self.user.groups.add(self.instructors)
+        self.assertTrue(is_instructor(self.fresh()))
+        self.user.groups.clear()
+        self.assertFalse(is_instructor(self.fresh()))
+
+    def test_changing_a_groups_members_invalidates(self):
+        self.assertTrue(is_instructor(self.fresh()))
+        self.instructors.user_set.remove(self.user)
+        self.assertFalse(is_instructor(self.fresh()))
+        self.instructors.user_set.add(self.user)
+        self.assertTrue(is_instructor(self.fresh()))
+        self.instructors.user_set.clear()
+        self.assertFalse(is_instructor(self.fresh()))
+
+    def test_renaming_or_deleting_a_group_invalidates(self):
+        self.assertTrue(is_instructor(self.fresh()))
+        self.instructors.name = "trainer"
+        self.instructors.save()
+        self.assertEqual(get_group_names(self.fresh()), {"trainer"})
+        self.instructors.delete()
+        self.assertEqual(get_group_names(self.fresh()), set())
@@ -0,0 +1,72 @@
+import os
+import tempfile
+from types import SimpleNamespace
+from unittest import mock
+
+from django.test import SimpleTestCase, TestCase, override_settings
+
+from workshop_app import send_mails
+from workshop_app.models import QueuedEmail
+from workshop_app.send_mails import (
+    configure_email_logging, email_templates, render_email, send_email
+)
+
+
+class TestEmailTemplates(SimpleTestCase):
+    def test_templates_are_compiled_once(self):
+        first = email_templates.get_template("registration.txt")
+        self.assertIs(email_templates.get_template("registration.txt"), first)
+
+    def test_bodies_are_not_html_escaped(self):
+        body = render_email("booking_confirmed_coordinator", {
+            "instructor_name": "O'Brien & Sons",
+            "instructor_email": "obrien@example.com",
+            "phone_number": "1122993388", "workshop_date": "2030-01-05",
+            "workshop_title": "Python <Basics>",
+        })
+        self.assertIn("Instructor name:O'Brien & Sons\n", body)
+        self.assertIn("Workshop title:Python <Basics>\n", body)
+
+    def test_broken_logging_config_is_reported_not_raised(self):
+        with tempfile.TemporaryDirectory() as folder:
+            with open(os.path.join(folder, "emailconfig.yaml"), "w") as f:
+                f.write("version: 1\nroot: [unclosed\n")
+            with override_settings(LOG_FOLDER=folder), \
+                    self.assertLogs("workshop_app.send_mails", "WARNING"):
+                configure_email_logging()
+
+
+class TestSendEmail(TestCase):
+    def setUp(self):
+        profile = SimpleNamespace(phone_number="1122993388", institute="IIT")
+        user = SimpleNamespace(email="coordinator@example.com",
+                               username="coordinator", profile=profile)
+        self.request = SimpleNamespace(user=user)
+
+    def test_sending_does_not_reload_logging_config(self):
+        with mock.patch.object(send_mails.yaml, "safe_load") as load, \
+                mock.patch.object(send_mails.logging.config,
+                                  "dictConfig") as configure:
+            send_email(self.request, call_on="Registration", key="abc123")
+            send_email(self.request, call_on="Booking",
+                       workshop_date="2030-01-05", workshop_title="Python")
+        load.assert_not_called()
+        configure.assert_not_called()
+
+    def test_registration_body(self):
+        send_email(self.request, call_on="Registration", key="abc123")
+        email = QueuedEmail.objects.get()
+        self.assertEqual(email.recipients, ["coordinator@example.com"])
+        self.assertIn(
+            f"{send_mails.PRODUCTION_URL}/workshop/activate_user/abc123\n",
+            email.body
+        )
+
+    def test_change_date_body(self):
+        send_email(self.request, call_on="Change Date",
+                   workshop_date="2030-01-05",
+                   new_workshop_date="2030-01-09",
+                   other_email="other@example.com")
+        email = QueuedEmail.objects.get()
+        self.assertEqual(email.recipients, ["other@example.com"])
+        self.assertIn("rescheduled from 2030-01-05 to 2030-01-09.", email.body)
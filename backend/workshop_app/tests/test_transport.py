@@ -0,0 +1,120 @@
+import socket
+import time
+
+from django.core.mail import EmailMessage
+from django.test import override_settings
+
+from workshop_app.tests.smtp_stub import FakeSMTPTestCase, free_port
+from workshop_app.transport import (
+    PooledTransport, RateLimiter, Transport, close_transport, get_transport
+)
+
+
+def messages(count, to="user{}@example.com"):
+    return [EmailMessage("Hello", "Body", "from@example.com",
+                         [to.format(i)]) for i in range(count)]
+
+
+class RecordingTransport(Transport):
+    def __init__(self):
+        super().__init__()
+        self.batches = []
+
+    def send(self, messages, limiter=None):
+        self.batches.append(messages)
+        return [None] * len(messages)
+
+
+class TestPooledTransport(FakeSMTPTestCase):
+    def setUp(self):
+        super().setUp()
+        self.transport = PooledTransport(workers=1, connections_per_host=1,
+                                         idle_timeout=60)
+        self.addCleanup(self.transport.close)
+
+    def test_connection_is_kept_open_between_batches(self):
+        self.assertEqual(self.transport.send(messages(3)), [None] * 3)
+        self.assertEqual(self.transport.send(messages(3)), [None] * 3)
+        self.assertEqual(len(self.handler.messages), 6)
+        self.assertEqual(len(self.handler.connections), 1)
+
+    def test_dropped_connection_is_replaced(self):
+        self.transport.send(messages(1))
+        pool = self.transport.get_pool()
+        connection, _ = pool.idle[0]
+        connection.connection.sock.shutdown(socket.SHUT_RDWR)
+        self.assertEqual(self.transport.send(messages(1)), [None])
+        self.assertEqual(len(self.handler.connections), 2)
+
+    def test_idle_connections_expire(self):
+        self.transport.idle_timeout = 0
+        self.transport.send(messages(1))
+        self.transport.send(messages(1))
+        self.assertEqual(len(self.handler.connections), 2)
+
+    def test_metrics_count_sent_and_failed(self):
+        self.handler.refuse.add("user1@example.com")
+        results = self.transport.send(messages(3))
+        self.assertIsNone(results[0])
+        self.assertIsNotNone(results[1])
+        self.assertIsNone(results[2])
+        metrics = self.transport.metrics.snapshot()
+        self.assertEqual((metrics["sent"], metrics["failed"]), (2, 1))
+        self.assertGreater(metrics["messages_per_second"], 0)
+
+    def test_unreachable_server_fails_every_message(self):
+        with override_settings(EMAIL_PORT=free_port()), \
+                self.assertLogs("workshop_app.transport", "WARNING"):
+            results = self.transport.send(messages(2))
+        self.assertTrue(all(isinstance(e, OSError) for e in results))
+
+
+class TestParallelDelivery(FakeSMTPTestCase):
+    smtp_delay = 0.2
+
+    def test_messages_are_sent_in_parallel(self):
+        transport = PooledTransport(workers=4, connections_per_host=4,
+                                    idle_timeout=60)
+        self.addCleanup(transport.close)
+        start = time.monotonic()
+        self.assertEqual(transport.send(messages(8)), [None] * 8)
+        elapsed = time.monotonic() - start
+        # Sequential delivery would take 8 * 0.2s
+        self.assertLess(elapsed, 8 * self.smtp_delay * 0.6)
+        self.assertEqual(self.handler.max_active, 4)
+        self.assertEqual(len(self.handler.connections), 4)
+
+    def test_per_host_limit_caps_concurrency(self):
+        transport = PooledTransport(workers=8, connections_per_host=2,
+                                    idle_timeout=60)
+        self.addCleanup(transport.close)
+        self.assertEqual(transport.send(messages(6)), [None] * 6)
+        self.assertEqual(self.handler.max_active, 2)
+        self.assertEqual(len(self.handler.connections), 2)
+
+    def test_rate_limit_is_shared_between_threads(self):
+        transport = PooledTransport(workers=4, connections_per_host=4,
+                                    idle_timeout=60)
+        self.addCleanup(transport.close)
+        self.handler.delay = 0
+        start = time.monotonic()
+        transport.send(messages(5), RateLimiter(20))
+        self.assertGreaterEqual(time.monotonic() - start, 0.2)
+
+
+class TestGetTransport(FakeSMTPTestCase):
+    def test_transport_class_comes_from_settings(self):
+        self.assertIsInstance(get_transport(), PooledTransport)
+        self.assertIs(get_transport(), get_transport())
+        path = f"{__name__}.RecordingTransport"
+        with override_settings(EMAIL_TRANSPORT=path):
+            transport = get_transport()
+            self.assertIsInstance(transport, RecordingTransport)
+            close_transport()
+
+    def test_plain_transport_uses_one_connection_per_batch(self):
+        transport = Transport()
+        transport.send(messages(2))
+        transport.send(messages(2))
+        self.assertEqual(len(self.handler.messages), 4)
+        self.assertEqual(len(self.handler.connections), 2)
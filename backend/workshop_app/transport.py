@@ -0,0 +1,254 @@
+"""Transports used by the outbox worker to hand messages to the mail server.
+
+A transport's ``send(messages)`` returns one entry per message, in order:
+None if it was sent, otherwise the exception that stopped it. Choose the
+class with the EMAIL_TRANSPORT setting.
+"""
+import logging
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+
+from django.conf import settings
+from django.core.mail import get_connection
+from django.utils.module_loading import import_string
+
+logger = logging.getLogger(__name__)
+
+# Settings that identify a mail server; each combination gets its own pool
+POOL_KEY_SETTINGS = ('EMAIL_BACKEND', 'EMAIL_HOST', 'EMAIL_PORT',
+                     'EMAIL_HOST_USER', 'EMAIL_USE_TLS', 'EMAIL_USE_SSL')
+
+_transport = None
+_transport_lock = threading.Lock()
+
+
+class RateLimiter:
+    """Space calls to ``wait`` so at most ``rate`` happen per second"""
+
+    def __init__(self, rate):
+        self.interval = 1 / rate if rate else 0
+        self.next_slot = time.monotonic()
+        self.lock = threading.Lock()
+
+    def wait(self):
+        if not self.interval:
+            return
+        with self.lock:
+            now = time.monotonic()
+            slot = max(now, self.next_slot)
+            self.next_slot = slot + self.interval
+        if slot > now:
+            time.sleep(slot - now)
+
+
+class TransportMetrics:
+    """Running totals of messages handed to the mail server"""
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.sent = self.failed = 0
+        self.seconds = 0.0
+
+    def record(self, sent, failed, seconds):
+        with self.lock:
+            self.sent += sent
+            self.failed += failed
+            self.seconds += seconds
+
+    @property
+    def messages_per_second(self):
+        return self.sent / self.seconds if self.seconds else 0.0
+
+    def snapshot(self):
+        with self.lock:
+            return {'sent': self.sent, 'failed': self.failed,
+                    'seconds': self.seconds,
+                    'messages_per_second': self.messages_per_second}
+
+
+def _is_alive(connection):
+    smtp = getattr(connection, 'connection', None)
+    if smtp is None or not hasattr(smtp, 'noop'):
+        # Not open yet, or not an SMTP backend: open() handles it
+        return True
+    try:
+        return smtp.noop()[0] == 250
+    except Exception:
+        return False
+
+
+class ConnectionPool:
+    """Keep-alive connections to one mail server, at most ``size`` of them
+    open at a time"""
+
+    def __init__(self, size, idle_timeout):
+        self.size = size
+        self.idle_timeout = idle_timeout
+        self.slots = threading.BoundedSemaphore(size)
+        self.lock = threading.Lock()
+        self.idle = []
+
+    def _checkout(self):
+        now = time.monotonic()
+        while True:
+            with self.lock:
+                if not self.idle:
+                    break
+                connection, last_used = self.idle.pop()
+            if now - last_used < self.idle_timeout and _is_alive(connection):
+                return connection
+            connection.close()
+        return get_connection()
+
+    @contextmanager
+    def connection(self):
+        with self.slots:
+            connection = self._checkout()
+            try:
+                connection.open()
+                yield connection
+            except BaseException:
+                connection.close()
+                raise
+            with self.lock:
+                self.idle.append((connection, time.monotonic()))
+
+    def close(self):
+        with self.lock:
+            idle, self.idle = self.idle, []
+        for connection, _ in idle:
+            connection.close()
+
+
+class Transport:
+    """Send each batch sequentially over one new connection"""
+
+    def __init__(self):
+        self.metrics = TransportMetrics()
+
+    def send(self, messages, limiter=None):
+        start = time.monotonic()
+        connection = get_connection()
+        try:
+            connection.open()
+        except Exception as error:
+            results = [error] * len(messages)
+        else:
+            try:
+                results = self.send_over(connection, messages, limiter)
+            finally:
+                connection.close()
+        self.record(results, start)
+        return results
+
+    def send_over(self, connection, messages, limiter=None):
+        """Send ``messages`` on an open connection, reconnecting after a
+        failure so one bad message does not fail the rest"""
+        results = []
+        for message in messages:
+            if limiter:
+                limiter.wait()
+            try:
+                connection.send_messages([message])
+            except Exception as error:
+                results.append(error)
+                connection.close()
+                try:
+                    connection.open()
+                except Exception:
+                    pass
+            else:
+                results.append(None)
+        return results
+
+    def record(self, results, start):
+        failed = sum(error is not None for error in results)
+        self.metrics.record(len(results) - failed, failed,
+                            time.monotonic() - start)
+
+    def close(self):
+        pass
+
+
+class PooledTransport(Transport):
+    """Send from a thread pool over pooled keep-alive connections.
+
+    At most EMAIL_TRANSPORT_WORKERS threads send at once, and no more than
+    EMAIL_MAX_CONNECTIONS_PER_HOST connections are open to one server.
+    """
+
+    def __init__(self, workers=None, connections_per_host=None,
+                 idle_timeout=None):
+        super().__init__()
+        self.workers = workers or settings.EMAIL_TRANSPORT_WORKERS
+        self.connections_per_host = (connections_per_host or
+                                     settings.EMAIL_MAX_CONNECTIONS_PER_HOST)
+        self.idle_timeout = (idle_timeout or
+                             settings.EMAIL_CONNECTION_IDLE_TIMEOUT)
+        self.pools = {}
+        self.lock = threading.Lock()
+
+    def get_pool(self):
+        key = tuple(getattr(settings, name, None) for name in POOL_KEY_SETTINGS)
+        with self.lock:
+            pool = self.pools.get(key)
+            if pool is None:
+                pool = self.pools[key] = ConnectionPool(
+                    self.connections_per_host, self.idle_timeout
+                )
+        return pool
+
+    def send_chunk(self, pool, messages, limiter):
+        try:
+            with pool.connection() as connection:
+                return self.send_over(connection, messages, limiter)
+        except Exception as error:
+            logger.warning("Could not connect to the mail server: %r", error)
+            return [error] * len(messages)
+
+    def send(self, messages, limiter=None):
+        start = time.monotonic()
+        pool = self.get_pool()
+        workers = max(1, min(self.workers, pool.size, len(messages)))
+        chunks = [messages[i::workers] for i in range(workers)]
+        if workers == 1:
+            chunk_results = [self.send_chunk(pool, messages, limiter)]
+        else:
+            with ThreadPoolExecutor(workers) as executor:
+                chunk_results = list(executor.map(
+                    lambda chunk: self.send_chunk(pool, chunk, limiter),
+                    chunks
+                ))
+        results = [None] * len(messages)
+        for i, chunk in enumerate(chunk_results):
+            results[i::workers] = chunk
+        self.record(results, start)
+        return results
+
+    def close(self):
+        with self.lock:
+            pools, self.pools = list(self.pools.values()), {}
+        for pool in pools:
+            pool.close()
+
+
+def get_transport():
+    """The process-wide transport named by EMAIL_TRANSPORT"""
+    global _transport
+    with _transport_lock:
+        path = settings.EMAIL_TRANSPORT
+        if _transport is None or _transport[0] != path:
+            if _transport is not None:
+                _transport[1].close()
+            _transport = (path, import_string(path)())
+        return _transport[1]
+
+
+def close_transport():
+    global _transport
+    with _transport_lock:
+        if _transport is not None:
+            _transport[1].close()
+            _transport = None
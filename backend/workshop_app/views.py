@@ -1,4 +1,5 @@
 from django.contrib import messages
+from django.db import IntegrityError, transaction
 from django.db.models import Q
 from django.forms import inlineformset_factory, model_to_dict
 from django.http import JsonResponse, Http404
@@ -13,6 +14,7 @@ import os
 
 from django.contrib.auth import login, logout, authenticate
 from django.contrib.auth.decorators import login_required
+from django.core.exceptions import PermissionDenied
 from django.core.paginator import Paginator
 from django.shortcuts import render, redirect
 from django.utils import timezone
@@ -26,6 +28,8 @@ from .models import (
     Workshop, Comment,
     WorkshopType, AttachmentFile
 )
+from .media import serve_file
+from .roles import is_instructor
 from .send_mails import send_email
 
 
@@ -42,11 +46,6 @@ def is_email_checked(user):
     return user.profile.is_email_verified
 
 
-def is_instructor(user):
-    """Check if the user is having instructor rights"""
-    return user.groups.filter(name='instructor').exists()
-
-
 def get_landing_page(user):
     # For now, landing pages of both instructor and coordinator are same
     if is_instructor(user):
@@ -243,9 +242,22 @@ def change_workshop_date(request, workshop_id):
         )
         today = datetime.today()
         if today <= new_workshop_date:
-            workshop = Workshop.objects.filter(id=workshop_id)
-            workshop_date = workshop.first().date
-            workshop.update(date=new_workshop_date)
+            workshop = Workshop.objects.get(id=workshop_id)
+            workshop_date = workshop.date
+            # save() rather than update() so the stats rollup signals fire
+            workshop.date = new_workshop_date.date()
+            # The coordinator may already have this workshop on that date
+            try:
+                with transaction.atomic():
+                    workshop.save()
+            except IntegrityError:
+                messages.add_message(
+                    request, messages.ERROR,
+                    "The coordinator already has this workshop on that date"
+                )
+                return redirect(
+                    reverse('workshop_app:workshop_status_instructor')
+                )
             messages.add_message(request, messages.INFO, "Workshop date updated")
 
             # For Instructor
@@ -259,7 +271,7 @@ def change_workshop_date(request, workshop_id):
             send_email(request, call_on='Change Date',
                        new_workshop_date=str(new_workshop_date.date()),
                        workshop_date=str(workshop_date),
-                       other_email=workshop.first().coordinator.email
+                       other_email=workshop.coordinator.email
                        )
     return redirect(reverse('workshop_app:workshop_status_instructor'))
 
@@ -280,26 +292,28 @@ def propose_workshop(request):
             if form.is_valid():
                 form_data = form.save(commit=False)
                 form_data.coordinator = user
-                # Avoiding Duplicate workshop entries for same date and workshop_title
-                if Workshop.objects.filter(
-                        date=form_data.date,
-                        workshop_type=form_data.workshop_type,
-                        coordinator=form_data.coordinator
-                ).exists():
+                # Duplicate workshop entries for the same date and workshop
+                # type are rejected by the unique_workshop_proposal constraint
+                try:
+                    with transaction.atomic():
+                        form_data.save()
+                except IntegrityError:
                     return redirect(get_landing_page(user))
                 else:
-                    form_data.save()
-                    instructors = Profile.objects.filter(position='instructor')
-                    for i in instructors:
-                        send_email(request, call_on='Proposed Workshop',
-                                   user_position='instructor',
-                                   workshop_date=str(form_data.date),
-                                   workshop_title=form_data.workshop_type,
-                                   user_name=user.get_full_name(),
-                                   other_email=i.user.email,
-                                   phone_number=user.profile.phone_number,
-                                   institute=user.profile.institute
-                                   )
+                    instructor_emails = Profile.objects.filter(
+                        position='instructor'
+                    ).exclude(user__email__isnull=True).exclude(
+                        user__email=''
+                    ).values_list('user__email', flat=True)
+                    send_email(request, call_on='Proposed Workshop',
+                               user_position='instructor',
+                               workshop_date=str(form_data.date),
+                               workshop_title=form_data.workshop_type,
+                               user_name=user.get_full_name(),
+                               recipients=list(instructor_emails),
+                               phone_number=user.profile.phone_number,
+                               institute=user.profile.institute
+                               )
                     messages.add_message(request, messages.SUCCESS, "Workshop proposed successfully")
                     return redirect(get_landing_page(user))
         # GET request
@@ -387,6 +401,22 @@ def delete_attachment_file(request, file_id):
     return redirect(reverse('workshop_app:workshop_type_list'))
 
 
+@login_required
+def download_attachment(request, path):
+    """Workshop attachments for instructors and for coordinators who have
+    proposed a workshop of that type"""
+    file = AttachmentFile.objects.filter(attachments=path).first()
+    if file is None or not os.path.isfile(file.attachments.path):
+        raise Http404("The requested file does not exist")
+    user = request.user
+    if not (user.is_staff or is_instructor(user) or Workshop.objects.filter(
+            coordinator_id=user.id,
+            workshop_type_id=file.workshop_type_id).exists()):
+        raise PermissionDenied
+    return serve_file(request, file.attachments.path, file.attachments.name,
+                      os.path.basename(file.attachments.name))
+
+
 @login_required
 def workshop_type_tnc(request, workshop_type_id):
     workshop_type = WorkshopType.objects.filter(id=workshop_type_id)
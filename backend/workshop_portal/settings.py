@@ -21,7 +21,7 @@ from local_settings import (
     SENDER_EMAIL
 )
 
-from decouple import config
+from decouple import Csv, config
 
 # Build paths inside the project like this: os.path.join(BASE_DIR, ...)
 BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
@@ -64,12 +64,15 @@ CORS_ALLOW_CREDENTIALS = True
 
 REST_FRAMEWORK = {
     'DEFAULT_AUTHENTICATION_CLASSES': (
-        'rest_framework_simplejwt.authentication.JWTAuthentication',
+        # Trusts the roles in the token; reads make no auth queries
+        'workshop_app.api.authentication.ClaimsJWTAuthentication',
         'rest_framework.authentication.SessionAuthentication',
     ),
     'DEFAULT_PERMISSION_CLASSES': [
         'rest_framework.permissions.IsAuthenticatedOrReadOnly'
-    ]
+    ],
+    'DEFAULT_PAGINATION_CLASS': 'workshop_app.api.pagination.StandardPagination',
+    'PAGE_SIZE': 50,
 }
 
 from datetime import timedelta
@@ -138,6 +141,42 @@ DATABASES = {
     }
 }
 
+# Cache
+# Local memory by default; in production point CACHE_BACKEND at a shared
+# backend, e.g. django.core.cache.backends.filebased.FileBasedCache with a
+# directory as CACHE_LOCATION, or ...db.DatabaseCache with a table name
+# (run manage.py createcachetable).
+CACHES = {
+    'default': {
+        'BACKEND': config(
+            'CACHE_BACKEND',
+            default='django.core.cache.backends.locmem.LocMemCache'
+        ),
+        'LOCATION': config('CACHE_LOCATION', default='workshop-portal'),
+    }
+}
+
+# Cache used for the public statistics API and how long entries live
+# (they are also invalidated whenever a workshop changes)
+STATS_CACHE_ALIAS = 'default'
+STATS_CACHE_TIMEOUT = config('STATS_CACHE_TIMEOUT', default=3600, cast=int)
+
+# How long rendered CMS pages and the nav tree are cached (they are also
+# invalidated whenever a page or nav changes)
+CMS_CACHE_TIMEOUT = config('CMS_CACHE_TIMEOUT', default=3600, cast=int)
+
+# Seconds a user's group names stay in the cache (0 looks them up once per
+# request); group changes invalidate them. Group checks guard permissions,
+# and a per-process cache is only invalidated in the worker that made the
+# change, so this is off unless CACHE_BACKEND is a shared backend
+ROLE_CACHE_TIMEOUT = config(
+    'ROLE_CACHE_TIMEOUT',
+    default=0 if CACHES['default']['BACKEND'].endswith(
+        ('LocMemCache', 'DummyCache')
+    ) else 300,
+    cast=int
+)
+
 # Password validation
 # https://docs.djangoproject.com/en/1.10/ref/settings/#auth-password-validators
 
@@ -182,8 +221,19 @@ MEDIA_URL = '/data/'
 
 MEDIA_ROOT = os.path.join(BASE_DIR, "workshop_app", "data")
 
+# Attachments under MEDIA_URL are sent after a permission check. Set
+# MEDIA_OFFLOAD to 'x-sendfile' (Apache mod_xsendfile) or 'x-accel-redirect'
+# (nginx, with an internal location at MEDIA_ACCEL_PREFIX aliased to
+# MEDIA_ROOT) to let the web server transfer the file.
+MEDIA_OFFLOAD = config('MEDIA_OFFLOAD', default='')
+MEDIA_ACCEL_PREFIX = config('MEDIA_ACCEL_PREFIX', default='/protected-media/')
+MEDIA_CACHE_MAX_AGE = config('MEDIA_CACHE_MAX_AGE', default=3600, cast=int)
+
 LOG_FOLDER = os.path.join(BASE_DIR, "workshop_app", "logs")
 
+# CMS static file uploads are stored under static/cms/ in this folder
+CMS_STATIC_FOLDER = os.path.join(BASE_DIR, "workshop_app")
+
 # Email Connection Settings
 EMAIL_HOST = EMAIL_HOST
 EMAIL_HOST_USER = EMAIL_HOST_USER
@@ -195,6 +245,30 @@ SENDER_EMAIL = SENDER_EMAIL
 
 EMAIL_BACKEND = 'django.core.mail.backends.console.EmailBackend'
 
+# Outgoing mail is queued in the database and delivered by
+# `manage.py send_queued_mail`, BATCH_SIZE emails per SMTP connection and
+# at most RATE_LIMIT emails per second (0 for no limit). Failed sends are
+# retried with exponential backoff (RETRY_DELAY, 2 * RETRY_DELAY, ...
+# seconds) and marked as failed after MAX_ATTEMPTS. A claimed email that is
+# not finished within LEASE seconds is picked up again by the next worker run.
+EMAIL_OUTBOX_BATCH_SIZE = config('EMAIL_OUTBOX_BATCH_SIZE', default=50, cast=int)
+EMAIL_OUTBOX_RATE_LIMIT = config('EMAIL_OUTBOX_RATE_LIMIT', default=0, cast=float)
+EMAIL_OUTBOX_MAX_ATTEMPTS = config('EMAIL_OUTBOX_MAX_ATTEMPTS', default=5, cast=int)
+EMAIL_OUTBOX_RETRY_DELAY = config('EMAIL_OUTBOX_RETRY_DELAY', default=60, cast=int)
+EMAIL_OUTBOX_LEASE = config('EMAIL_OUTBOX_LEASE', default=600, cast=int)
+
+# How the outbox worker talks to the mail server. PooledTransport keeps
+# connections open between batches and sends from WORKERS threads, with at
+# most MAX_CONNECTIONS_PER_HOST connections open to one server.
+EMAIL_TRANSPORT = config('EMAIL_TRANSPORT', default='workshop_app.transport.PooledTransport')
+EMAIL_TRANSPORT_WORKERS = config('EMAIL_TRANSPORT_WORKERS', default=4, cast=int)
+EMAIL_MAX_CONNECTIONS_PER_HOST = config('EMAIL_MAX_CONNECTIONS_PER_HOST', default=2, cast=int)
+EMAIL_CONNECTION_IDLE_TIMEOUT = config('EMAIL_CONNECTION_IDLE_TIMEOUT', default=60, cast=int)
+
+# Days before an accepted workshop on which `manage.py send_reminders`
+# reminds its instructor and coordinator, e.g. "7,2"
+WORKSHOP_REMINDER_DAYS = config('WORKSHOP_REMINDER_DAYS', default='2', cast=Csv(int))
+
 # Change this to the production url
 PRODUCTION_URL = 'http://localhost:8000'
 
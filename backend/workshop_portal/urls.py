@@ -14,12 +14,14 @@ Including another URLconf
     2. Add a URL to urlpatterns:  url(r'^blog/', include('blog.urls'))
 """
 from django.urls import path, include
-from django.conf.urls.static import static
 from django.contrib import admin
 from workshop_portal import views
+from workshop_app import views as workshop_views
+from cms import views as cms_views
 from django.conf import settings
-from rest_framework_simplejwt.views import TokenRefreshView
-from workshop_app.api.views import CustomTokenObtainPairView
+from workshop_app.api.views import (
+    CustomTokenObtainPairView, CustomTokenRefreshView
+)
 
 
 urlpatterns = [
@@ -28,11 +30,17 @@ urlpatterns = [
     path('workshop/', include('workshop_app.urls')),
     path('reset/', include('django.contrib.auth.urls')),
     path('page/', include('cms.urls')),
+    path('static/cms/<path:path>', cms_views.static_file,
+         name='cms_static_file'),
     path('statistics/', include('statistics_app.urls')),
     path('api/', include('workshop_app.urls')),
     path('api-auth/', include('rest_framework.urls')),
     path('api/token/', CustomTokenObtainPairView.as_view(), name='token_obtain_pair'),
-    path('api/token/refresh/', TokenRefreshView.as_view(), name='token_refresh'),
+    path('api/token/refresh/', CustomTokenRefreshView.as_view(), name='token_refresh'),
 ]
 
-urlpatterns += static(settings.MEDIA_URL, document_root=settings.MEDIA_ROOT)
+# Uploaded attachments, with permission checks and Range support
+urlpatterns += [
+    path(settings.MEDIA_URL.lstrip('/') + '<path:path>',
+         workshop_views.download_attachment, name='download_attachment'),
+]
@@ -4,13 +4,28 @@ from django.urls import reverse
 from django.conf import settings
 
 # Local Imports
+from cms import cache as cms_cache
 from cms.models import Page
 
+# (cms generation, url) of the last resolved home redirect; a saved or
+# deleted Page starts a new generation (see cms.signals)
+_home_redirect = None
+
+
+def home_redirect_url():
+    global _home_redirect
+    generation = cms_cache.get_generation()
+    if _home_redirect is None or _home_redirect[0] != generation:
+        permalink = Page.objects.filter(
+            title=settings.HOME_PAGE_TITLE
+        ).values_list('permalink', flat=True).first()
+        if permalink is not None:
+            url = reverse("cms:home", args=[permalink])
+        else:
+            url = reverse("workshop_app:index")
+        _home_redirect = (generation, url)
+    return _home_redirect[1]
+
 
 def index(request):
-    page = Page.objects.filter(title=settings.HOME_PAGE_TITLE)
-    if page.exists():
-        redirect_url = reverse("cms:home", args=[page.first().permalink])
-    else:
-        redirect_url = reverse("workshop_app:index")
-    return redirect(redirect_url)
+    return redirect(home_redirect_url())
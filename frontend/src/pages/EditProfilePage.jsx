@@ -2,7 +2,7 @@ import React, { useState, useEffect } from 'react';
 import { useNavigate } from 'react-router-dom';
 import { useAuth } from '../context/AuthContext';
 import { profileAPI } from '../utils/api';
-import { department_choices, position_choices, source, states, title_choices } from '../utils/constants';
+import { department_choices, digest_choices, position_choices, source, states, title_choices } from '../utils/constants';
 
 const EditProfilePage = () => {
     const { user } = useAuth();
@@ -20,7 +20,8 @@ const EditProfilePage = () => {
         position: 'coordinator',
         how_did_you_hear_about_us: 'FOSSEE website',
         location: '',
-        state: 'IN-MH'
+        state: 'IN-MH',
+        digest_interval: 0
     });
 
     useEffect(() => {
@@ -39,7 +40,8 @@ const EditProfilePage = () => {
                     position: data.position || 'coordinator',
                     how_did_you_hear_about_us: data.how_did_you_hear_about_us || 'FOSSEE website',
                     location: data.location || '',
-                    state: data.state || 'IN-MH'
+                    state: data.state || 'IN-MH',
+                    digest_interval: data.digest_interval || 0
                 });
             } catch (error) {
                 console.error('Error fetching profile:', error);
@@ -257,6 +259,23 @@ const EditProfilePage = () => {
                                     ))}
                                 </select>
                             </div>
+
+                            <div className="md:col-span-2">
+                                <label htmlFor="digest_interval" className="block text-sm font-medium text-gray-700 mb-2">
+                                    Workshop proposal and date change emails
+                                </label>
+                                <select
+                                    id="digest_interval"
+                                    name="digest_interval"
+                                    value={formData.digest_interval}
+                                    onChange={handleChange}
+                                    className="w-full px-3 py-2 border border-gray-300 rounded-md shadow-sm focus:outline-none focus:ring-indigo-500 focus:border-indigo-500"
+                                >
+                                    {digest_choices.map(([value, label]) => (
+                                        <option key={value} value={value}>{label}</option>
+                                    ))}
+                                </select>
+                            </div>
                         </div>
 
                         <div className="flex justify-end space-x-3">
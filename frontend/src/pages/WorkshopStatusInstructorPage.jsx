@@ -6,19 +6,19 @@ import { workshopAPI } from '../utils/api';
 const WorkshopStatusInstructorPage = () => {
     const { user } = useAuth();
     const [workshops, setWorkshops] = useState([]);
+    const [nextPage, setNextPage] = useState(null);
     const [loading, setLoading] = useState(true);
+    const [loadingMore, setLoadingMore] = useState(false);
     const [error, setError] = useState('');
 
     useEffect(() => {
         const fetchWorkshops = async () => {
             try {
-                const response = await workshopAPI.getWorkshops();
-                // Filter workshops for current user as instructor or pending workshops
-                const instructorWorkshops = response.data.filter(ws => 
-                    (ws.instructor && ws.instructor.id === user?.user_id) || 
-                    (ws.status === 0) // Pending workshops that can be accepted
-                );
-                setWorkshops(instructorWorkshops);
+                // The server filters to the current user's workshops and
+                // pending workshops that can be accepted
+                const response = await workshopAPI.getInstructorDashboard();
+                setWorkshops(response.data.results);
+                setNextPage(response.data.next);
             } catch (error) {
                 setError('Failed to fetch workshops');
                 console.error('Error:', error);
@@ -32,6 +32,20 @@ const WorkshopStatusInstructorPage = () => {
         }
     }, [user]);
 
+    const handleLoadMore = async () => {
+        setLoadingMore(true);
+        try {
+            const response = await workshopAPI.getInstructorDashboard(nextPage);
+            setWorkshops(current => [...current, ...response.data.results]);
+            setNextPage(response.data.next);
+        } catch (error) {
+            console.error('Error loading more workshops:', error);
+            alert('Failed to load more workshops');
+        } finally {
+            setLoadingMore(false);
+        }
+    };
+
     const getStatusBadge = (status) => {
         const statusMap = {
             0: { text: 'Pending', class: 'bg-yellow-100 text-yellow-800' },
@@ -137,6 +151,18 @@ const WorkshopStatusInstructorPage = () => {
                         </div>
                     )}
                 </div>
+
+                {nextPage && (
+                    <div className="mt-6 text-center">
+                        <button
+                            onClick={handleLoadMore}
+                            disabled={loadingMore}
+                            className="bg-indigo-600 text-white px-4 py-2 rounded hover:bg-indigo-700 disabled:opacity-50"
+                        >
+                            {loadingMore ? 'Loading...' : 'Load more'}
+                        </button>
+                    </div>
+                )}
             </div>
         </div>
     );
@@ -62,7 +62,12 @@ export const workshopTypeAPI = {
 };
 
 export const workshopAPI = {
-    getWorkshops: () => api.get('/workshops/'),
+    getWorkshops: (params) => api.get('/workshops/', { params }),
+    // One page of the instructor dashboard; pass the previous page's `next`
+    // link, which already carries the query string, to load the following one
+    getInstructorDashboard: (next) => (next
+        ? api.get(next)
+        : api.get('/workshops/', { params: { dashboard: 'instructor' } })),
     getWorkshopDetail: (id) => api.get(`/workshops/${id}/`),
     createWorkshop: (data) => api.post('/workshops/', data),
     editWorkshop: (id, data) => api.put(`/workshops/${id}/`, data),
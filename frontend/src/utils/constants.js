@@ -34,6 +34,12 @@ export const source = [
     ["From other College", "From other College"],
 ];
 
+export const digest_choices = [
+    [0, "Send each email immediately"],
+    [1, "Hourly digest"],
+    [24, "Daily digest"],
+];
+
 export const states = [
     ["", "---------"],
     ["IN-AP", "Andhra Pradesh"],